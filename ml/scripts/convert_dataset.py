@@ -0,0 +1,213 @@
+# ml/scripts/convert_dataset.py
+
+import argparse
+import json
+import os
+import numpy as np
+
+try:
+    from ml.scripts import data_io
+except ImportError:  # run as a script from ml/scripts
+    import data_io
+
+OUTPUT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "npy": ""
+}
+
+def convert_dataset(
+    input_path: str,
+    output_path: str,
+    columns: list = None,
+    schema: dict = None,
+    output_format: str = None,
+    chunk_size: int = 100000
+) -> dict:
+    """
+    Converts a dataset between CSV, Parquet, Feather and npy column directories in one
+    streaming pass (npy needs a second pass to count rows; Feather is written as one
+    table, so only the projected columns have to fit in memory).
+
+    :param columns: Columns to keep (all if None).
+    :param schema: Optional {column: dtype} applied while reading.
+    Returns {"rows", "columns", "schema", "output_path", "format"}.
+    """
+    output_format = data_io.detect_format(output_path, output_format)
+    columns = columns or data_io.table_columns(input_path)
+
+    def chunks():
+        return data_io.iter_table_chunks(input_path, columns, chunk_size, schema)
+
+    rows = 0
+    dtypes = {}
+    if output_format == "npy":
+        total = sum(len(chunk) for chunk in chunks())
+        os.makedirs(output_path, exist_ok=True)
+        arrays = {}
+        for chunk in chunks():
+            if not arrays:
+                data_io.check_npy_dtypes(chunk)
+                dtypes = {c: str(t) for c, t in chunk.dtypes.items()}
+                arrays = {
+                    c: np.lib.format.open_memmap(
+                        os.path.join(output_path, f"{c}.npy"),
+                        mode="w+", dtype=t, shape=(total,)
+                    )
+                    for c, t in chunk.dtypes.items()
+                }
+            for c, array in arrays.items():
+                values = chunk[c].to_numpy()
+                if not np.can_cast(values.dtype, array.dtype, "same_kind"):
+                    raise ValueError(
+                        f"Column {c} changes type from {array.dtype} to {values.dtype} "
+                        f"mid-file; declare it in the dataset schema."
+                    )
+                array[rows:rows + len(chunk)] = values
+            rows += len(chunk)
+        for array in arrays.values():
+            array.flush()
+        data_io.write_npy_schema(output_path, dtypes)
+    elif output_format == "csv":
+        first = True
+        for chunk in chunks():
+            if first:
+                directory = os.path.dirname(output_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                dtypes = {c: str(t) for c, t in chunk.dtypes.items()}
+            chunk.to_csv(
+                output_path, mode="w" if first else "a", header=first, index=False
+            )
+            first = False
+            rows += len(chunk)
+    else:
+        data_io.require_pyarrow(output_format)
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        writer = None
+        tables = []
+        try:
+            for chunk in chunks():
+                table = data_io.pa.Table.from_pandas(chunk, preserve_index=False)
+                if not dtypes:
+                    dtypes = {c: str(t) for c, t in chunk.dtypes.items()}
+                if output_format == "parquet":
+                    if writer is None:
+                        writer = data_io.pq.ParquetWriter(output_path, table.schema)
+                    writer.write_table(table)
+                else:
+                    tables.append(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        if output_format == "feather" and tables:
+            data_io.feather.write_feather(
+                data_io.pa.concat_tables(tables), output_path,
+                compression="uncompressed"
+            )
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "schema": dtypes,
+        "output_path": output_path,
+        "format": output_format
+    }
+
+def main():
+    """
+    One-shot dataset conversion.
+      - --input/--output: convert a single file
+      - otherwise: convert the train/test datasets of dataset_config.json to --to,
+        keeping only the features and target columns; --update-config points the config
+        at the converted files and records their schema, and their format once every
+        configured dataset has been converted.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert datasets to a columnar format."
+    )
+    parser.add_argument("--input", help="Dataset to convert.")
+    parser.add_argument(
+        "--output",
+        help="Output path (its extension picks the format unless --to is given)."
+    )
+    parser.add_argument(
+        "--to", choices=["csv", "parquet", "feather", "npy"], help="Output format."
+    )
+    parser.add_argument(
+        "--config", default="ml/config/dataset_config.json",
+        help="Path to dataset_config.json."
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=100000,
+        help="Rows per chunk while converting."
+    )
+    parser.add_argument(
+        "--update-config", action="store_true",
+        help="Rewrite dataset_config.json to use the output."
+    )
+    args = parser.parse_args()
+
+    if args.input:
+        if not args.output:
+            parser.error("--output is required with --input")
+        result = convert_dataset(
+            args.input, args.output, output_format=args.to, chunk_size=args.chunk_size
+        )
+        print(
+            f"Converted {result['rows']} rows to {result['output_path']} "
+            f"({result['format']})"
+        )
+        return
+
+    if not args.to:
+        parser.error(
+            "--to is required when converting the datasets of dataset_config.json"
+        )
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    columns = config["features"] + ([config["target"]] if config.get("target") else [])
+
+    skipped = []
+    for key in ("train_data_path", "test_data_path"):
+        source = config.get(key)
+        if not source:
+            continue
+        if not os.path.exists(source):
+            skipped.append(source)
+            continue
+        stem = os.path.splitext(source.rstrip(os.sep))[0]
+        if args.to == "npy":
+            output = f"{stem}_npy"
+        else:
+            output = stem + OUTPUT_EXTENSIONS[args.to]
+        result = convert_dataset(
+            source, output, columns=columns, schema=config.get("schema"),
+            output_format=args.to, chunk_size=args.chunk_size
+        )
+        print(f"Converted {result['rows']} rows of {source} to {output} ({args.to})")
+        config[key] = output
+        config.setdefault("schema", result["schema"])
+
+    if args.update_config:
+        # "format" applies to every dataset, so it's only declared when all were
+        # converted; otherwise each path's format is detected from its extension.
+        if not skipped:
+            config["format"] = args.to
+        elif config.get("format") not in (None, args.to):
+            del config["format"]
+        if skipped:
+            print(
+                f"Not converted (missing): {', '.join(skipped)}; "
+                "format left undeclared"
+            )
+        with open(args.config, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=2)
+        print(f"Updated {args.config}")
+
+if __name__ == "__main__":
+    main()
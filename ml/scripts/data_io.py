@@ -0,0 +1,188 @@
+# ml/scripts/data_io.py
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa  # Optional: Parquet/Feather support
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    feather = None
+    pq = None
+
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather"
+}
+# Written next to the column files of an npy dataset directory
+NPY_SCHEMA_FILE = "_schema.json"
+
+def detect_format(path: str, declared: str = None) -> str:
+    """
+    "csv", "parquet", "feather" or "npy" (a directory of '<column>.npy' files):
+    the declared format (dataset_config "format") if given, else from the path.
+    """
+    if declared:
+        if declared not in ("csv", "parquet", "feather", "npy"):
+            raise ValueError(f"Unsupported data format: {declared}")
+        return declared
+    if os.path.isdir(path) or path.endswith(os.sep):
+        return "npy"
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(
+            f"Cannot tell the data format of {path}; "
+            "set \"format\" in dataset_config.json"
+        )
+    return FORMAT_EXTENSIONS[extension]
+
+def require_pyarrow(fmt: str) -> None:
+    if pa is None:
+        raise ImportError(f"{fmt} files require pyarrow (pip install pyarrow).")
+
+def table_columns(path: str, fmt: str = None) -> list:
+    """
+    Column names of a dataset without reading its rows.
+    """
+    fmt = detect_format(path, fmt)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    if fmt == "npy":
+        return sorted(name[:-4] for name in os.listdir(path) if name.endswith(".npy"))
+    require_pyarrow(fmt)
+    if fmt == "parquet":
+        return list(pq.ParquetFile(path).schema_arrow.names)
+    return list(feather.read_table(path, memory_map=True).schema.names)
+
+def read_table(
+    path: str,
+    columns: list = None,
+    schema: dict = None,
+    fmt: str = None
+) -> pd.DataFrame:
+    """
+    Reads only the given columns of a dataset (all columns if None).
+
+    :param schema: Optional {column: dtype} (dataset_config "schema"); CSV columns are
+        parsed straight into these types, other formats are cast after reading.
+    """
+    fmt = detect_format(path, fmt)
+    dtypes = {
+        c: t for c, t in (schema or {}).items() if columns is None or c in columns
+    }
+    if fmt == "csv":
+        return pd.read_csv(path, usecols=columns, dtype=dtypes or None)
+    if fmt == "npy":
+        columns = columns or table_columns(path, fmt)
+        frame = next(iter_table_chunks(path, columns, None, schema, fmt), None)
+        return frame if frame is not None else pd.DataFrame(columns=columns)
+    require_pyarrow(fmt)
+    if fmt == "parquet":
+        frame = pd.read_parquet(path, columns=columns)
+    else:
+        frame = feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    return frame.astype(dtypes) if dtypes else frame
+
+def iter_table_chunks(
+    path: str,
+    columns: list,
+    chunk_size: int = None,
+    schema: dict = None,
+    fmt: str = None
+):
+    """
+    Yields DataFrames of at most chunk_size rows (one frame if None) holding the given
+    columns, so only one chunk is ever resident in memory: CSV is parsed in chunks,
+    Parquet read batch by batch, Feather and npy column files memory-mapped and sliced.
+    """
+    fmt = detect_format(path, fmt)
+    dtypes = {c: t for c, t in (schema or {}).items() if c in columns}
+    if fmt == "csv":
+        if chunk_size is None:
+            yield pd.read_csv(path, usecols=columns, dtype=dtypes or None)
+        else:
+            yield from pd.read_csv(
+                path, usecols=columns, dtype=dtypes or None, chunksize=chunk_size
+            )
+        return
+
+    if fmt == "npy":
+        arrays = {}
+        for column in columns:
+            column_path = os.path.join(path, f"{column}.npy")
+            if not os.path.isfile(column_path):
+                raise FileNotFoundError(f"Column file not found: {column_path}")
+            arrays[column] = np.load(column_path, mmap_mode="r")
+        n_rows = len(arrays[columns[0]])
+        step = chunk_size or max(n_rows, 1)
+        for start in range(0, n_rows, step):
+            frame = pd.DataFrame({
+                column: np.asarray(arrays[column][start:start + step])
+                for column in columns
+            })
+            yield frame.astype(dtypes) if dtypes else frame
+        return
+
+    require_pyarrow(fmt)
+    if fmt == "parquet":
+        batches = pq.ParquetFile(path).iter_batches(
+            batch_size=chunk_size or 65536, columns=columns
+        )
+        frames = (pa.Table.from_batches([batch]).to_pandas() for batch in batches)
+    else:
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        step = chunk_size or max(table.num_rows, 1)
+        frames = (
+            table.slice(start, step).to_pandas()
+            for start in range(0, table.num_rows, step)
+        )
+    for frame in frames:
+        yield frame.astype(dtypes) if dtypes else frame
+
+def write_table(frame: pd.DataFrame, path: str, fmt: str = None) -> None:
+    """
+    Writes a DataFrame as CSV, Parquet, Feather (uncompressed, so it can be
+    memory-mapped) or an npy column directory with a '_schema.json' of the dtypes.
+    """
+    fmt = detect_format(path, fmt)
+    directory = path if fmt == "npy" else os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "npy":
+        check_npy_dtypes(frame)
+        for column in frame.columns:
+            np.save(os.path.join(path, f"{column}.npy"), frame[column].to_numpy())
+        dtypes = {column: str(dtype) for column, dtype in frame.dtypes.items()}
+        write_npy_schema(path, dtypes)
+    else:
+        require_pyarrow(fmt)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if fmt == "parquet":
+            pq.write_table(table, path)
+        else:
+            feather.write_feather(table, path, compression="uncompressed")
+
+def check_npy_dtypes(frame: pd.DataFrame) -> None:
+    """
+    Object columns would need pickling, which rules out memory-mapping them.
+    """
+    non_numeric = [
+        str(c) for c, dtype in frame.dtypes.items() if dtype.kind not in "biufcmM"
+    ]
+    if non_numeric:
+        raise ValueError(
+            f"npy datasets need numeric columns; convert or drop: {non_numeric}"
+        )
+
+def write_npy_schema(path: str, schema: dict) -> None:
+    with open(os.path.join(path, NPY_SCHEMA_FILE), "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
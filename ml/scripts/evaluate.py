@@ -2,10 +2,31 @@
 
 import json
 import os
-import pandas as pd
-from joblib import load
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from sklearn.metrics import accuracy_score, classification_report
 
+try:
+    from ml.scripts.data_io import iter_table_chunks, read_table
+    from ml.scripts.pipeline_artifact import load_pipeline
+except ImportError:  # run as a script from ml/scripts
+    from data_io import iter_table_chunks, read_table
+    from pipeline_artifact import load_pipeline
+
+# Defaults for the "evaluation" section of model_config.json
+EVALUATION_DEFAULTS = {
+    "mode": "full",             # or "streaming"
+    "chunk_size": 100000,
+    "bootstrap_samples": 1000,
+    "confidence": 0.95,
+    "workers": 1,               # > 1 spreads the bootstrap over a process pool
+    "random_state": 42,
+    "output_path": "ml/reports/evaluation.json"
+}
+# Metrics that get bootstrap confidence intervals
+SUMMARY_METRICS = ("accuracy", "macro_precision", "macro_recall", "macro_f1", "weighted_f1")
+
 def load_json_config(path: str) -> dict:
     """
     Loads a JSON config from the given path.
@@ -16,14 +37,168 @@ def load_json_config(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _to_json_value(value):
+    return value.item() if hasattr(value, "item") else value
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=float), where=denominator > 0)
+
+def summary_metrics(matrices: np.ndarray) -> dict:
+    """
+    Vectorized metrics of a stack of confusion matrices (B, K, K), rows = true labels:
+    {metric: array of B values} for SUMMARY_METRICS. Like sklearn, macro averages run
+    over the labels that occur in y_true or y_pred.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    true_positives = np.diagonal(matrices, axis1=1, axis2=2)
+    support = matrices.sum(axis=2)
+    predicted = matrices.sum(axis=1)
+    total = support.sum(axis=1)
+    precision = _safe_divide(true_positives, predicted)
+    recall = _safe_divide(true_positives, support)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    present = (support + predicted) > 0
+    n_present = np.maximum(present.sum(axis=1), 1)
+    return {
+        "accuracy": _safe_divide(true_positives.sum(axis=1), total),
+        "macro_precision": (precision * present).sum(axis=1) / n_present,
+        "macro_recall": (recall * present).sum(axis=1) / n_present,
+        "macro_f1": (f1 * present).sum(axis=1) / n_present,
+        "weighted_f1": _safe_divide((f1 * support).sum(axis=1), total)
+    }
+
+def per_class_metrics(matrix: np.ndarray, labels: list) -> dict:
+    matrix = np.asarray(matrix, dtype=float)
+    true_positives = np.diagonal(matrix)
+    precision = _safe_divide(true_positives, matrix.sum(axis=0))
+    recall = _safe_divide(true_positives, matrix.sum(axis=1))
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    return {
+        str(label): {
+            "precision": float(precision[i]), "recall": float(recall[i]),
+            "f1": float(f1[i]), "support": int(matrix[i].sum())
+        }
+        for i, label in enumerate(labels)
+    }
+
+def _bootstrap_batch(payload):
+    """
+    n_samples bootstrap replicates of a test set given only its confusion counts:
+    resampling N rows with replacement is a multinomial draw over the K*K cells.
+    """
+    counts, n_samples, seed = payload
+    rng = np.random.default_rng(seed)
+    flat = counts.ravel()
+    total = int(flat.sum())
+    draws = rng.multinomial(total, flat / total, size=n_samples)
+    return summary_metrics(draws.reshape(n_samples, *counts.shape))
+
+def bootstrap_confidence_intervals(
+    matrix: np.ndarray,
+    n_samples: int = 1000,
+    confidence: float = 0.95,
+    workers: int = 1,
+    random_state: int = 42
+) -> dict:
+    """
+    Percentile bootstrap intervals {metric: {"low", "high"}} for SUMMARY_METRICS, resampled
+    from the confusion counts in vectorized batches (one per worker process when workers > 1).
+    """
+    matrix = np.asarray(matrix, dtype=np.int64)
+    if n_samples <= 0 or matrix.sum() == 0:
+        return {}
+    n_batches = max(1, min(workers, n_samples))
+    sizes = [n_samples // n_batches + (1 if i < n_samples % n_batches else 0) for i in range(n_batches)]
+    seeds = np.random.SeedSequence(random_state).spawn(n_batches)
+    payloads = [(matrix, size, seed) for size, seed in zip(sizes, seeds)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_bootstrap_batch, payloads))
+    else:
+        batches = [_bootstrap_batch(payload) for payload in payloads]
+
+    alpha = (1.0 - confidence) / 2.0
+    intervals = {}
+    for metric in SUMMARY_METRICS:
+        values = np.concatenate([batch[metric] for batch in batches])
+        low, high = np.quantile(values, [alpha, 1.0 - alpha])
+        intervals[metric] = {"low": float(low), "high": float(high)}
+    return intervals
+
+def evaluate_streaming(model, scaler, test_data_path: str, features: list, target: str, settings: dict,
+                       schema: dict = None, fmt: str = None) -> dict:
+    """
+    Streams the test set in chunks, accumulating confusion-matrix counts (constant memory)
+    and the latency of each chunk's predict, then derives the metrics and their bootstrap
+    confidence intervals from the counts alone.
+
+    Returns the JSON-ready report {"rows", "labels", "confusion_matrix", "metrics",
+    "per_class", "confidence_intervals", "confidence", "bootstrap_samples", "latency"}.
+    """
+    labels = list(getattr(model, "classes_", []))
+    index = {label: i for i, label in enumerate(labels)}
+    matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    latencies = []
+    rows = 0
+
+    for chunk in iter_table_chunks(test_data_path, features + [target], int(settings["chunk_size"]), schema, fmt):
+        X = scaler.transform(chunk[features]) if scaler else chunk[features]
+        start = time.perf_counter()
+        y_pred = model.predict(X)
+        latencies.append(time.perf_counter() - start)
+
+        true_values, true_inverse = np.unique(chunk[target].to_numpy(), return_inverse=True)
+        pred_values, pred_inverse = np.unique(y_pred, return_inverse=True)
+        unseen = {label for label in true_values.tolist() + pred_values.tolist() if label not in index}
+        for label in sorted(unseen, key=str):
+            index[label] = len(labels)
+            labels.append(label)
+        if unseen:
+            matrix = np.pad(matrix, ((0, len(unseen)), (0, len(unseen))))
+        # Map each chunk's distinct values to matrix indices, then count all cells at once
+        true_idx = np.array([index[label] for label in true_values.tolist()], dtype=np.int64)[true_inverse]
+        pred_idx = np.array([index[label] for label in pred_values.tolist()], dtype=np.int64)[pred_inverse]
+        size = len(labels)
+        matrix += np.bincount(true_idx * size + pred_idx, minlength=size * size).reshape(size, size)
+        rows += len(chunk)
+
+    latency_ms = np.array(latencies) * 1000.0 if latencies else np.zeros(1)
+    total_seconds = float(sum(latencies))
+    return {
+        "rows": rows,
+        "labels": [_to_json_value(label) for label in labels],
+        "confusion_matrix": matrix.tolist(),
+        "metrics": {metric: float(values[0]) for metric, values in summary_metrics(matrix[None]).items()},
+        "per_class": per_class_metrics(matrix, labels),
+        "confidence_intervals": bootstrap_confidence_intervals(
+            matrix, int(settings["bootstrap_samples"]), float(settings["confidence"]),
+            int(settings["workers"]), int(settings["random_state"])
+        ),
+        "confidence": float(settings["confidence"]),
+        "bootstrap_samples": int(settings["bootstrap_samples"]),
+        "latency": {
+            "chunks": len(latencies),
+            "chunk_ms": [float(ms) for ms in latency_ms[:len(latencies)]],
+            "mean_ms": float(latency_ms.mean()),
+            "p50_ms": float(np.percentile(latency_ms, 50)),
+            "p95_ms": float(np.percentile(latency_ms, 95)),
+            "max_ms": float(latency_ms.max()),
+            "rows_per_second": rows / total_seconds if total_seconds > 0 else None
+        }
+    }
+
 def main():
     """
     Evaluate the previously trained model on the test dataset.
     1. Loads model_config and dataset_config
-    2. Loads model and optional scaler
-    3. Reads test_data from CSV
+    2. Loads model and optional scaler (single pipeline artifact or legacy files)
+    3. Reads the features and target of test_data (CSV, Parquet, Feather or npy)
     4. Applies scaler (if any)
     5. Predicts and prints accuracy + classification report
+
+    With model_config["evaluation"]["mode"] == "streaming", the test set is instead
+    streamed in chunks (see evaluate_streaming) and the metrics, bootstrap confidence
+    intervals and predict latency are written to a JSON report.
     """
     # Load configs
     model_config = load_json_config("ml/config/model_config.json")
@@ -34,23 +209,47 @@ def main():
     features = dataset_config["features"]
     target = dataset_config["target"]
 
-    # Load model
+    # Load model (and scaler) from the pipeline artifact, memory-mapped
     if not os.path.isfile(model_path):
         raise FileNotFoundError(f"Trained model not found at {model_path}")
-    model = load(model_path)
+    pipeline = load_pipeline(model_path)
+    model, scaler = pipeline["model"], pipeline["scaler"]
     print(f"Model loaded from {model_path}")
-
-    # Load scaler if present
-    scaler_path = "ml/models/scaler.joblib"
-    scaler = None
-    if os.path.isfile(scaler_path):
-        scaler = load(scaler_path)
-        print(f"Scaler loaded from {scaler_path}")
+    if pipeline["scaler_path"]:
+        print(f"Scaler loaded from {pipeline['scaler_path']}")
 
     # Load test data
-    if not os.path.isfile(test_data_path):
+    if not os.path.exists(test_data_path):
         raise FileNotFoundError(f"Test data not found at {test_data_path}")
-    test_data = pd.read_csv(test_data_path)
+
+    settings = {**EVALUATION_DEFAULTS, **model_config.get("evaluation", {})}
+    if settings["mode"] == "streaming":
+        report = evaluate_streaming(
+            model, scaler, test_data_path, features, target, settings,
+            schema=dataset_config.get("schema"), fmt=dataset_config.get("format")
+        )
+        intervals = report["confidence_intervals"]
+        accuracy_ci = intervals.get("accuracy")
+        ci_text = (f" ({report['confidence']:.0%} CI {accuracy_ci['low']:.4f}-{accuracy_ci['high']:.4f})"
+                   if accuracy_ci else "")
+        print(f"Test Accuracy: {report['metrics']['accuracy']:.4f}{ci_text}")
+        print(f"Macro F1: {report['metrics']['macro_f1']:.4f}, rows: {report['rows']}, "
+              f"predict p95 per chunk: {report['latency']['p95_ms']:.2f} ms")
+
+        output_path = settings["output_path"]
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Evaluation report written to {output_path}")
+        return
+    if settings["mode"] != "full":
+        raise ValueError(f"Unsupported evaluation mode: {settings['mode']}")
+
+    test_data = read_table(
+        test_data_path, features + [target],
+        schema=dataset_config.get("schema"), fmt=dataset_config.get("format")
+    )
 
     X_test = test_data[features]
     y_test = test_data[target]
@@ -0,0 +1,174 @@
+# ml/scripts/hyperparameter_search.py
+
+import time
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler, StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+# Defaults for the "search" section of model_config.json
+SEARCH_DEFAULTS = {
+    "strategy": "grid",         # "grid", "random" or "halving"
+    "param_grid": {},
+    "n_iter": 10,               # candidates drawn by "random"
+    "cv": 3,
+    "n_jobs": -1,
+    "factor": 3,                # halving: keep 1/factor of the candidates per round
+    "min_resources": None,      # halving: training rows per fold in the first round
+    "early_stopping": None,     # {"tolerance": 0.05, "min_folds": 1}
+    "random_state": 42,
+    "results_path": "ml/reports/search_results.json"
+}
+
+def build_fold_cache(X: np.ndarray, y: np.ndarray, cv: int, random_state: int, use_scaler: bool) -> list:
+    """
+    Splits the CV folds once and fits the scaler once per fold; every candidate then
+    reuses the same (X_train, y_train, X_val, y_val) arrays. Stratified when every class
+    has at least cv rows. Training rows are shuffled so any prefix (successive halving's
+    smaller budgets) is a random sample of the fold.
+    """
+    _, class_counts = np.unique(y, return_counts=True)
+    splitter_class = StratifiedKFold if class_counts.min() >= cv else KFold
+    splitter = splitter_class(n_splits=cv, shuffle=True, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    folds = []
+    for train_idx, val_idx in splitter.split(X, y):
+        train_idx = rng.permutation(train_idx)
+        X_train, X_val = X[train_idx], X[val_idx]
+        if use_scaler:
+            scaler = StandardScaler().fit(X_train)
+            X_train, X_val = scaler.transform(X_train), scaler.transform(X_val)
+        folds.append((X_train, y[train_idx], X_val, y[val_idx]))
+    return folds
+
+def _evaluate_candidate(estimator, params: dict, folds: list, n_rows: int = None,
+                        stop_below: float = None, min_folds: int = 1) -> dict:
+    """
+    Cross-validates one candidate on the cached folds (first n_rows training rows of each
+    fold when given). Stops early once the running mean score after min_folds folds is
+    below stop_below.
+    """
+    scores = []
+    fit_seconds = 0.0
+    for X_train, y_train, X_val, y_val in folds:
+        model = clone(estimator).set_params(**params)
+        start = time.perf_counter()
+        model.fit(X_train[:n_rows], y_train[:n_rows])
+        fit_seconds += time.perf_counter() - start
+        scores.append(float(model.score(X_val, y_val)))
+        if stop_below is not None and len(scores) >= min_folds and np.mean(scores) < stop_below:
+            break
+    return {
+        "params": params,
+        "fold_scores": scores,
+        "mean_score": float(np.mean(scores)),
+        "std_score": float(np.std(scores)),
+        "fit_seconds": fit_seconds,
+        "stopped_early": len(scores) < len(folds),
+        "resources": n_rows
+    }
+
+def _run_round(estimator, candidates: list, folds: list, n_jobs: int, n_rows: int, early_stopping: dict) -> list:
+    """
+    Evaluates candidates in parallel. With early stopping they run in waves of one
+    candidate per worker, and each wave is cut short against the best score seen so far.
+    """
+    if not early_stopping:
+        return Parallel(n_jobs=n_jobs)(
+            delayed(_evaluate_candidate)(estimator, params, folds, n_rows) for params in candidates
+        )
+
+    tolerance = float(early_stopping.get("tolerance", 0.05))
+    min_folds = int(early_stopping.get("min_folds", 1))
+    wave_size = effective_n_jobs(n_jobs)
+    results = []
+    best = None
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for start in range(0, len(candidates), wave_size):
+            stop_below = best - tolerance if best is not None else None
+            wave = parallel(
+                delayed(_evaluate_candidate)(estimator, params, folds, n_rows, stop_below, min_folds)
+                for params in candidates[start:start + wave_size]
+            )
+            results.extend(wave)
+            finished = [r["mean_score"] for r in results if not r["stopped_early"]]
+            best = max(finished) if finished else best
+    return results
+
+def _halving_rounds(n_candidates: int, factor: int) -> int:
+    """
+    Rounds successive halving needs to narrow n_candidates down to one: the smallest r
+    with factor ** r >= n_candidates, plus the final round. Integer arithmetic, since
+    math.log(125, 5) is 3.0000000000000004 and would add a round.
+    """
+    if factor < 2:
+        raise ValueError("The halving \"factor\" must be at least 2.")
+    n_rounds, reach = 1, 1
+    while reach < n_candidates:
+        reach *= factor
+        n_rounds += 1
+    return n_rounds
+
+def run_search(estimator, X: np.ndarray, y: np.ndarray, settings: dict, use_scaler: bool) -> dict:
+    """
+    Hyperparameter search over settings["param_grid"] ("grid": every combination,
+    "random": n_iter samples, "halving": successive halving over training rows per fold),
+    run in parallel with n_jobs workers on cached folds (see build_fold_cache).
+
+    Returns {"strategy", "best_params", "best_score", "candidates": [{"params", "fold_scores",
+    "mean_score", "std_score", "fit_seconds", "stopped_early", "resources", "round"}],
+    "seconds"}.
+    """
+    settings = {**SEARCH_DEFAULTS, **settings}
+    strategy = settings["strategy"]
+    random_state = int(settings["random_state"])
+    n_jobs = int(settings["n_jobs"])
+    early_stopping = settings["early_stopping"]
+    start = time.perf_counter()
+
+    if strategy in ("grid", "halving"):
+        candidates = list(ParameterGrid(settings["param_grid"]))
+    elif strategy == "random":
+        candidates = list(ParameterSampler(settings["param_grid"], int(settings["n_iter"]), random_state=random_state))
+    else:
+        raise ValueError(f"Unsupported search strategy: {strategy}")
+    if not candidates:
+        raise ValueError("The search needs a non-empty \"param_grid\".")
+
+    folds = build_fold_cache(X, y, int(settings["cv"]), random_state, use_scaler)
+    records = []
+    if strategy == "halving":
+        factor = int(settings["factor"])
+        max_rows = min(len(fold[0]) for fold in folds)
+        n_rounds = _halving_rounds(len(candidates), factor)
+        min_rows = settings["min_resources"] or max(max_rows // factor ** (n_rounds - 1), 2 * len(np.unique(y)))
+        round_index = 0
+        while True:
+            n_rows = min(int(min_rows * factor ** round_index), max_rows)
+            results = _run_round(estimator, candidates, folds, n_jobs, n_rows, early_stopping)
+            for result in results:
+                result["round"] = round_index
+            records.extend(results)
+            if len(candidates) == 1 or n_rows >= max_rows:
+                break
+            keep = max(1, len(candidates) // factor)
+            ranked = sorted(results, key=lambda r: (r["stopped_early"], -r["mean_score"]))
+            candidates = [r["params"] for r in ranked[:keep]]
+            round_index += 1
+        final = [r for r in records if r["round"] == round_index]
+    else:
+        records = _run_round(estimator, candidates, folds, n_jobs, None, early_stopping)
+        for result in records:
+            result["round"] = 0
+        final = records
+
+    best = max((r for r in final if not r["stopped_early"]), key=lambda r: r["mean_score"], default=None)
+    best = best or max(final, key=lambda r: r["mean_score"])
+    return {
+        "strategy": strategy,
+        "best_params": best["params"],
+        "best_score": best["mean_score"],
+        "candidates": records,
+        "seconds": time.perf_counter() - start
+    }
@@ -2,8 +2,30 @@
 
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-from joblib import load
+
+try:
+    from ml.scripts.data_io import iter_table_chunks, read_table, require_pyarrow, table_columns, pa, pq
+    from ml.scripts.pipeline_artifact import load_pipeline
+except ImportError:  # run as a script from ml/scripts
+    from data_io import iter_table_chunks, read_table, require_pyarrow, table_columns, pa, pq
+    from pipeline_artifact import load_pipeline
+
+# Defaults for the "inference" section of model_config.json
+INFERENCE_DEFAULTS = {
+    "mode": "print",            # or "batch"
+    "input_path": "data/processed/new_data.csv",
+    "output_path": "data/processed/predictions.csv",
+    "chunk_size": 100000,
+    "workers": 1,               # > 1 scores chunks on a process pool
+    "probabilities": False      # also write predict_proba columns
+}
+
+# Model and scaler of the current (worker) process, set by _init_worker
+_worker_state = {}
 
 def load_json_config(path: str) -> dict:
     """
@@ -15,46 +37,217 @@ def load_json_config(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _init_worker(model_path: str, scaler_path: str = None, model=None, scaler=None):
+    """
+    Loads the model (and scaler) once per process instead of once per chunk. The
+    artifact is memory-mapped, so worker processes share its pages.
+    """
+    if model is None:
+        pipeline = load_pipeline(model_path, legacy_scaler_path=scaler_path)
+        model, scaler = pipeline["model"], pipeline["scaler"]
+    _worker_state["model"] = model
+    _worker_state["scaler"] = scaler
+
+def predict_batch(X: pd.DataFrame, model, scaler=None, probabilities: bool = False) -> pd.DataFrame:
+    """
+    Vectorized predictions for one batch: a "prediction" column, plus one
+    "proba_<class>" column per class when probabilities is set and the model has predict_proba.
+    """
+    values = scaler.transform(X) if scaler else X
+    result = pd.DataFrame({"prediction": model.predict(values)}, index=X.index)
+    if probabilities and hasattr(model, "predict_proba"):
+        proba = model.predict_proba(values)
+        for i, label in enumerate(model.classes_):
+            result[f"proba_{label}"] = proba[:, i]
+    return result
+
+def _score_chunk(payload):
+    chunk, probabilities = payload
+    start = time.perf_counter()
+    result = predict_batch(chunk, _worker_state["model"], _worker_state["scaler"], probabilities)
+    return result, time.perf_counter() - start
+
+class _PredictionWriter:
+    """
+    Appends prediction batches to a CSV file, or to a Parquet file (pyarrow) when the
+    output path ends in .parquet.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.parquet = output_path.endswith(".parquet")
+        if self.parquet:
+            require_pyarrow("Parquet")
+        self._writer = None
+        self._first = True
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, batch: pd.DataFrame) -> None:
+        batch = batch.rename_axis("row").reset_index()
+        if self.parquet:
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_path, table.schema)
+            self._writer.write_table(table)
+        else:
+            batch.to_csv(self.output_path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        elif self._first and not self.parquet:
+            pd.DataFrame(columns=["row", "prediction"]).to_csv(self.output_path, index=False)
+
+def run_batch_inference(
+    model_path: str,
+    input_path: str,
+    output_path: str,
+    features: list,
+    scaler_path: str = None,
+    chunk_size: int = 100000,
+    workers: int = 1,
+    probabilities: bool = False,
+    model=None,
+    scaler=None,
+    schema: dict = None,
+    fmt: str = None
+) -> dict:
+    """
+    Streams the feature columns of input_path (CSV, Parquet, Feather or an npy column
+    directory, see data_io.iter_table_chunks) in chunks, predicts each chunk vectorized - on a process pool of `workers` processes
+    when workers > 1 - and writes the predictions to output_path in bulk, keeping input order.
+
+    model/scaler may be passed when already loaded (used in-process only); schema is the
+    optional dataset_config {column: dtype} and fmt its declared "format".
+    Returns a throughput report: {"rows", "batches", "seconds", "rows_per_second",
+    "batch_latency_ms": {"mean", "p50", "p95", "max"}, "output_path"}.
+    """
+    start = time.perf_counter()
+    rows = 0
+    latencies = []
+    writer = _PredictionWriter(output_path)
+
+    def chunks():
+        offset = 0
+        for chunk in iter_table_chunks(input_path, features, chunk_size, schema, fmt):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk[features], probabilities
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(model_path, scaler_path)
+            ) as pool:
+                pending = []
+                for payload in chunks():
+                    pending.append(pool.submit(_score_chunk, payload))
+                    # Bound the chunks in flight so memory stays O(workers * chunk_size)
+                    if len(pending) >= 2 * workers:
+                        rows += _drain(pending.pop(0).result(), writer, latencies)
+                for future in pending:
+                    rows += _drain(future.result(), writer, latencies)
+        else:
+            _init_worker(model_path, scaler_path, model=model, scaler=scaler)
+            for payload in chunks():
+                rows += _drain(_score_chunk(payload), writer, latencies)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    latency_ms = np.array(latencies) * 1000.0 if latencies else np.zeros(1)
+    return {
+        "rows": rows,
+        "batches": len(latencies),
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+        "batch_latency_ms": {
+            "mean": float(latency_ms.mean()),
+            "p50": float(np.percentile(latency_ms, 50)),
+            "p95": float(np.percentile(latency_ms, 95)),
+            "max": float(latency_ms.max())
+        },
+        "output_path": output_path
+    }
+
+def _drain(scored, writer: _PredictionWriter, latencies: list) -> int:
+    result, latency = scored
+    writer.write(result)
+    latencies.append(latency)
+    return len(result)
+
 def main():
     """
     Run inference/predictions on new data using the trained model.
     1. Loads model_config to find model_path
     2. Loads dataset_config for features
-    3. Reads new_data.csv
+    3. Reads the feature columns of new_data (CSV, Parquet, Feather or npy)
     4. Applies optional scaler
     5. Predicts and prints results
+
+    With model_config["inference"]["mode"] == "batch", the input is instead streamed in
+    chunks and the predictions are written to a CSV/Parquet file (see run_batch_inference),
+    followed by a throughput report.
     """
     model_config = load_json_config("ml/config/model_config.json")
     model_path = model_config["save_path"]
 
-    # Load model
-    if not os.path.isfile(model_path):
-        raise FileNotFoundError(f"No model found at {model_path}")
-    model = load(model_path)
+    # Load model (and scaler) from the pipeline artifact, memory-mapped
+    pipeline = load_pipeline(model_path)
+    model, scaler = pipeline["model"], pipeline["scaler"]
     print(f"Model loaded from {model_path}")
-
-    # Check for scaler
-    scaler_path = "ml/models/scaler.joblib"
-    scaler = None
-    if os.path.isfile(scaler_path):
-        scaler = load(scaler_path)
+    scaler_path = pipeline["scaler_path"]
+    if scaler_path:
         print(f"Scaler loaded from {scaler_path}")
 
-    # Load new data
-    new_data_path = "data/processed/new_data.csv"
-    if not os.path.isfile(new_data_path):
-        print(f"No inference data found at {new_data_path}")
-        return
-    new_data = pd.read_csv(new_data_path)
-
     # Get features from dataset_config
     dataset_config = load_json_config("ml/config/dataset_config.json")
     features = dataset_config["features"]
 
-    if not all(feature in new_data.columns for feature in features):
-        missing_cols = [f for f in features if f not in new_data.columns]
+    settings = {**INFERENCE_DEFAULTS, **model_config.get("inference", {})}
+    if settings["mode"] == "batch":
+        if not os.path.exists(settings["input_path"]):
+            print(f"No inference data found at {settings['input_path']}")
+            return
+        report = run_batch_inference(
+            model_path, settings["input_path"], settings["output_path"], features,
+            scaler_path=scaler_path,
+            chunk_size=int(settings["chunk_size"]),
+            workers=int(settings["workers"]),
+            probabilities=bool(settings["probabilities"]),
+            model=model,
+            scaler=scaler,
+            schema=dataset_config.get("schema"),
+            fmt=dataset_config.get("format")
+        )
+        latency = report["batch_latency_ms"]
+        print(f"Predictions for {report['rows']} rows written to {report['output_path']}")
+        print(f"Throughput: {report['rows_per_second']:.0f} rows/s over {report['batches']} batches "
+              f"({report['seconds']:.2f}s)")
+        print(f"Batch latency (ms): mean {latency['mean']:.2f}, p50 {latency['p50']:.2f}, "
+              f"p95 {latency['p95']:.2f}, max {latency['max']:.2f}")
+        return
+    if settings["mode"] != "print":
+        raise ValueError(f"Unsupported inference mode: {settings['mode']}")
+
+    # Load new data
+    new_data_path = settings["input_path"]
+    if not os.path.exists(new_data_path):
+        print(f"No inference data found at {new_data_path}")
+        return
+
+    fmt = dataset_config.get("format")
+    available = table_columns(new_data_path, fmt)
+    if not all(feature in available for feature in features):
+        missing_cols = [f for f in features if f not in available]
         print(f"Error: missing columns in new_data: {missing_cols}")
         return
+    new_data = read_table(
+        new_data_path, features, schema=dataset_config.get("schema"), fmt=fmt
+    )
 
     X_new = new_data[features]
 
@@ -65,8 +258,8 @@ def main():
     # Predict
     predictions = model.predict(X_new)
     print("Inference Results:")
-    for idx, pred in enumerate(predictions):
-        print(f"Row {idx}: {pred}")
+    results = pd.Series(predictions).astype(str)
+    print("\n".join("Row " + results.index.astype(str) + ": " + results))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,112 @@
+# ml/scripts/pipeline_artifact.py
+
+import datetime
+import hashlib
+import json
+import os
+import sklearn
+from joblib import dump, load
+
+# Bumped whenever the artifact layout changes; load_pipeline refuses newer versions.
+ARTIFACT_VERSION = 1
+# Written by train.py before single artifacts existed
+LEGACY_SCALER_PATH = "ml/models/scaler.joblib"
+
+def manifest_path(artifact_path: str) -> str:
+    return f"{artifact_path}.json"
+
+def file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def save_pipeline(model, scaler, features: list, artifact_path: str, target: str = None) -> dict:
+    """
+    Saves scaler + model + feature list as one versioned artifact.
+
+    The artifact is an uncompressed joblib file, so its numpy arrays can be
+    memory-mapped by load_pipeline (mmap_mode='r') and shared between processes.
+    A manifest '<artifact>.json' records the version, features, size and SHA-256
+    checksum. Returns the manifest.
+    """
+    directory = os.path.dirname(artifact_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    bundle = {
+        "version": ARTIFACT_VERSION,
+        "features": list(features),
+        "target": target,
+        "scaler": scaler,
+        "model": model
+    }
+    # compress=0 is what keeps the arrays mappable
+    dump(bundle, artifact_path, compress=0)
+    manifest = {
+        "version": ARTIFACT_VERSION,
+        "model_type": type(model).__name__,
+        "scaler_type": type(scaler).__name__ if scaler is not None else None,
+        "features": list(features),
+        "target": target,
+        "sklearn_version": sklearn.__version__,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "size": os.path.getsize(artifact_path),
+        "sha256": file_checksum(artifact_path)
+    }
+    with open(manifest_path(artifact_path), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_pipeline(
+    artifact_path: str,
+    mmap_mode: str = "r",
+    verify: bool = False,
+    legacy_scaler_path: str = LEGACY_SCALER_PATH
+) -> dict:
+    """
+    Loads a pipeline artifact written by save_pipeline, memory-mapping its arrays
+    (mmap_mode=None loads them into memory instead).
+
+    The artifact's size is always checked against its manifest; verify=True also
+    recomputes the SHA-256 checksum (reads the whole file). A plain estimator saved
+    by older versions of train.py is accepted too, with its scaler read from
+    legacy_scaler_path when that file exists.
+
+    Returns {"model", "scaler", "features" (None for legacy files), "version",
+    "scaler_path" (set only for a legacy scaler)}.
+    Raises FileNotFoundError if the artifact is missing and ValueError if it is
+    corrupt or newer than this code.
+    """
+    if not os.path.isfile(artifact_path):
+        raise FileNotFoundError(f"No model found at {artifact_path}")
+
+    manifest_file = manifest_path(artifact_path)
+    if os.path.isfile(manifest_file):
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("size") != os.path.getsize(artifact_path):
+            raise ValueError(f"{artifact_path} does not match its manifest (size differs)")
+        if verify and manifest.get("sha256") != file_checksum(artifact_path):
+            raise ValueError(f"{artifact_path} does not match its manifest (checksum differs)")
+
+    loaded = load(artifact_path, mmap_mode=mmap_mode)
+    if isinstance(loaded, dict) and "model" in loaded and "version" in loaded:
+        if loaded["version"] > ARTIFACT_VERSION:
+            raise ValueError(
+                f"{artifact_path} is a version {loaded['version']} artifact; "
+                f"this code reads up to version {ARTIFACT_VERSION}"
+            )
+        return {
+            "model": loaded["model"],
+            "scaler": loaded.get("scaler"),
+            "features": loaded.get("features"),
+            "version": loaded["version"],
+            "scaler_path": None
+        }
+
+    pipeline = {"model": loaded, "scaler": None, "features": None, "version": 0, "scaler_path": None}
+    if legacy_scaler_path and os.path.isfile(legacy_scaler_path):
+        pipeline["scaler"] = load(legacy_scaler_path, mmap_mode=mmap_mode)
+        pipeline["scaler_path"] = legacy_scaler_path
+    return pipeline
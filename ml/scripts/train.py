@@ -2,11 +2,41 @@
 
 import json
 import os
-import pandas as pd
+import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier, PassiveAggressiveClassifier, Perceptron
+from sklearn.naive_bayes import GaussianNB, MultinomialNB, BernoulliNB
+from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
-from joblib import dump
+
+try:
+    from ml.scripts.data_io import iter_table_chunks, read_table
+    from ml.scripts.hyperparameter_search import run_search
+    from ml.scripts.pipeline_artifact import save_pipeline
+except ImportError:  # run as a script from ml/scripts
+    from data_io import iter_table_chunks, read_table
+    from hyperparameter_search import run_search
+    from pipeline_artifact import save_pipeline
+
+MODEL_TYPES = {
+    "RandomForestClassifier": RandomForestClassifier,
+    "SGDClassifier": SGDClassifier,
+    "PassiveAggressiveClassifier": PassiveAggressiveClassifier,
+    "Perceptron": Perceptron,
+    "GaussianNB": GaussianNB,
+    "MultinomialNB": MultinomialNB,
+    "BernoulliNB": BernoulliNB,
+    "MLPClassifier": MLPClassifier
+}
+# Defaults for the "training" section of model_config.json
+TRAINING_DEFAULTS = {
+    "mode": "in_memory",        # or "out_of_core", "search"
+    "chunk_size": 50000,        # rows per chunk in out-of-core mode
+    "epochs": 1,                # passes over the data for partial_fit
+    "validation_fraction": 0.2,
+    "random_state": 42
+}
 
 def load_json_config(path: str) -> dict:
     """
@@ -18,32 +48,52 @@ def load_json_config(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def main():
+def build_model(model_config: dict):
     """
-    The main training script. 
-    1. Loads model_config.json and dataset_config.json
-    2. Reads train_data from CSV
-    3. Optionally splits data into train/val
-    4. Scales features if specified
-    5. Trains a model (RandomForest by default)
-    6. Evaluates on validation set
-    7. Saves model + optional scaler
+    Instantiates model_config["model_type"] with its hyperparameters.
+    Raises ValueError for unknown model types.
     """
-    # Load configs
-    model_config = load_json_config("ml/config/model_config.json")
-    dataset_config = load_json_config("ml/config/dataset_config.json")
+    model_type = model_config["model_type"]
+    hyperparams = model_config.get("hyperparameters", {})
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    return MODEL_TYPES[model_type](**hyperparams)
 
-    # Read dataset
-    train_data = pd.read_csv(dataset_config["train_data_path"])
+def iter_chunks(data_path: str, columns: list, chunk_size: int, schema: dict = None, fmt: str = None):
+    """
+    Yields DataFrames of at most chunk_size rows holding the given columns, from any
+    dataset format data_io reads (CSV, Parquet, Feather or a directory of memory-mapped
+    '<column>.npy' files), so only one chunk is ever resident in memory.
+    """
+    yield from iter_table_chunks(data_path, columns, chunk_size, schema, fmt)
+
+def _validation_mask(n_rows: int, chunk_index: int, fraction: float, random_state: int) -> np.ndarray:
+    """
+    Rows of a chunk held out for validation; seeded by chunk position so every pass
+    over the data holds out the same rows.
+    """
+    rng = np.random.default_rng([random_state, chunk_index])
+    return rng.random(n_rows) < fraction
+
+def train_in_memory(model_config: dict, dataset_config: dict):
+    """
+    Reads the features and target of the training set (only those columns; see
+    data_io.read_table), splits train/validation, scales and fits.
+    Returns (model, scaler or None, validation score).
+    """
     features = dataset_config["features"]
     target = dataset_config["target"]
+    train_data = read_table(
+        dataset_config["train_data_path"], features + [target],
+        schema=dataset_config.get("schema"), fmt=dataset_config.get("format")
+    )
 
     X = train_data[features]
     y = train_data[target]
 
     # Optional train/validation split
-    X_train, X_val, y_train, y_val = train_test_split(X, y, 
-                                                      test_size=0.2, 
+    X_train, X_val, y_train, y_val = train_test_split(X, y,
+                                                      test_size=0.2,
                                                       random_state=42)
 
     # Optional scaler
@@ -54,36 +104,147 @@ def main():
         X_train = scaler.fit_transform(X_train)
         X_val = scaler.transform(X_val)
 
-    # Initialize model
-    model_type = model_config["model_type"]
-    hyperparams = model_config.get("hyperparameters", {})
+    model = build_model(model_config)
+    model.fit(X_train, y_train)
+    return model, scaler, model.score(X_val, y_val)
 
-    if model_type == "RandomForestClassifier":
-        model = RandomForestClassifier(**hyperparams)
-    else:
-        raise ValueError(f"Unsupported model type: {model_type}")
+def train_with_search(model_config: dict, dataset_config: dict):
+    """
+    Like train_in_memory, but first searches model_config["search"]["param_grid"] on the
+    training split (see hyperparameter_search.run_search), then refits the best candidate
+    on the whole training split. The per-candidate scores and fit times are written to
+    search["results_path"].
+    Returns (model, scaler or None, validation score).
+    """
+    features = dataset_config["features"]
+    target = dataset_config["target"]
+    train_data = read_table(
+        dataset_config["train_data_path"], features + [target],
+        schema=dataset_config.get("schema"), fmt=dataset_config.get("format")
+    )
+    X_train, X_val, y_train, y_val = train_test_split(train_data[features].to_numpy(),
+                                                      train_data[target].to_numpy(),
+                                                      test_size=0.2,
+                                                      random_state=42)
+
+    use_scaler = model_config.get("scaler", {}).get("type") == "StandardScaler"
+    search_settings = model_config.get("search", {})
+    search = run_search(build_model(model_config), X_train, y_train, search_settings, use_scaler)
+    stopped = sum(1 for c in search["candidates"] if c["stopped_early"])
+    print(f"Search ({search['strategy']}): {len(search['candidates'])} candidate fits, {stopped} stopped early, "
+          f"{search['seconds']:.2f}s")
+    print(f"Best parameters: {search['best_params']} (CV score {search['best_score']:.4f})")
 
-    # Train
+    results_path = search_settings.get("results_path", "ml/reports/search_results.json")
+    if os.path.dirname(results_path):
+        os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, "w", encoding="utf-8") as f:
+        json.dump(search, f, indent=2, default=lambda value: value.item() if hasattr(value, "item") else str(value))
+
+    scaler = None
+    if use_scaler:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_val = scaler.transform(X_val)
+    model = build_model(model_config).set_params(**search["best_params"])
     model.fit(X_train, y_train)
-    print("Training complete.")
+    return model, scaler, model.score(X_val, y_val)
 
-    # Evaluate on validation set
-    val_score = model.score(X_val, y_val)
-    print(f"Validation Score: {val_score:.4f}")
+def train_out_of_core(model_config: dict, dataset_config: dict):
+    """
+    Streams the training data in chunks (see iter_chunks) instead of loading it:
+      1. one pass fits the scaler with partial_fit and collects the class labels
+      2. each epoch feeds the (scaled) training rows of every chunk to model.partial_fit
+      3. a last pass scores the held-out validation rows chunk by chunk
+    The model type must support partial_fit. Returns (model, scaler or None, validation score).
+    """
+    settings = {**TRAINING_DEFAULTS, **model_config.get("training", {})}
+    features = dataset_config["features"]
+    target = dataset_config["target"]
+    data_path = dataset_config["train_data_path"]
+    chunk_size = int(settings["chunk_size"])
+    fraction = float(settings["validation_fraction"])
+    seed = int(settings["random_state"])
 
-    # Save model
-    save_path = model_config["save_path"]
-    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    model = build_model(model_config)
+    if not hasattr(model, "partial_fit"):
+        raise ValueError(
+            f"{model_config['model_type']} does not support incremental learning; "
+            f"use one of {', '.join(name for name, cls in MODEL_TYPES.items() if hasattr(cls, 'partial_fit'))} "
+            f"or training mode 'in_memory'."
+        )
 
-    # If we used a scaler, save it separately
-    if scaler:
-        dump(model, save_path)
-        dump(scaler, "ml/models/scaler.joblib")
-        print(f"Model saved to {save_path}, scaler saved to ml/models/scaler.joblib")
+    def training_chunks():
+        chunks = iter_chunks(
+            data_path, features + [target], chunk_size,
+            schema=dataset_config.get("schema"), fmt=dataset_config.get("format")
+        )
+        for index, chunk in enumerate(chunks):
+            mask = _validation_mask(len(chunk), index, fraction, seed)
+            yield chunk[~mask], chunk[mask]
+
+    scaler = None
+    if model_config.get("scaler", {}).get("type") == "StandardScaler":
+        scaler = StandardScaler()
+    classes = set()
+    for train_rows, _ in training_chunks():
+        if len(train_rows):
+            classes.update(train_rows[target].unique().tolist())
+            if scaler:
+                scaler.partial_fit(train_rows[features])
+    if not classes:
+        raise ValueError(f"No training rows found in {data_path}")
+    classes = np.array(sorted(classes))
+
+    for _ in range(int(settings["epochs"])):
+        for train_rows, _ in training_chunks():
+            if not len(train_rows):
+                continue
+            X = scaler.transform(train_rows[features]) if scaler else train_rows[features]
+            model.partial_fit(X, train_rows[target], classes=classes)
+
+    correct = total = 0
+    for _, val_rows in training_chunks():
+        if not len(val_rows):
+            continue
+        X = scaler.transform(val_rows[features]) if scaler else val_rows[features]
+        correct += int((model.predict(X) == val_rows[target].to_numpy()).sum())
+        total += len(val_rows)
+    return model, scaler, (correct / total if total else float("nan"))
+
+def main():
+    """
+    The main training script.
+    1. Loads model_config.json and dataset_config.json
+    2. Trains in memory or out of core, per model_config["training"]["mode"]:
+       - in_memory: reads train_data (CSV/Parquet/Feather/npy), splits train/val, scales and fits
+       - out_of_core: streams train_data in chunks through partial_fit (scaler and model)
+       - search: hyperparameter search (grid/random/halving) before the in-memory fit
+    3. Evaluates on validation set
+    4. Saves model + optional scaler as a single pipeline artifact (see pipeline_artifact)
+    """
+    # Load configs
+    model_config = load_json_config("ml/config/model_config.json")
+    dataset_config = load_json_config("ml/config/dataset_config.json")
+
+    mode = model_config.get("training", {}).get("mode", TRAINING_DEFAULTS["mode"])
+    if mode == "in_memory":
+        model, scaler, val_score = train_in_memory(model_config, dataset_config)
+    elif mode == "out_of_core":
+        model, scaler, val_score = train_out_of_core(model_config, dataset_config)
+    elif mode == "search":
+        model, scaler, val_score = train_with_search(model_config, dataset_config)
     else:
-        dump(model, save_path)
-        print(f"Model saved to {save_path}")
+        raise ValueError(f"Unsupported training mode: {mode}")
+    print("Training complete.")
+    print(f"Validation Score: {val_score:.4f}")
 
+    # Save scaler + model + features as one memory-mappable artifact
+    save_path = model_config["save_path"]
+    manifest = save_pipeline(model, scaler, dataset_config["features"], save_path, target=dataset_config["target"])
+    included = ", scaler included" if scaler else ""
+    print(f"Model saved to {save_path} (pipeline artifact v{manifest['version']}{included}, "
+          f"sha256 {manifest['sha256'][:12]})")
 
 if __name__ == "__main__":
     main()
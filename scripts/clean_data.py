@@ -1,12 +1,20 @@
 # scripts/clean_data.py
 
 import os
-import pandas as pd
+import sys
 import argparse
 
+try:
+    from ml.scripts.data_io import read_table, write_table
+except ImportError:  # run as a script: make the repository root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from ml.scripts.data_io import read_table, write_table
+
 def main():
     """
     Example script to clean or preprocess CSV data.
+    Input and output may also be Parquet, Feather or an npy column directory
+    (picked from the path, see ml/scripts/data_io.py).
     1. Reads input CSV (default: data/raw/dataset.csv).
     2. Drops rows with NaN values.
     3. Optionally rename columns, convert data types, etc.
@@ -25,7 +33,7 @@ def main():
         return
 
     # Load data
-    df = pd.read_csv(input_path)
+    df = read_table(input_path)
     print(f"Loaded dataset with shape {df.shape} from {input_path}")
 
     # Basic data cleaning example
@@ -39,8 +47,7 @@ def main():
     # df['some_column'] = df['some_column'].astype(int)
 
     # Save cleaned data
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False)
+    write_table(df, output_path)
     print(f"Cleaned data saved to {output_path} with shape {df.shape}")
 
 if __name__ == "__main__":
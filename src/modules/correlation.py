@@ -0,0 +1,160 @@
+# src/modules/correlation.py
+
+import numpy as np
+from typing import Dict, Any, Optional, List
+
+DEFAULT_TOP_K = 10
+DEFAULT_BLOCK_SIZE = 256
+
+
+def blocked_correlations(
+    values: np.ndarray,
+    columns: List[str],
+    top_k: Optional[int] = DEFAULT_TOP_K,
+    threshold: Optional[float] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> Dict[str, Any]:
+    """
+    Pearson correlations of every column against every other, computed in float32 one
+    block of block_size columns at a time (a (block_size, n_columns) matmul), keeping
+    only the strongest pairs, so memory is O(rows * columns + block_size * columns)
+    instead of a full columns x columns matrix.
+
+    Missing values are handled pairwise (like DataFrame.corr): without any NaN the
+    columns are standardized once and each block is a single matmul; otherwise each
+    block also multiplies the presence masks to get per-pair counts, means and
+    variances.
+
+    :param values: (rows, columns) numeric array.
+    :param top_k: Keep the k largest |correlation| per column (None = no limit).
+    :param threshold: Keep only pairs with |correlation| >= threshold.
+    :return: {"columns", "row", "col", "value", "top_k", "threshold"}: row/col (int)
+        and value (float, computed in float32) are parallel lists, a COO sparse matrix
+        where value[n] = corr(columns[row[n]], columns[col[n]]), strongest first within
+        each row. Plain lists keep the result JSON-serializable; np.asarray gives the
+        arrays back.
+    """
+    X = np.asarray(values, dtype=np.float32)
+    n_columns = X.shape[1]
+    present = ~np.isnan(X)
+    counts = present.sum(axis=0)
+    sums = np.nansum(X, axis=0, dtype=np.float64)
+    means = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+    centered = np.where(present, X - means.astype(np.float32), np.float32(0))
+
+    if present.all():
+        norms = np.sqrt((centered.astype(np.float64) ** 2).sum(axis=0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.where(norms > 0, norms, np.nan).astype(np.float32)
+            standardized = centered / scale
+        standardized = np.nan_to_num(standardized, nan=0.0)
+        constant = norms == 0
+
+        def block(start: int, stop: int) -> np.ndarray:
+            corr = standardized[:, start:stop].T @ standardized
+            corr[constant[start:stop], :] = np.nan
+            corr[:, constant] = np.nan
+            return corr
+    else:
+        mask = present.astype(np.float32)
+        squares = centered ** 2
+
+        def block(start: int, stop: int) -> np.ndarray:
+            m, c = mask[:, start:stop], centered[:, start:stop]
+            n = m.T @ mask
+            sum_i, sum_j = c.T @ mask, m.T @ centered
+            with np.errstate(invalid="ignore", divide="ignore"):
+                cov = c.T @ centered - sum_i * sum_j / n
+                var_i = squares[:, start:stop].T @ mask - sum_i ** 2 / n
+                var_j = m.T @ squares - sum_j ** 2 / n
+                corr = cov / np.sqrt(var_i * var_j)
+            corr[(n < 2) | (var_i <= 0) | (var_j <= 0)] = np.nan
+            return corr
+
+    selected = [
+        _select_block(
+            np.clip(block(start, min(start + block_size, n_columns)), -1, 1),
+            start, top_k, threshold
+        )
+        for start in range(0, n_columns, block_size)
+    ]
+    return _pack(columns, selected, top_k, threshold)
+
+
+def select_top_correlations(
+    matrix: np.ndarray,
+    columns: List[str],
+    top_k: Optional[int] = DEFAULT_TOP_K,
+    threshold: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    The compact form of an already computed correlation matrix (see
+    blocked_correlations).
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    selected = [_select_block(matrix.copy(), 0, top_k, threshold)]
+    return _pack(columns, selected, top_k, threshold)
+
+
+def correlations_to_dict(compact: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    {column: {other column: correlation}} for the kept pairs only.
+    """
+    columns = compact["columns"]
+    result: Dict[str, Dict[str, float]] = {}
+    for i, j, value in zip(compact["row"], compact["col"], compact["value"]):
+        result.setdefault(columns[i], {})[columns[j]] = value
+    return result
+
+
+def _select_block(
+    corr: np.ndarray,
+    start: int,
+    top_k: Optional[int],
+    threshold: Optional[float]
+):
+    """
+    (rows, cols, values) of the strongest off-diagonal pairs of a block whose first row
+    is column start.
+    """
+    rows_in_block = np.arange(corr.shape[0])
+    corr[rows_in_block, rows_in_block + start] = np.nan
+    strength = np.nan_to_num(np.abs(corr), nan=-1.0)
+    if threshold is not None:
+        strength[strength < threshold] = -1.0
+    if top_k is not None and top_k < corr.shape[1]:
+        cols = np.argpartition(-strength, top_k - 1, axis=1)[:, :top_k]
+    else:
+        cols = np.broadcast_to(np.arange(corr.shape[1]), corr.shape)
+    rows = np.broadcast_to(rows_in_block[:, None], cols.shape)
+    keep = strength[rows, cols] >= 0
+    rows, cols = rows[keep], cols[keep]
+    # Strongest first within each column
+    order = np.lexsort((-np.abs(corr[rows, cols]), rows))
+    rows, cols = rows[order], cols[order]
+    return (
+        (rows + start).astype(np.int32),
+        cols.astype(np.int32),
+        corr[rows, cols].astype(np.float32)
+    )
+
+
+def _pack(
+    columns: List[str],
+    selected: list,
+    top_k: Optional[int],
+    threshold: Optional[float]
+) -> Dict[str, Any]:
+    def joined(part: int) -> list:
+        if not selected:
+            return []
+        return np.concatenate([arrays[part] for arrays in selected]).tolist()
+
+    return {
+        "columns": list(columns),
+        "row": joined(0),
+        "col": joined(1),
+        "value": joined(2),
+        "top_k": top_k,
+        "threshold": threshold
+    }
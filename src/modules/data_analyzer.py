@@ -2,13 +2,28 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Union, Iterable, Sequence
 
 # If you want optional scikit-learn usage
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 
+from src.modules.correlation import blocked_correlations, DEFAULT_TOP_K, DEFAULT_BLOCK_SIZE
+from src.modules.data_profile import DataProfile, DEFAULT_QUANTILES, DEFAULT_SKETCH_SIZE
 
-def analyze_data(df: pd.DataFrame) -> Dict[str, Any]:
+try:
+    import pyarrow.parquet as pq  # Optional: streaming Parquet files
+except ImportError:
+    pq = None
+
+
+def analyze_data(
+    df: pd.DataFrame,
+    correlation_mode: str = "compact",
+    correlation_top_k: Optional[int] = DEFAULT_TOP_K,
+    correlation_threshold: Optional[float] = None,
+    correlation_block_size: int = DEFAULT_BLOCK_SIZE
+) -> Dict[str, Any]:
     """
     Performs a comprehensive analysis on the given pandas DataFrame.
     This may include:
@@ -18,6 +33,12 @@ def analyze_data(df: pd.DataFrame) -> Dict[str, Any]:
       - Correlation matrix or other relationships
 
     :param df: A pandas DataFrame containing your dataset.
+    :param correlation_mode: "compact" (default) keeps the strongest pairs per column under
+        "correlations" (see correlation.blocked_correlations); "full" returns the whole
+        matrix as a nested dict under "correlation_matrix"; "none" skips correlations.
+    :param correlation_top_k: Compact mode: pairs kept per column (None = no limit).
+    :param correlation_threshold: Compact mode: only keep |correlation| >= threshold.
+    :param correlation_block_size: Compact mode: columns correlated per float32 matmul.
     :return: A dictionary summarizing the analysis.
     """
     analysis_results = {}
@@ -41,14 +62,96 @@ def analyze_data(df: pd.DataFrame) -> Dict[str, Any]:
     # describe_categorical = df.describe(include=["object", "category"]).to_dict()
     # analysis_results["categorical_summary"] = describe_categorical
 
-    # Correlation matrix (for numeric columns), stored as nested dict
-    # If row_count is large or you have many columns, you may consider skipping or limiting columns
-    corr_matrix = df.select_dtypes(include=[np.number]).corr()
-    analysis_results["correlation_matrix"] = corr_matrix.to_dict()
+    # Correlations (for numeric columns): compact top-k pairs, or the full matrix as nested dict
+    numeric = df.select_dtypes(include=[np.number])
+    if correlation_mode == "full":
+        analysis_results["correlation_matrix"] = numeric.corr().to_dict()
+    elif correlation_mode == "compact":
+        analysis_results["correlations"] = blocked_correlations(
+            numeric.to_numpy(dtype=np.float32), list(numeric.columns),
+            top_k=correlation_top_k, threshold=correlation_threshold, block_size=correlation_block_size
+        )
+    elif correlation_mode != "none":
+        raise ValueError(f"Unsupported correlation mode: {correlation_mode}")
 
     return analysis_results
 
 
+def analyze_data_streaming(
+    source: Union[str, Iterable[pd.DataFrame]],
+    chunk_size: int = 100000,
+    columns: Optional[List[str]] = None,
+    workers: int = 1,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    sketch_size: int = DEFAULT_SKETCH_SIZE,
+    correlation_mode: str = "compact",
+    correlation_top_k: Optional[int] = DEFAULT_TOP_K,
+    correlation_threshold: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Constant-memory version of analyze_data for datasets that don't fit in memory.
+    Chunks are folded into mergeable accumulators (see data_profile.DataProfile): exact
+    row/missing counts, mean/std (Welford), min/max and pairwise-complete correlations,
+    and approximate quantiles from a KLL sketch (rank error ~1% with the default size).
+
+    :param source: A CSV/Parquet file path, or an iterable of DataFrame chunks.
+    :param chunk_size: Rows per chunk when reading a file.
+    :param columns: Only read these columns of a file.
+    :param workers: Profile chunks in this many processes and merge the partial profiles;
+        at most 2 chunks per worker are in flight, so memory stays bounded.
+    :param quantiles: Quantiles reported in numeric_summary (as "25%", "50%", ...).
+    :param sketch_size: KLL sketch size k; larger is more accurate.
+    :param correlation_mode: "compact", "full" or "none", as in analyze_data; co-moments
+        (O(columns**2)) are only accumulated unless "none".
+    :return: The same layout as analyze_data.
+    """
+    # Fail on bad arguments before opening or parsing anything
+    if correlation_mode not in ("compact", "full", "none"):
+        raise ValueError(f"Unsupported correlation mode: {correlation_mode}")
+    chunks = iter(_iter_source_chunks(source, chunk_size, columns))
+    first = next(chunks, None)
+    options = {"quantiles": quantiles, "sketch_size": sketch_size, "correlation": correlation_mode != "none"}
+    result_options = {"correlation_mode": correlation_mode, "top_k": correlation_top_k, "threshold": correlation_threshold}
+    profile = DataProfile(**options)
+    if first is None:
+        return profile.result(**result_options)
+    profile.update(first)
+
+    if workers <= 1:
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile.result(**result_options)
+
+    options["numeric_columns"] = profile.numeric_columns
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        index = 1
+        for chunk in chunks:
+            pending.append(pool.submit(_profile_chunk, chunk, options, index))
+            index += 1
+            if len(pending) >= 2 * workers:
+                profile.merge(pending.pop(0).result())
+        for future in pending:
+            profile.merge(future.result())
+    return profile.result(**result_options)
+
+
+def _profile_chunk(chunk: pd.DataFrame, options: Dict[str, Any], index: int) -> DataProfile:
+    # Distinct seeds per chunk keep the merged sketch's compaction choices independent
+    return DataProfile(seed=index * 1000, **options).update(chunk)
+
+
+def _iter_source_chunks(source, chunk_size: int, columns: Optional[List[str]]) -> Iterable[pd.DataFrame]:
+    if not isinstance(source, str):
+        return source
+    if source.endswith((".parquet", ".pq")):
+        if pq is None:
+            raise ImportError("Parquet files require pyarrow (pip install pyarrow).")
+        batches = pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=columns)
+        return (batch.to_pandas() for batch in batches)
+    return pd.read_csv(source, usecols=columns, chunksize=chunk_size)
+
+
 def detect_outliers_iqr(df: pd.DataFrame, columns: Optional[List[str]] = None, factor: float = 1.5) -> Dict[str, List[int]]:
     """
     Detects outliers in specified columns of a DataFrame using the IQR (Interquartile Range) method.
@@ -0,0 +1,273 @@
+# src/modules/data_profile.py
+
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, List, Sequence
+
+from src.modules.correlation import select_top_correlations, DEFAULT_TOP_K
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+DEFAULT_SKETCH_SIZE = 200
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch: a stack of compactors where an item at level h stands for 2**h
+    input values. Full levels are sorted and every other item (random offset) is promoted,
+    so memory stays O(k) and rank error about 1.7/k regardless of stream length.
+    Sketches built on different chunks can be merged.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE, seed: Optional[int] = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        if not self.n:
+            return [float("nan")] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(items) - 1)
+        return items[positions].tolist()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays at this level
+            leftover, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+            promoted = items[self._rng.integers(2)::2]
+            self.levels[level] = leftover
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            # Capacities shrink as the stack grows, so recheck from the bottom
+            level = 0
+
+
+class DataProfile:
+    """
+    Mergeable accumulators for analyze_data_streaming: row and missing counts for every
+    column and, for numeric columns, count/mean/M2 (Welford, merged with Chan's formula),
+    min/max, a KLLSketch for quantiles and pairwise co-moments for correlations. Memory
+    is O(columns**2 + columns * sketch_size) however many rows are fed in, and profiles
+    of separate chunks merge into the profile of their concatenation.
+    """
+
+    def __init__(
+        self,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        sketch_size: int = DEFAULT_SKETCH_SIZE,
+        correlation: bool = True,
+        seed: Optional[int] = 0,
+        numeric_columns: Optional[List[str]] = None
+    ):
+        """
+        :param numeric_columns: Columns to summarize; inferred from the first chunk if None.
+            Pass it when profiling chunks separately, so every partial profile agrees.
+        """
+        self.quantiles = tuple(quantiles)
+        self.sketch_size = sketch_size
+        self.correlation = correlation
+        self.seed = seed
+        self.row_count = 0
+        self.columns: Optional[List[str]] = None
+        self.numeric_columns: List[str] = list(numeric_columns or [])
+        self._infer_numeric = numeric_columns is None
+        self.missing: Optional[np.ndarray] = None
+        self.sketches: List[KLLSketch] = []
+        # Per numeric column
+        self.count = self.mean = self.m2 = self.min = self.max = None
+        # Per pair of numeric columns, over rows where both are present
+        self.pair_count = self.pair_mean = self.pair_m2 = self.comoment = None
+
+    def update(self, chunk: pd.DataFrame) -> "DataProfile":
+        """
+        Adds a chunk of rows; the first chunk fixes the columns and which are numeric.
+        """
+        if self.columns is None:
+            self._start(chunk)
+        self.row_count += len(chunk)
+        self.missing += chunk.reindex(columns=self.columns).isnull().to_numpy().sum(axis=0)
+        if not self.numeric_columns or not len(chunk):
+            return self
+
+        X = chunk.reindex(columns=self.numeric_columns).apply(pd.to_numeric, errors="coerce")
+        X = X.to_numpy(dtype=np.float64)
+        present = ~np.isnan(X)
+        count = present.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.nansum(X, axis=0) / np.maximum(count, 1), 0.0)
+        centered = np.where(present, X - mean, 0.0)
+        m2 = (centered ** 2).sum(axis=0)
+        any_present = count > 0
+        chunk_min = np.where(any_present, np.nanmin(np.where(present, X, np.inf), axis=0), np.inf)
+        chunk_max = np.where(any_present, np.nanmax(np.where(present, X, -np.inf), axis=0), -np.inf)
+        self._merge_moments(count, mean, m2, chunk_min, chunk_max)
+        for index, sketch in enumerate(self.sketches):
+            sketch.update(X[:, index])
+
+        if self.correlation:
+            # Centered by the column means of the chunk; the formulas below are shift-invariant
+            mask = present.astype(np.float64)
+            pair_count = mask.T @ mask
+            pair_sum = centered.T @ mask                        # [i, j]: sum of x_i where x_j present too
+            with np.errstate(invalid="ignore", divide="ignore"):
+                pair_mean = np.where(pair_count > 0, pair_sum / np.maximum(pair_count, 1), 0.0)
+                pair_m2 = (centered ** 2).T @ mask - pair_sum * pair_mean
+                comoment = centered.T @ centered - pair_sum * pair_mean.T
+            self._merge_pairs(pair_count, pair_mean + mean[:, None], pair_m2, comoment)
+        return self
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """
+        Folds another profile (e.g. of a different chunk) into this one.
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self._start_like(other)
+        elif other.columns != self.columns or other.numeric_columns != self.numeric_columns:
+            raise ValueError("Cannot merge profiles of datasets with different columns")
+        self.row_count += other.row_count
+        self.missing += other.missing
+        if self.numeric_columns:
+            self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+            for sketch, other_sketch in zip(self.sketches, other.sketches):
+                sketch.merge(other_sketch)
+            if self.correlation and other.correlation:
+                self._merge_pairs(other.pair_count, other.pair_mean, other.pair_m2, other.comoment)
+        return self
+
+    def result(
+        self,
+        correlation_mode: str = "compact",
+        top_k: Optional[int] = DEFAULT_TOP_K,
+        threshold: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        The same layout as analyze_data: row/column counts, missing values, a describe()-like
+        numeric summary (quantiles approximate) and the pairwise-complete correlations, as
+        top pairs ("compact") or the full nested dict ("full").
+        """
+        columns = self.columns or []
+        summary: Dict[str, Dict[str, float]] = {}
+        for index, column in enumerate(self.numeric_columns):
+            n = int(self.count[index])
+            stats = {"count": float(n)}
+            stats["mean"] = float(self.mean[index]) if n else float("nan")
+            stats["std"] = float(math.sqrt(self.m2[index] / (n - 1))) if n > 1 else float("nan")
+            stats["min"] = float(self.min[index]) if n else float("nan")
+            for q, value in zip(self.quantiles, self.sketches[index].quantiles(self.quantiles)):
+                stats[f"{q * 100:g}%"] = value
+            stats["max"] = float(self.max[index]) if n else float("nan")
+            summary[column] = stats
+
+        result = {
+            "row_count": self.row_count,
+            "column_count": len(columns),
+            "columns": list(columns),
+            "missing_values": {c: int(m) for c, m in zip(columns, self.missing if self.missing is not None else [])},
+            "numeric_summary": summary
+        }
+        if self.correlation and correlation_mode == "full":
+            result["correlation_matrix"] = self.correlation_matrix().to_dict()
+        elif self.correlation and correlation_mode == "compact":
+            result["correlations"] = select_top_correlations(
+                self.correlation_matrix().to_numpy(), self.numeric_columns, top_k, threshold
+            )
+        return result
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        names = self.numeric_columns
+        if not names or self.pair_count is None:
+            return pd.DataFrame(index=names, columns=names, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = self.comoment / np.sqrt(self.pair_m2 * self.pair_m2.T)
+        corr[(self.pair_count < 2) | ~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(self.pair_m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=names, columns=names)
+
+    def _start(self, chunk: pd.DataFrame) -> None:
+        self.columns = list(chunk.columns)
+        if self._infer_numeric:
+            self.numeric_columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+        self._allocate()
+
+    def _start_like(self, other: "DataProfile") -> None:
+        self.columns = list(other.columns)
+        self.numeric_columns = list(other.numeric_columns)
+        self.quantiles = other.quantiles
+        self.correlation = self.correlation and other.correlation
+        self._allocate()
+
+    def _allocate(self) -> None:
+        k = len(self.numeric_columns)
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+        seeds = [None] * k if self.seed is None else [self.seed + i for i in range(k)]
+        self.sketches = [KLLSketch(self.sketch_size, seed) for seed in seeds]
+        if self.correlation:
+            self.pair_count = np.zeros((k, k))
+            self.pair_mean = np.zeros((k, k))
+            self.pair_m2 = np.zeros((k, k))
+            self.comoment = np.zeros((k, k))
+
+    def _merge_moments(self, count, mean, m2, chunk_min, chunk_max) -> None:
+        total = self.count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = mean - self.mean
+            weight = np.where(total > 0, count / np.maximum(total, 1), 0.0)
+            self.mean = self.mean + delta * weight
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.min = np.minimum(self.min, chunk_min)
+        self.max = np.maximum(self.max, chunk_max)
+
+    def _merge_pairs(self, count, mean, m2, comoment) -> None:
+        # Chan et al. pairwise update, elementwise over every (i, j) pair
+        total = self.pair_count + count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, count / np.maximum(total, 1), 0.0)
+            delta = mean - self.pair_mean
+            factor = self.pair_count * weight
+            self.comoment = self.comoment + comoment + delta * delta.T * factor
+            self.pair_m2 = self.pair_m2 + m2 + delta ** 2 * factor
+            self.pair_mean = self.pair_mean + delta * weight
+        self.pair_count = total
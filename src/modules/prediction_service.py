@@ -0,0 +1,248 @@
+# src/modules/prediction_service.py
+
+import json
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ml.scripts.pipeline_artifact import load_pipeline
+
+# Latencies/batch sizes kept for the metrics percentiles
+METRICS_WINDOW = 10000
+
+class ServingMetrics:
+    """
+    Rolling request latency and batch size statistics of a MicroBatcher.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self._batch_sizes.append(size)
+
+    def record_request(self, rows: int, latency: float, failed: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += rows
+            self.errors += int(failed)
+            self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        {"requests", "rows", "batches", "errors", "latency_ms": {"p50", "p99", "max"},
+        "batch_size": {"mean", "p50", "max"}} over the last METRICS_WINDOW entries.
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000.0
+            sizes = np.array(self._batch_sizes)
+            counts = {"requests": self.requests, "rows": self.rows, "batches": self.batches, "errors": self.errors}
+        return {
+            **counts,
+            "latency_ms": {
+                "p50": float(np.percentile(latencies, 50)) if latencies.size else None,
+                "p99": float(np.percentile(latencies, 99)) if latencies.size else None,
+                "max": float(latencies.max()) if latencies.size else None
+            },
+            "batch_size": {
+                "mean": float(sizes.mean()) if sizes.size else None,
+                "p50": float(np.percentile(sizes, 50)) if sizes.size else None,
+                "max": int(sizes.max()) if sizes.size else None
+            }
+        }
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for up to max_wait_ms (or until max_batch_size rows are
+    queued) and answers them with one vectorized call of predict_fn on a background thread.
+
+    predict_fn receives a 2-D array of all queued rows and returns one result per row.
+    If it fails on a batch of several requests, each request is re-run on its own so the
+    error only reaches the request that caused it.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        metrics: Optional[ServingMetrics] = None
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = metrics or ServingMetrics()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows: np.ndarray) -> Future:
+        """
+        Queues a 2-D array of rows; the future resolves to the list of their results.
+        """
+        future: Future = Future()
+        self._queue.put((np.atleast_2d(rows), future))
+        return future
+
+    def predict(self, rows: np.ndarray, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Submits rows and waits for their results. Raises TimeoutError (and withdraws the
+        request if it hasn't been picked up yet) when no result arrives within timeout.
+        """
+        start = time.perf_counter()
+        future = self.submit(rows)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.metrics.record_request(len(rows), time.perf_counter() - start, failed=True)
+            raise TimeoutError(f"No prediction within {timeout} seconds.")
+        except Exception:
+            self.metrics.record_request(len(rows), time.perf_counter() - start, failed=True)
+            raise
+        self.metrics.record_request(len(rows), time.perf_counter() - start)
+        return result
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._predict(batch)
+
+    def _predict(self, batch: List[Any]) -> None:
+        # Requests withdrawn after a timeout are dropped here
+        batch = [(rows, future) for rows, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.metrics.record_batch(sum(len(rows) for rows, _ in batch))
+        try:
+            results = list(self.predict_fn(np.concatenate([rows for rows, _ in batch])))
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for rows, future in batch:
+                try:
+                    future.set_result(list(self.predict_fn(rows)))
+                except Exception as error:
+                    future.set_exception(error)
+            return
+        offset = 0
+        for rows, future in batch:
+            future.set_result(results[offset:offset + len(rows)])
+            offset += len(rows)
+
+class PredictionService:
+    """
+    Keeps the trained model (and scaler) of ml/scripts/train.py loaded and serves
+    micro-batched predictions.
+
+    The pipeline artifact is loaded (memory-mapped) on first use or by warm_up(), and
+    then stays in memory.
+    Batching is tuned with PREDICT_MAX_BATCH_SIZE and PREDICT_BATCH_WAIT_MS.
+    """
+
+    def __init__(
+        self,
+        model_config_path: str = "ml/config/model_config.json",
+        dataset_config_path: str = "ml/config/dataset_config.json",
+        scaler_path: str = "ml/models/scaler.joblib",
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        self.model_config_path = model_config_path
+        self.dataset_config_path = dataset_config_path
+        self.scaler_path = scaler_path
+        self.max_batch_size = max_batch_size or int(os.getenv("PREDICT_MAX_BATCH_SIZE", "64"))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv("PREDICT_BATCH_WAIT_MS", "5"))
+        self.metrics = ServingMetrics()
+        self.model = None
+        self.scaler = None
+        self.features: List[str] = []
+        self._batcher: Optional[MicroBatcher] = None
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """
+        Loads the model, scaler and feature list once and starts the batcher. The feature
+        list comes from the artifact, or from dataset_config for legacy model files.
+        Raises FileNotFoundError if the config or model is missing.
+        """
+        with self._lock:
+            if self._batcher is not None:
+                return
+            model_config = _load_json(self.model_config_path)
+            pipeline = load_pipeline(model_config["save_path"], legacy_scaler_path=self.scaler_path)
+            self.model, self.scaler = pipeline["model"], pipeline["scaler"]
+            self.features = pipeline["features"] or _load_json(self.dataset_config_path)["features"]
+            self._batcher = MicroBatcher(self._predict_rows, self.max_batch_size, self.max_wait_ms, self.metrics)
+
+    def predict(self, rows: List[Any], timeout: Optional[float] = 30.0) -> List[Any]:
+        """
+        Predicts a list of rows, each a {feature: value} dict or a list of values in
+        dataset_config feature order. Raises ValueError for malformed rows (checked before
+        queuing, so they never share a batch) and TimeoutError if no result arrives in time.
+        """
+        self.warm_up()
+        return self._batcher.predict(self._to_array(rows), timeout=timeout)
+
+    def _to_array(self, rows: List[Any]) -> np.ndarray:
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("'rows' must be a non-empty list.")
+        matrix = []
+        for i, row in enumerate(rows):
+            if isinstance(row, dict):
+                missing = [f for f in self.features if f not in row]
+                if missing:
+                    raise ValueError(f"Row {i} is missing features: {missing}")
+                row = [row[f] for f in self.features]
+            if not isinstance(row, list) or len(row) != len(self.features):
+                raise ValueError(f"Row {i} must have {len(self.features)} values.")
+            for value in row:
+                # bool is an int subclass, and null/NaN/inf would only fail inside the batch
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                    raise ValueError(f"Row {i} has a non-numeric or non-finite value: {value!r}")
+            matrix.append(row)
+        return np.asarray(matrix, dtype=float)
+
+    def _predict_rows(self, X: np.ndarray) -> List[Any]:
+        # Same input type the first stage was fitted on (keeps feature-name checks quiet)
+        first_stage = self.scaler if self.scaler is not None else self.model
+        if hasattr(first_stage, "feature_names_in_"):
+            X = pd.DataFrame(X, columns=self.features)
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        return self.model.predict(X).tolist()
+
+def _load_json(path: str) -> dict:
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Config file not found: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -2,10 +2,12 @@
 
 from flask import Flask, render_template, request, jsonify
 from src.chatgpt_integration import ChatGPTClient
+from src.modules.prediction_service import PredictionService
 from src.utils.project_analyzer import analyze_project
 
 app = Flask(__name__)
 chatgpt_client = ChatGPTClient()
+prediction_service = PredictionService()
 
 @app.route("/")
 def index():
@@ -25,5 +27,31 @@ def chat():
     )
     return jsonify({"response": response})
 
+@app.route("/predict", methods=["POST"])
+def predict():
+    payload = request.get_json(silent=True)
+    # A body that isn't a JSON object (e.g. a bare list of rows) has no "rows"
+    rows = payload.get("rows") if isinstance(payload, dict) else None
+    try:
+        prediction_service.warm_up()
+    except (FileNotFoundError, ValueError) as e:
+        # Missing or corrupt model artifact: the service is unavailable, not the request bad
+        return jsonify({"error": str(e)}), 503
+    try:
+        predictions = prediction_service.predict(rows)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except TimeoutError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({"predictions": predictions})
+
+@app.route("/predict/metrics", methods=["GET"])
+def predict_metrics():
+    return jsonify(prediction_service.metrics.snapshot())
+
 if __name__ == "__main__":
+    try:
+        prediction_service.warm_up()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Prediction endpoint disabled until a model is trained: {e}")
     app.run(debug=True, port=5000)
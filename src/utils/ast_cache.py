@@ -0,0 +1,62 @@
+# src/utils/ast_cache.py
+
+import ast
+from typing import Dict, Optional, Tuple
+
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+class AstCache:
+    """
+    Parses each Python file at most once per analysis run and hands the same tree
+    to every scanner that needs it. Entries are keyed by path and revalidated
+    against the filesystem's stamp (size and mtime on disk), so an edited file is re-parsed.
+
+    Trees must be treated as read-only by callers.
+    """
+
+    def __init__(self, fs: Optional[ProjectFS] = None):
+        self.fs = fs or LocalFS(".")
+        self._trees: Dict[str, Tuple[Tuple[int, int], Optional[ast.Module]]] = {}
+        self.parse_errors: Dict[str, str] = {}
+
+    def get(self, path: str) -> Optional[ast.Module]:
+        """
+        Returns the parsed module, or None if the file can't be read or parsed.
+        """
+        try:
+            stamp = self.fs.stamp(path)
+        except (OSError, KeyError):
+            return None
+        cached = self._trees.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        try:
+            source = self.fs.read_bytes(path)
+        except OSError:
+            return None
+        tree = self._parse(path, source)
+        self._trees[path] = (stamp, tree)
+        return tree
+
+    def parse_source(self, key: str, source, stamp: Tuple = ()) -> Optional[ast.Module]:
+        """
+        Parses source that doesn't live in a plain file (e.g. extracted from another
+        container), caching it under key. Pass a stamp that changes with the content.
+        """
+        cached = self._trees.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        tree = self._parse(key, source)
+        self._trees[key] = (stamp, tree)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def _parse(self, key: str, source) -> Optional[ast.Module]:
+        try:
+            return ast.parse(source, filename=key)
+        except (SyntaxError, ValueError) as e:
+            self.parse_errors[key] = str(e)
+            return None
@@ -0,0 +1,161 @@
+# src/utils/clone_index.py
+
+import ast
+import copy
+import hashlib
+import json
+import os
+from typing import Dict, Any, List, Optional
+
+from src.utils.ast_cache import AstCache
+
+INDEX_VERSION = 2
+
+class _Normalizer(ast.NodeTransformer):
+    """
+    Abstracts identifiers and literals so renamed copies hash the same:
+    names, arguments, attributes and function/class names become '_',
+    constants keep only their type, and docstrings are dropped.
+    """
+
+    def visit_Name(self, node):
+        return ast.copy_location(ast.Name(id="_", ctx=node.ctx), node)
+
+    def visit_arg(self, node):
+        node.arg = "_"
+        node.annotation = None
+        return node
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        node.attr = "_"
+        return node
+
+    def visit_Constant(self, node):
+        return ast.copy_location(ast.Constant(value=type(node.value).__name__), node)
+
+    def _visit_definition(self, node):
+        node.name = "_"
+        body = node.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            node.body = body[1:] or [ast.Pass()]
+        self.generic_visit(node)
+        return node
+
+    visit_FunctionDef = _visit_definition
+    visit_AsyncFunctionDef = _visit_definition
+    visit_ClassDef = _visit_definition
+
+def hash_definitions(tree: ast.Module, min_nodes: int = 25) -> List[List[Any]]:
+    """
+    Returns [hash, qualname, kind, lineno, end_lineno] for every function, method and
+    class in the tree whose normalized subtree has at least min_nodes nodes.
+    """
+    entries: List[List[Any]] = []
+
+    def walk(node, prefix: str):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                # The AST cache shares trees across scanners, so normalize a copy.
+                normalized = _Normalizer().visit(copy.deepcopy(child))
+                if sum(1 for _ in ast.walk(normalized)) >= min_nodes:
+                    dump = ast.dump(normalized, annotate_fields=False, include_attributes=False)
+                    digest = hashlib.blake2b(dump.encode("utf-8"), digest_size=16).hexdigest()
+                    kind = "class" if isinstance(child, ast.ClassDef) else "function"
+                    entries.append([digest, qualname, kind, child.lineno, getattr(child, "end_lineno", None)])
+                walk(child, qualname + ".")
+            else:
+                walk(child, prefix)
+
+    walk(tree, "")
+    return entries
+
+class CloneIndex:
+    """
+    Maps each Python file to the normalized-AST hashes of its definitions and persists
+    them as JSON, keyed by path and validated by the file's stamp. On an incremental run
+    only changed files are parsed and hashed; clone groups come from a single pass that
+    builds a hash -> locations map.
+    """
+
+    def __init__(self, path: Optional[str] = None, min_nodes: int = 25):
+        self.path = path
+        self.min_nodes = min_nodes
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.rehashed = 0
+        if path and os.path.isfile(path):
+            self._load()
+
+    def update(self, file_paths: List[str], ast_cache: Optional[AstCache] = None) -> None:
+        """
+        Brings the index in line with file_paths: new or modified files are rehashed,
+        files no longer present are dropped.
+        """
+        if ast_cache is None:
+            ast_cache = AstCache()
+        current = set(file_paths)
+        for stale in [p for p in self.files if p not in current]:
+            del self.files[stale]
+
+        for path in file_paths:
+            try:
+                # JSON round-trips tuples as lists
+                stamp = list(ast_cache.fs.stamp(path))
+            except (OSError, KeyError):
+                self.files.pop(path, None)
+                continue
+            record = self.files.get(path)
+            if record and record["stamp"] == stamp:
+                continue
+            tree = ast_cache.get(path)
+            entries = hash_definitions(tree, self.min_nodes) if tree is not None else []
+            self.files[path] = {"stamp": stamp, "entries": entries}
+            self.rehashed += 1
+
+    def clone_groups(self) -> List[Dict[str, Any]]:
+        """
+        Groups definitions sharing a normalized hash. Groups consisting only of members
+        nested inside other reported clones (e.g. methods of a duplicated class) are omitted.
+        """
+        by_hash: Dict[str, List[Dict[str, Any]]] = {}
+        for path, record in self.files.items():
+            for digest, qualname, kind, lineno, end_lineno in record["entries"]:
+                by_hash.setdefault(digest, []).append({
+                    "path": path, "name": qualname, "kind": kind,
+                    "line": lineno, "end_line": end_lineno
+                })
+
+        groups = {digest: locs for digest, locs in by_hash.items() if len(locs) > 1}
+        grouped = {(loc["path"], loc["name"]) for locs in groups.values() for loc in locs}
+
+        result = []
+        for digest, locations in groups.items():
+            nested = all(
+                "." in loc["name"] and (loc["path"], loc["name"].rsplit(".", 1)[0]) in grouped
+                for loc in locations
+            )
+            if nested:
+                continue
+            result.append({"hash": digest, "kind": locations[0]["kind"], "locations": locations})
+        result.sort(key=lambda g: (-len(g["locations"]), g["locations"][0]["path"]))
+        return result
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "min_nodes": self.min_nodes, "files": self.files}, f)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("min_nodes") == self.min_nodes:
+            self.files = data.get("files", {})
@@ -0,0 +1,410 @@
+# src/utils/compose_analyzer.py
+
+import posixpath
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.dockerfile_analyzer import HEAVY_CONTEXT_ENTRIES, parse_dockerfile
+from src.utils.virtual_fs import ProjectFS
+
+try:
+    import yaml  # Optional: PyYAML
+except ImportError:
+    yaml = None
+
+# Looked up in this order, like `docker compose` does; the first one found is the main
+# file.
+COMPOSE_FILE_NAMES = (
+    "compose.yaml", "compose.yml", "docker-compose.yaml", "docker-compose.yml"
+)
+# Keys whose value replaces the base one when an override file sets them, instead of
+# merging.
+REPLACED_KEYS = ("command", "entrypoint", "healthcheck", "image", "build")
+INTERPOLATION_PATTERN = re.compile(
+    r"\$(?:\{(?P<braced>\w+)(?:(?P<op>:?[-?+])(?P<word>[^}]*))?\}"
+    r"|(?P<plain>\w+)|(?P<escaped>\$))"
+)
+# A bind mount above either threshold is reported as slowing container I/O.
+LARGE_BIND_MOUNT_BYTES = 200 * 1024 * 1024
+LARGE_BIND_MOUNT_FILES = 10000
+
+def find_compose_files(fs: ProjectFS, directory: Optional[str] = None) -> List[str]:
+    """
+    The compose file `docker compose` would load from directory (fs.root by default),
+    followed by its override file if there is one. Empty if there is no compose file.
+    """
+    directory = directory or fs.root
+    for name in COMPOSE_FILE_NAMES:
+        path = fs.join(directory, name)
+        if fs.isfile(path):
+            stem, extension = name.rsplit(".", 1)
+            alternative = "yml" if extension == "yaml" else "yaml"
+            for override_extension in (extension, alternative):
+                override = fs.join(directory, f"{stem}.override.{override_extension}")
+                if fs.isfile(override):
+                    return [path, override]
+            return [path]
+    return []
+
+def load_compose(fs: ProjectFS, paths: List[str]) -> Dict[str, Any]:
+    """
+    Loads and merges compose files (later files override earlier ones) after
+    ${VAR}/${VAR:-default} interpolation against the .env file next to the first one.
+
+    Returns {"config": merged mapping, "lines": {service: (file, line)},
+    "errors": [...]}.
+    """
+    result: Dict[str, Any] = {"config": {}, "lines": {}, "errors": []}
+    if yaml is None:
+        result["errors"].append(
+            "PyYAML is not installed; compose files were not parsed."
+        )
+        return result
+
+    env = _read_env_file(fs, fs.join(fs.dirname(paths[0]), ".env")) if paths else {}
+    for path in paths:
+        try:
+            with fs.open(path, "r") as f:
+                text = f.read()
+            node = yaml.compose(text)
+            data = yaml.safe_load(text) or {}
+        except (OSError, yaml.YAMLError) as e:
+            result["errors"].append(f"{path}: {e}")
+            continue
+        if not isinstance(data, dict):
+            result["errors"].append(f"{path}: top level is not a mapping")
+            continue
+        for service, line in _service_lines(node).items():
+            result["lines"].setdefault(service, (path, line))
+        result["config"] = _merge(result["config"], _interpolate(data, env))
+    return result
+
+def analyze_compose(fs: ProjectFS, paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Performance-relevant review of a compose project:
+      - services without CPU or memory limits (deploy.resources.limits or the legacy
+        cpus/mem_limit keys)
+      - depends_on targets without a healthcheck (in the compose file or the Dockerfile
+        of their build), and dependents that only wait for the container to start
+      - bind mounts of large host directories, measured from the shared inventory
+      - volumes shared between services, and whether several of them write to it
+
+    :param paths: Compose files to merge, in order; defaults to find_compose_files(fs).
+    Returns {"files", "services": [...], "shared_volumes": [...],
+    "findings": [{"type", "service", "file", "line", "message"}], "errors"}.
+    """
+    paths = find_compose_files(fs) if paths is None else paths
+    loaded = load_compose(fs, paths)
+    config = loaded["config"]
+    services = config.get("services")
+    if not isinstance(services, dict):
+        services = {}
+    base_dir = fs.dirname(paths[0]) if paths else fs.root
+
+    reports = []
+    findings: List[Dict[str, Any]] = []
+    mounts: Dict[str, List[Tuple[str, bool]]] = {}
+    for name, service in services.items():
+        service = service if isinstance(service, dict) else {}
+        file, line = loaded["lines"].get(name, (paths[0] if paths else None, None))
+        report = {
+            "name": name,
+            "file": file,
+            "line": line,
+            "image": service.get("image"),
+            "build": _build_context(fs, service.get("build"), base_dir),
+            "limits": _limits(service),
+            "healthcheck": _has_healthcheck(fs, service, base_dir),
+            "depends_on": _depends_on(service.get("depends_on")),
+            "volumes": [
+                _parse_volume(volume, fs, base_dir)
+                for volume in service.get("volumes") or []
+            ]
+        }
+        for volume in report["volumes"]:
+            if volume["source"] and volume["type"] in ("bind", "volume"):
+                key = f"{volume['type']}:{volume['source']}"
+                mounts.setdefault(key, []).append((name, not volume["read_only"]))
+        reports.append(report)
+
+    by_name = {report["name"]: report for report in reports}
+    for report in reports:
+        findings.extend(_limit_findings(report))
+        findings.extend(_startup_findings(report, by_name))
+        findings.extend(_bind_mount_findings(fs, report))
+
+    shared_volumes = []
+    for key, users in sorted(mounts.items()):
+        names = sorted({service for service, _ in users})
+        if len(names) < 2:
+            continue
+        volume_type, source = key.split(":", 1)
+        writers = sorted({service for service, writable in users if writable})
+        shared_volumes.append({
+            "source": source, "type": volume_type, "services": names, "writers": writers
+        })
+        if len(writers) > 1:
+            report = by_name[writers[0]]
+            findings.append(_finding(
+                "shared_writable_volume", report,
+                f"{volume_type} '{source}' is mounted read-write by "
+                f"{', '.join(writers)}; concurrent writers contend for the same files "
+                f"(mount it ':ro' where a service only reads)."
+            ))
+
+    return {
+        "files": paths,
+        "services": reports,
+        "shared_volumes": shared_volumes,
+        "findings": findings,
+        "errors": loaded["errors"]
+    }
+
+def _service_lines(node: Any) -> Dict[str, int]:
+    """
+    1-based line of each service key, from the composed YAML node tree.
+    """
+    lines: Dict[str, int] = {}
+    if node is None or not isinstance(node, yaml.MappingNode):
+        return lines
+    for key, value in node.value:
+        if key.value == "services" and isinstance(value, yaml.MappingNode):
+            for service_key, _ in value.value:
+                lines[service_key.value] = service_key.start_mark.line + 1
+    return lines
+
+def _read_env_file(fs: ProjectFS, path: str) -> Dict[str, str]:
+    env: Dict[str, str] = {}
+    if not fs.isfile(path):
+        return env
+    with fs.open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, _, value = line.partition("=")
+            env[key.strip()] = value.strip().strip("'\"")
+    return env
+
+def _interpolate(value: Any, env: Dict[str, str]) -> Any:
+    if isinstance(value, dict):
+        return {key: _interpolate(item, env) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_interpolate(item, env) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    def substitute(match: "re.Match") -> str:
+        if match.group("escaped"):
+            return "$"
+        name = match.group("braced") or match.group("plain")
+        current = env.get(name)
+        op, word = match.group("op"), match.group("word") or ""
+        if op in (":-", "-"):
+            return current if current or (op == "-" and current is not None) else word
+        if op in (":+", "+"):
+            return word if current or (op == "+" and current is not None) else ""
+        return current or ""
+
+    return INTERPOLATION_PATTERN.sub(substitute, value)
+
+def _merge(base: Any, override: Any, key: Optional[str] = None) -> Any:
+    """
+    Compose-style merge: mappings merge recursively, sequences are appended (without
+    duplicates) and scalars - plus the keys in REPLACED_KEYS - are replaced.
+    """
+    if key in REPLACED_KEYS:
+        return override
+    if isinstance(base, dict) and isinstance(override, dict):
+        merged = dict(base)
+        for name, value in override.items():
+            merged[name] = _merge(base[name], value, name) if name in base else value
+        return merged
+    if isinstance(base, list) and isinstance(override, list):
+        return base + [item for item in override if item not in base]
+    return override
+
+def _build_context(
+    fs: ProjectFS,
+    build: Any,
+    base_dir: str
+) -> Optional[Dict[str, Any]]:
+    if build is None:
+        return None
+    if isinstance(build, str):
+        build = {"context": build}
+    context = build.get("context") or "."
+    if "://" in context or context.startswith("git@"):
+        return {"context": context, "dockerfile": None}
+    context_dir = _resolve(fs, base_dir, context)
+    dockerfile = _resolve(fs, context_dir, build.get("dockerfile") or "Dockerfile")
+    return {
+        "context": context_dir,
+        "dockerfile": dockerfile if fs.isfile(dockerfile) else None
+    }
+
+def _limits(service: Dict[str, Any]) -> Dict[str, Any]:
+    limits = ((service.get("deploy") or {}).get("resources") or {}).get("limits") or {}
+    return {
+        "cpus": limits.get("cpus") or service.get("cpus") or service.get("cpu_quota"),
+        "memory": limits.get("memory") or service.get("mem_limit")
+    }
+
+def _has_healthcheck(fs: ProjectFS, service: Dict[str, Any], base_dir: str) -> bool:
+    healthcheck = service.get("healthcheck")
+    if isinstance(healthcheck, dict):
+        return (
+            not healthcheck.get("disable")
+            and healthcheck.get("test") not in (["NONE"], "NONE")
+        )
+    build = _build_context(fs, service.get("build"), base_dir)
+    if not build or not build["dockerfile"]:
+        return False
+    try:
+        with fs.open(build["dockerfile"], "r") as f:
+            model = parse_dockerfile(f.read())
+    except OSError:
+        return False
+    final = model["stages"][-1]["instructions"] if model["stages"] else []
+    checks = [ins for ins in final if ins["instruction"] == "HEALTHCHECK"]
+    return bool(checks) and checks[-1]["args"].strip().upper() != "NONE"
+
+def _depends_on(depends_on: Any) -> Dict[str, str]:
+    """
+    {dependency: condition}; the short list form means "service_started".
+    """
+    if isinstance(depends_on, list):
+        return {name: "service_started" for name in depends_on}
+    if isinstance(depends_on, dict):
+        return {
+            name: (options or {}).get("condition", "service_started")
+            for name, options in depends_on.items()
+        }
+    return {}
+
+def _parse_volume(volume: Any, fs: ProjectFS, base_dir: str) -> Dict[str, Any]:
+    """
+    Short ('src:target[:mode]') or long syntax -> {"type", "source", "target",
+    "read_only", "path"}, "path" being the resolved host directory of a bind mount.
+    """
+    if isinstance(volume, dict):
+        parsed = {
+            "type": volume.get("type", "volume"),
+            "source": volume.get("source"),
+            "target": volume.get("target"),
+            "read_only": bool(volume.get("read_only"))
+        }
+    else:
+        parts = str(volume).split(":")
+        if len(parts) == 1:
+            parsed = {
+                "type": "volume", "source": None, "target": parts[0], "read_only": False
+            }
+        else:
+            source = parts[0]
+            mode = parts[2] if len(parts) > 2 else ""
+            parsed = {
+                "type": "bind" if source.startswith((".", "/", "~")) else "volume",
+                "source": source,
+                "target": parts[1],
+                "read_only": "ro" in mode.split(",")
+            }
+    parsed["path"] = None
+    source = parsed["source"]
+    if parsed["type"] == "bind" and source and not source.startswith("~"):
+        parsed["path"] = _resolve(fs, base_dir, parsed["source"])
+    return parsed
+
+def _resolve(fs: ProjectFS, base_dir: str, path: str) -> str:
+    joined = fs.join(base_dir, path).replace(fs.sep, "/")
+    return posixpath.normpath(joined).replace("/", fs.sep)
+
+def _finding(finding_type: str, report: Dict[str, Any], message: str) -> Dict[str, Any]:
+    return {
+        "type": finding_type, "service": report["name"], "file": report["file"],
+        "line": report["line"], "message": message
+    }
+
+def _limit_findings(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    findings = []
+    if report["limits"]["memory"] is None:
+        findings.append(_finding(
+            "missing_memory_limit", report,
+            f"Service '{report['name']}' has no memory limit; one runaway container "
+            f"can push the host into swap or the OOM killer (set "
+            f"deploy.resources.limits.memory)."
+        ))
+    if report["limits"]["cpus"] is None:
+        findings.append(_finding(
+            "missing_cpu_limit", report,
+            f"Service '{report['name']}' has no CPU limit and can starve the other "
+            f"services (set deploy.resources.limits.cpus)."
+        ))
+    return findings
+
+def _startup_findings(
+    report: Dict[str, Any],
+    services: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    findings = []
+    for dependency, condition in report["depends_on"].items():
+        target = services.get(dependency)
+        if target is None:
+            findings.append(_finding(
+                "unknown_dependency", report,
+                f"Service '{report['name']}' depends on undefined service "
+                f"'{dependency}'."
+            ))
+        elif not target["healthcheck"]:
+            findings.append(_finding(
+                "dependency_without_healthcheck", report,
+                f"Service '{report['name']}' depends on '{dependency}', which has no "
+                f"healthcheck; it is started as soon as the container runs, not when "
+                f"'{dependency}' is ready."
+            ))
+        elif condition == "service_started":
+            findings.append(_finding(
+                "depends_on_not_healthy", report,
+                f"Service '{report['name']}' waits only for '{dependency}' to start; "
+                f"use 'condition: service_healthy' so it starts once the healthcheck "
+                f"passes."
+            ))
+    return findings
+
+def _bind_mount_findings(fs: ProjectFS, report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    findings = []
+    for volume in report["volumes"]:
+        if not volume["path"]:
+            continue
+        files, size, heavy = _directory_usage(fs, volume["path"])
+        if files == 0:
+            continue
+        if size >= LARGE_BIND_MOUNT_BYTES or files >= LARGE_BIND_MOUNT_FILES or heavy:
+            volume["files"], volume["bytes"] = files, size
+            detail = f" including {', '.join(heavy)}" if heavy else ""
+            findings.append(_finding(
+                "large_bind_mount", report,
+                f"Service '{report['name']}' bind-mounts '{volume['source']}' "
+                f"({files} files, {size / (1024 * 1024):.1f} MB{detail}) at "
+                f"{volume['target']}; bind mounts of large host trees slow container "
+                f"file I/O, mount only what the service needs or use a named volume."
+            ))
+    return findings
+
+def _directory_usage(fs: ProjectFS, directory: str) -> Tuple[int, int, List[str]]:
+    """
+    (files, bytes, heavy top-level entries) under directory, from the shared inventory.
+    """
+    prefix = directory.rstrip(fs.sep) + fs.sep
+    files = size = 0
+    heavy = set()
+    for entry in fs.inventory():
+        path = entry["path"]
+        if not path.startswith(prefix) or not isinstance(entry.get("size"), int):
+            continue
+        files += 1
+        size += entry["size"]
+        top = path[len(prefix):].split(fs.sep, 1)[0]
+        if top in HEAVY_CONTEXT_ENTRIES:
+            heavy.add(top)
+    return files, size, sorted(heavy)
@@ -0,0 +1,376 @@
+# src/utils/dependency_resolver.py
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import zipfile
+from email.parser import Parser
+from importlib import metadata
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from src.utils.hash_cache import default_cache_path
+from src.utils.manifest_parser import canonical_name, parse_requirement
+
+try:
+    from packaging.markers import Marker, InvalidMarker, UndefinedComparison, UndefinedEnvironmentName
+    from packaging.specifiers import InvalidSpecifier, SpecifierSet
+    from packaging.version import InvalidVersion, Version
+except ImportError:  # Optional: without it markers aren't evaluated and pins are compared as text
+    Marker = SpecifierSet = Version = None
+
+RESOLUTION_CACHE_VERSION = 1
+# Resolutions kept in the cache file (most recently used win).
+MAX_CACHED_RESOLUTIONS = 64
+# Top-level requirements pulling in at least this many distributions are flagged.
+HEAVY_TREE_THRESHOLD = 25
+WHEEL_NAME_PATTERN = re.compile(r"^(?P<name>[^-]+)-(?P<version>[^-]+)(-\d[^-]*)?-[^-]+-[^-]+-[^-]+\.whl$")
+
+def wheel_dirs_from_env() -> List[str]:
+    """
+    Local wheel directories from CODE_ANALYZER_WHEEL_DIRS (os.pathsep-separated).
+    """
+    value = os.getenv("CODE_ANALYZER_WHEEL_DIRS", "")
+    return [d for d in value.split(os.pathsep) if d and os.path.isdir(d)]
+
+class DistributionIndex:
+    """
+    Offline source of distribution metadata: what's installed in the running interpreter
+    (importlib.metadata) first, then wheels found in local wheel directories. Nothing is
+    downloaded.
+    """
+
+    def __init__(self, wheel_dirs: Optional[List[str]] = None):
+        self.wheel_dirs = wheel_dirs if wheel_dirs is not None else wheel_dirs_from_env()
+        self._installed: Optional[Dict[str, metadata.Distribution]] = None
+        self._wheels: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        self._lookups: Dict[str, Optional[Dict[str, Any]]] = {}
+        # Sub-project scans share one index across threads; the caches are published
+        # only once complete
+        self._lock = threading.Lock()
+
+    def installed(self) -> Dict[str, metadata.Distribution]:
+        if self._installed is None:
+            with self._lock:
+                if self._installed is None:
+                    installed: Dict[str, metadata.Distribution] = {}
+                    for dist in metadata.distributions():
+                        name = dist.metadata.get("Name")
+                        if name:
+                            installed.setdefault(canonical_name(name), dist)
+                    self._installed = installed
+        return self._installed
+
+    def wheels(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        {canonical name: [(version, wheel path), ...]} with the newest version first.
+        """
+        if self._wheels is None:
+            with self._lock:
+                if self._wheels is None:
+                    self._wheels = self._scan_wheels()
+        return self._wheels
+
+    def _scan_wheels(self) -> Dict[str, List[Tuple[str, str]]]:
+        wheels: Dict[str, List[Tuple[str, str]]] = {}
+        for directory in self.wheel_dirs:
+            for filename in sorted(os.listdir(directory)):
+                match = WHEEL_NAME_PATTERN.match(filename)
+                if match:
+                    wheels.setdefault(canonical_name(match.group("name")), []).append(
+                        (match.group("version"), os.path.join(directory, filename))
+                    )
+        for candidates in wheels.values():
+            candidates.sort(key=lambda c: _version_key(c[0]), reverse=True)
+        return wheels
+
+    def fingerprint(self) -> str:
+        """
+        Changes whenever the interpreter, an installed distribution or the wheel set changes.
+        """
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(sys.version.encode("utf-8"))
+        for name, dist in sorted(self.installed().items()):
+            hasher.update(f"\n{name}=={dist.version}".encode("utf-8"))
+        for name, candidates in sorted(self.wheels().items()):
+            for _, path in candidates:
+                hasher.update(f"\n{path}".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns {"version", "requires": [requirement strings], "source", "size"} or None.
+        """
+        if name in self._lookups:
+            return self._lookups[name]
+        info = None
+        dist = self.installed().get(name)
+        if dist is not None:
+            files = dist.files or []
+            info = {
+                "version": dist.version,
+                "requires": list(dist.requires or []),
+                "source": "installed",
+                "size": sum(f.size or 0 for f in files) or None
+            }
+        else:
+            for version, path in self.wheels().get(name, []):
+                requires = _wheel_requires(path)
+                if requires is not None:
+                    info = {"version": version, "requires": requires, "source": "wheel",
+                            "size": os.path.getsize(path)}
+                    break
+        self._lookups[name] = info
+        return info
+
+def resolve_dependencies(
+    requirements: List[Dict[str, Any]],
+    index: Optional[DistributionIndex] = None,
+    cache_path: Optional[str] = None,
+    heavy_threshold: int = HEAVY_TREE_THRESHOLD
+) -> Dict[str, Any]:
+    """
+    Expands the declared requirements (from manifest_parser) into the full dependency
+    graph using only local metadata, then reports:
+      - per top-level requirement: transitive distribution count and install size
+      - heavy trees (>= heavy_threshold transitive distributions)
+      - conflicts: contradictory pins, and resolved versions that don't satisfy every
+        specifier placed on them (by the manifests or by other distributions)
+      - distributions with no local metadata ("missing")
+
+    Results are memoized in a JSON file keyed by a hash of the requirements (including the
+    manifest each one came from, which the result reports) and of the environment
+    (installed distributions + wheel files), so repeat runs on unchanged manifests skip
+    the walk entirely.
+
+    :param cache_path: Memo file; defaults to the host cache dir. Pass "" to disable.
+    """
+    index = index or DistributionIndex()
+    declared = [r for r in requirements if r["kind"] != "conda"]
+    key = _cache_key(declared, index)
+    if cache_path is None:
+        cache_path = default_cache_path("dependency_resolutions.json")
+    cache = _load_cache(cache_path) if cache_path else {}
+    if key in cache:
+        # Hits don't rewrite the file; eviction order is refreshed on the next miss
+        return dict(cache[key], cached=True)
+
+    result = _resolve(declared, index, heavy_threshold)
+    if cache_path:
+        cache[key] = result
+        while len(cache) > MAX_CACHED_RESOLUTIONS:
+            cache.pop(next(iter(cache)))
+        _save_cache(cache_path, cache)
+    return dict(result, cached=False)
+
+def _resolve(requirements: List[Dict[str, Any]], index: DistributionIndex, heavy_threshold: int) -> Dict[str, Any]:
+    nodes: Dict[str, Dict[str, Any]] = {}
+    constraints: Dict[str, List[Dict[str, str]]] = {}
+    extras_seen: Dict[str, Set[str]] = {}
+    top_level: List[str] = []
+    skipped: List[str] = []
+
+    queue: List[Tuple[str, Set[str]]] = []
+    for req in requirements:
+        if not _marker_applies(req["marker"], set()):
+            skipped.append(req["raw"])
+            continue
+        if req["specifier"]:
+            constraints.setdefault(req["name"], []).append({"specifier": req["specifier"], "from": req["source"]})
+        if req["kind"] == "constraint":
+            continue  # -c files only restrict versions, they don't add packages
+        if req["name"] not in top_level:
+            top_level.append(req["name"])
+        queue.append((req["name"], set(req["extras"])))
+
+    while queue:
+        name, extras = queue.pop()
+        known = extras_seen.get(name)
+        if known is not None and extras <= known:
+            continue
+        new_extras = extras - (known or set())
+        first_visit = known is None
+        extras_seen[name] = (known or set()) | extras
+        info = index.lookup(name)
+        if first_visit:
+            nodes[name] = {
+                "version": info["version"] if info else None,
+                "source": info["source"] if info else "missing",
+                "size": info["size"] if info else None,
+                "requires": []
+            }
+        if info is None:
+            continue
+        parent = f"{name}=={info['version']}"
+        for text in info["requires"]:
+            dep = parse_requirement(text, parent)
+            if dep is None:
+                continue
+            # On the first visit take the base requirements; later visits only add the
+            # requirements of newly requested extras.
+            wanted = ({""} | extras) if first_visit else new_extras
+            if not any(_requirement_applies(dep["marker"], extra) for extra in wanted):
+                continue
+            if dep["name"] not in nodes[name]["requires"]:
+                nodes[name]["requires"].append(dep["name"])
+            if dep["specifier"]:
+                constraints.setdefault(dep["name"], []).append({"specifier": dep["specifier"], "from": parent})
+            queue.append((dep["name"], set(dep["extras"])))
+
+    trees = {}
+    for name in top_level:
+        closure = _closure(name, nodes)
+        trees[name] = {
+            "transitive": len(closure) - 1,
+            "install_bytes": sum(nodes[n]["size"] or 0 for n in closure)
+        }
+    heavy = sorted(
+        (dict(package=name, **tree) for name, tree in trees.items() if tree["transitive"] >= heavy_threshold),
+        key=lambda t: -t["transitive"]
+    )
+
+    return {
+        "packages_resolved": len(nodes),
+        "trees": trees,
+        "heavy_trees": heavy,
+        "conflicts": _find_conflicts(nodes, constraints),
+        "missing": sorted(name for name, node in nodes.items() if node["source"] == "missing"),
+        "skipped_by_marker": skipped,
+        "graph": {name: node["requires"] for name, node in sorted(nodes.items())}
+    }
+
+def _find_conflicts(nodes: Dict[str, Dict[str, Any]], constraints: Dict[str, List[Dict[str, str]]]) -> List[Dict[str, Any]]:
+    conflicts = []
+    for name, items in sorted(constraints.items()):
+        version = nodes.get(name, {}).get("version")
+        pins = {item["specifier"][2:].strip() for item in items if item["specifier"].startswith("==")
+                and "," not in item["specifier"]}
+        reasons = []
+        if len(pins) > 1:
+            reasons.append(f"pinned to different versions: {', '.join(sorted(pins))}")
+        if SpecifierSet is not None:
+            candidates = [version] if version else sorted(pins)
+            for candidate in candidates:
+                failing = [item for item in items if not _satisfies(candidate, item["specifier"])]
+                if failing:
+                    label = "installed" if candidate == version else "pinned"
+                    reasons.append(
+                        f"{label} version {candidate} violates "
+                        + "; ".join(f"{item['specifier']} (from {item['from']})" for item in failing)
+                    )
+        if reasons:
+            conflicts.append({"package": name, "resolved_version": version, "constraints": items, "reasons": reasons})
+    return conflicts
+
+def _satisfies(version: str, specifier: str) -> bool:
+    """
+    True when the version satisfies the specifier, or when either can't be interpreted.
+    """
+    try:
+        return SpecifierSet(specifier).contains(Version(version), prereleases=True)
+    except (InvalidSpecifier, InvalidVersion):
+        return True
+
+def _closure(name: str, nodes: Dict[str, Dict[str, Any]]) -> Set[str]:
+    seen = {name}
+    stack = [name]
+    while stack:
+        for child in nodes.get(stack.pop(), {}).get("requires", []):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+def _marker_applies(marker: Optional[str], extras: Set[str]) -> bool:
+    if not marker:
+        return True
+    if Marker is None:
+        # Without packaging only extras can be judged: keep everything not tied to one.
+        return not _mentions_extra(marker) or any(f'"{e}"' in marker or f"'{e}'" in marker for e in extras)
+    try:
+        parsed = Marker(marker)
+    except InvalidMarker:
+        return True
+    try:
+        if not extras:
+            return parsed.evaluate({"extra": ""})
+        return any(parsed.evaluate({"extra": extra}) for extra in extras)
+    except (UndefinedComparison, UndefinedEnvironmentName):
+        return True
+
+def _requirement_applies(marker: Optional[str], extra: str) -> bool:
+    """
+    Whether a Requires-Dist entry is needed for one requested extra ("" = the base install).
+    """
+    if _mentions_extra(marker) != bool(extra):
+        return False
+    return _marker_applies(marker, {extra} if extra else set())
+
+def _mentions_extra(marker: Optional[str]) -> bool:
+    return bool(marker) and re.search(r"\bextra\b", marker) is not None
+
+def _wheel_requires(path: str) -> Optional[List[str]]:
+    try:
+        with zipfile.ZipFile(path) as wheel:
+            name = next((n for n in wheel.namelist() if n.endswith(".dist-info/METADATA")), None)
+            if name is None:
+                return None
+            message = Parser().parsestr(wheel.read(name).decode("utf-8", "replace"), headersonly=True)
+    except (OSError, zipfile.BadZipFile):
+        return None
+    return message.get_all("Requires-Dist") or []
+
+def _version_key(version: str):
+    if Version is not None:
+        try:
+            return (1, Version(version))
+        except InvalidVersion:
+            pass
+    return (0, version)
+
+def _cache_key(requirements: List[Dict[str, Any]], index: DistributionIndex) -> str:
+    # source and raw are part of the result (constraints "from", skipped_by_marker)
+    manifest = sorted(
+        (r["name"], r["specifier"], ",".join(r["extras"]), r["marker"] or "", r["kind"], r["url"] or "",
+         r["source"] or "", r["raw"])
+        for r in requirements
+    )
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps(manifest).encode("utf-8"))
+    hasher.update(index.fingerprint().encode("utf-8"))
+    return hasher.hexdigest()
+
+def _load_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != RESOLUTION_CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+def _save_cache(path: str, entries: Dict[str, Any]) -> None:
+    # A private temp file per writer, so concurrent sub-project scans never interleave
+    tmp_path = None
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, prefix=".resolutions-", suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump({"version": RESOLUTION_CACHE_VERSION, "entries": entries}, f)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    except OSError:
+        pass  # A read-only cache dir only costs the memoization
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -1,43 +1,70 @@
 # src/utils/docker_scanner.py
 
-import os
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-def analyze_docker_setup(project_path: str) -> Dict[str, Any]:
+from src.utils.compose_analyzer import analyze_compose, find_compose_files
+from src.utils.dockerfile_analyzer import analyze_dockerfile
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+def analyze_docker_setup(project_path: str, fs: Optional[ProjectFS] = None) -> Dict[str, Any]:
     """
-    Checks for Dockerfile and docker-compose.yml and looks for:
+    Checks for Dockerfile and a compose file (compose.yaml, docker-compose.yml, ... plus
+    its override file) and looks for:
       - Placeholders (TODO, PLACEHOLDER)
       - Some best-practice checks (example: if 'apt-get update' is missing a '&& apt-get upgrade', etc.)
+      - Build-cache efficiency of the Dockerfile (see dockerfile_analyzer.analyze_dockerfile)
+      - Resource limits, startup ordering, bind mounts and shared volumes of the compose
+        services (see compose_analyzer.analyze_compose)
 
     Returns a dict:
       {
         "dockerfile_found": bool,
         "docker_compose_found": bool,
-        "docker_issues": list of strings
+        "docker_issues": list of strings,
+        "dockerfile_analysis": instruction model findings, build context and rebuild costs,
+        "compose_files": compose files that were loaded (main file first),
+        "compose_analysis": per-service configuration, shared volumes and findings
       }
     """
+    fs = fs or LocalFS(project_path)
     results = {
         "dockerfile_found": False,
         "docker_compose_found": False,
         "docker_issues": []
     }
 
-    dockerfile = os.path.join(project_path, "Dockerfile")
-    if os.path.isfile(dockerfile):
+    dockerfile = fs.join(fs.root, "Dockerfile")
+    if fs.isfile(dockerfile):
         results["dockerfile_found"] = True
-        dockerfile_issues = _scan_dockerfile(dockerfile)
+        dockerfile_issues = _scan_dockerfile(fs, dockerfile)
         results["docker_issues"].extend(dockerfile_issues)
+        try:
+            analysis = analyze_dockerfile(fs, dockerfile)
+        except OSError as e:
+            results["docker_issues"].append(f"Error analyzing Dockerfile: {e}")
+        else:
+            results["dockerfile_analysis"] = analysis
+            for finding in analysis["findings"]:
+                location = f"{dockerfile} line {finding['line']}" if finding["line"] else dockerfile
+                results["docker_issues"].append(f"{location}: {finding['message']}")
 
-    compose = os.path.join(project_path, "docker-compose.yml")
-    if os.path.isfile(compose):
+    compose_files = find_compose_files(fs)
+    if compose_files:
         results["docker_compose_found"] = True
-        compose_issues = _scan_docker_compose(compose)
-        results["docker_issues"].extend(compose_issues)
+        results["compose_files"] = compose_files
+        for compose in compose_files:
+            results["docker_issues"].extend(_scan_docker_compose(fs, compose))
+        analysis = analyze_compose(fs, compose_files)
+        results["compose_analysis"] = analysis
+        results["docker_issues"].extend(analysis["errors"])
+        for finding in analysis["findings"]:
+            location = f"{finding['file']} line {finding['line']}" if finding["line"] else finding["file"]
+            results["docker_issues"].append(f"{location}: {finding['message']}")
 
     return results
 
-def _scan_dockerfile(dockerfile_path: str) -> list:
+def _scan_dockerfile(fs: ProjectFS, dockerfile_path: str) -> list:
     """
     Reads Dockerfile line by line, checking for:
       - 'TODO' or 'PLACEHOLDER'
@@ -52,7 +79,7 @@ def _scan_dockerfile(dockerfile_path: str) -> list:
 
     found_from = False
     try:
-        with open(dockerfile_path, "r", encoding="utf-8", errors="ignore") as f:
+        with fs.open(dockerfile_path, "r") as f:
             lines = f.readlines()
             for i, line in enumerate(lines, start=1):
                 if "FROM" in line.upper():
@@ -69,20 +96,20 @@ def _scan_dockerfile(dockerfile_path: str) -> list:
 
     return issues
 
-def _scan_docker_compose(compose_path: str) -> list:
+def _scan_docker_compose(fs: ProjectFS, compose_path: str) -> list:
     """
-    Scans docker-compose.yml for placeholders or typical issues.
+    Scans a compose file for placeholders or typical issues.
     """
     issues = []
     placeholder_pattern = re.compile(r"(TODO|PLACEHOLDER)", re.IGNORECASE)
     try:
-        with open(compose_path, "r", encoding="utf-8", errors="ignore") as f:
+        with fs.open(compose_path, "r") as f:
             lines = f.readlines()
             for i, line in enumerate(lines, start=1):
                 if placeholder_pattern.search(line):
                     issues.append(f"{compose_path} line {i}: Found placeholder => {line.strip()}")
                 # Add more checks if needed
     except OSError as e:
-        issues.append(f"Error reading docker-compose.yml: {e}")
+        issues.append(f"Error reading {fs.basename(compose_path)}: {e}")
 
     return issues
@@ -0,0 +1,629 @@
+# src/utils/dockerfile_analyzer.py
+
+import json
+import re
+import shlex
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.virtual_fs import ProjectFS
+
+# Instructions that add a filesystem layer
+LAYER_INSTRUCTIONS = ("RUN", "COPY", "ADD")
+DEPENDENCY_INSTALL_PATTERN = re.compile(
+    r"\b(pip3?|python[\d.]*\s+-m\s+pip)\s+install\b|"
+    r"\b(poetry|pipenv|bundle)\s+install\b|"
+    r"\bnpm\s+(ci|install)\b|\byarn(\s+install)?\s*($|&&|;)|\bpnpm\s+install\b|"
+    r"\bgo\s+mod\s+download\b|"
+    r"\bconda\s+(env\s+)?(create|install|update)\b"
+)
+SYSTEM_INSTALL_PATTERN = re.compile(
+    r"\bapt(-get)?\s+install\b|\bapk\s+add\b|\b(yum|dnf|microdnf)\s+install\b"
+)
+BUILD_STEP_PATTERN = re.compile(
+    r"\b(gcc|g\+\+|build-essential|make|cmake|cargo\s+build|go\s+build|mvn\s+package|"
+    r"gradle\s+build|"
+    r"npm\s+run\s+build|yarn\s+build|python[\d.]*\s+setup\.py\s+(build|bdist_wheel))\b"
+)
+PIP_INSTALL_PATTERN = re.compile(r"\b(pip3?|python[\d.]*\s+-m\s+pip)\s+install\b")
+VARIABLE_PATTERN = re.compile(
+    r"\$(?:\{(?P<braced>\w+)(?::(?P<op>[-+])(?P<word>[^}]*))?\}|(?P<plain>\w+))"
+)
+# '<<EOF', '<<-EOF', '<<"EOF"': the word follows '<<' or '<<-' directly ('<<<' is a
+# here-string)
+HEREDOC_PATTERN = re.compile(r"(?<!<)<<-?(?P<quote>[\"']?)(?P<delimiter>\w+)(?P=quote)")
+# Shell arithmetic expansion, where '<<' is a bit shift rather than a heredoc
+ARITHMETIC_PATTERN = re.compile(r"\$\(\((?:[^()]|\([^()]*\))*\)\)")
+
+# Rough rebuild cost model (seconds) used to rank cache invalidations; only the ratios
+# matter.
+INSTRUCTION_COST_SECONDS = {
+    "dependency_install": 60.0,
+    "system_install": 45.0,
+    "build_step": 30.0,
+    "run": 5.0,
+    "copy": 1.0
+}
+COPY_BYTES_PER_SECOND = 100 * 1024 * 1024
+# Context entries that almost never belong in an image
+HEAVY_CONTEXT_ENTRIES = (
+    ".git", "node_modules", ".venv", "venv", "__pycache__", ".mypy_cache",
+    ".pytest_cache", ".tox"
+)
+LARGE_CONTEXT_ENTRY_BYTES = 50 * 1024 * 1024
+CONSECUTIVE_RUN_LIMIT = 3
+SLIM_BASE_MARKERS = (
+    "slim", "alpine", "distroless", "scratch", "busybox", "minimal", "micro"
+)
+
+def parse_dockerfile(text: str) -> Dict[str, Any]:
+    """
+    Parses a Dockerfile into an instruction model.
+
+    Handles line continuations (and the '# escape=' directive), comments, heredocs,
+    JSON-form arguments, '--flag=value' options, multi-stage builds and ARG/ENV
+    substitution (global ARGs in FROM lines, stage ARG/ENV elsewhere; RUN is left to
+    the shell). Returns {"global_args", "stages": [{"index", "name", "base",
+    "from_stage", "line", "instructions": [...]}], "errors"}, each instruction being
+    {"instruction", "args", "expanded", "flags", "line", "stage"}.
+    """
+    escape = "\\"
+    directive = re.match(r"^\s*#\s*escape\s*=\s*(\S)", text)
+    if directive:
+        escape = directive.group(1)
+
+    model: Dict[str, Any] = {"global_args": {}, "stages": [], "errors": []}
+    stage_vars: Dict[str, str] = {}
+    stage_names: Dict[str, int] = {}
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        start = i + 1
+        stripped = lines[i].strip()
+        i += 1
+        if not stripped or stripped.startswith("#"):
+            continue
+        logical = stripped
+        while logical.endswith(escape) and i < len(lines):
+            logical = logical[:-1].rstrip() + " "
+            nxt = lines[i].strip()
+            i += 1
+            if nxt.startswith("#"):
+                continue
+            logical += nxt
+        heredoc = _find_heredoc(logical)
+        if heredoc and logical.split(None, 1)[0].upper() in ("RUN", "COPY", "ADD"):
+            body = []
+            while i < len(lines) and lines[i].strip() != heredoc.group("delimiter"):
+                body.append(lines[i])
+                i += 1
+            i += 1
+            logical += "\n" + "\n".join(body)
+
+        parts = logical.split(None, 1)
+        keyword = parts[0].upper()
+        args = parts[1].strip() if len(parts) > 1 else ""
+        if keyword in ("FROM", "COPY", "ADD", "RUN"):
+            flags, args = _split_flags(args)
+        else:
+            flags = {}
+
+        if keyword == "FROM":
+            tokens = args.split()
+            if not tokens:
+                model["errors"].append(f"line {start}: FROM without an image")
+                continue
+            base = _expand(tokens[0], model["global_args"])
+            name = tokens[2] if len(tokens) >= 3 and tokens[1].upper() == "AS" else None
+            stage = {
+                "index": len(model["stages"]),
+                "name": name,
+                "base": base,
+                "from_stage": stage_names.get(base.lower()),
+                "platform": flags.get("platform"),
+                "line": start,
+                "instructions": []
+            }
+            model["stages"].append(stage)
+            if name:
+                stage_names[name.lower()] = stage["index"]
+            stage_names[str(stage["index"])] = stage["index"]
+            stage_vars = {}
+            if stage["from_stage"] is not None:
+                stage_vars.update(model["stages"][stage["from_stage"]]["env"])
+            stage["env"] = stage_vars
+            continue
+
+        if not model["stages"]:
+            if keyword == "ARG":
+                for name, value in _parse_assignments(args, allow_bare=True):
+                    model["global_args"][name] = value
+            else:
+                model["errors"].append(f"line {start}: {keyword} before the first FROM")
+            continue
+
+        stage = model["stages"][-1]
+        expanded = args if keyword == "RUN" else _expand(args, stage_vars)
+        if keyword == "ARG":
+            for name, value in _parse_assignments(args, allow_bare=True):
+                if value is None:
+                    value = model["global_args"].get(name)
+                if value is not None:
+                    stage_vars[name] = _expand(value, stage_vars)
+        elif keyword == "ENV":
+            for name, value in _parse_assignments(args, allow_bare=False):
+                stage_vars[name] = _expand(value or "", stage_vars)
+        stage["instructions"].append({
+            "instruction": keyword,
+            "args": args,
+            "expanded": expanded,
+            "flags": flags,
+            "line": start,
+            "stage": stage["index"]
+        })
+    for stage in model["stages"]:
+        stage.pop("env", None)
+    return model
+
+def parse_dockerignore(text: str) -> List[Tuple[bool, "re.Pattern"]]:
+    """
+    Compiles .dockerignore patterns into [(is_exception, regex)] in file order.
+    A pattern matching a directory also matches everything below it.
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        exception = line.startswith("!")
+        pattern = line[1:].strip() if exception else line
+        pattern = re.sub(r"/+", "/", pattern).strip("/")
+        if pattern.startswith("./"):
+            pattern = pattern[2:]
+        if pattern:
+            rules.append((exception, _glob_to_regex(pattern)))
+    return rules
+
+def is_ignored(relative_path: str, rules: List[Tuple[bool, "re.Pattern"]]) -> bool:
+    """
+    Docker semantics: the last matching rule wins.
+    """
+    ignored = False
+    for exception, regex in rules:
+        if regex.match(relative_path):
+            ignored = not exception
+    return ignored
+
+def analyze_dockerfile(
+    fs: ProjectFS,
+    dockerfile_path: str,
+    context_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build-cache efficiency analysis of one Dockerfile:
+      - cache-busting order (whole-context COPY before dependency installs)
+      - pip installs keeping their cache, apt/apk installs keeping package indexes
+      - layer counts and runs of consecutive RUN instructions
+      - unpinned base images
+      - build context size from the shared inventory versus .dockerignore
+      - single-stage builds that ship their build toolchain
+      - an estimated rebuild cost for a change to the files behind each COPY/ADD
+
+    :param context_dir: Build context; defaults to the Dockerfile's directory.
+    Returns {"stages", "layers", "findings": [{"type", "line", "message"}],
+    "build_context", "rebuild_cost", "parse_errors"}.
+    """
+    with fs.open(dockerfile_path, "r") as f:
+        model = parse_dockerfile(f.read())
+    context_dir = context_dir or fs.dirname(dockerfile_path)
+    context_files = _context_files(fs, context_dir, dockerfile_path)
+
+    findings: List[Dict[str, Any]] = []
+    stage_summaries = []
+    for stage in model["stages"]:
+        layers = sum(
+            1 for ins in stage["instructions"]
+            if ins["instruction"] in LAYER_INSTRUCTIONS
+        )
+        stage_summaries.append({
+            "index": stage["index"], "name": stage["name"], "base": stage["base"],
+            "line": stage["line"], "layers": layers
+        })
+        findings.extend(_base_image_findings(stage, model))
+        findings.extend(_stage_findings(stage))
+    findings.extend(_multi_stage_findings(model))
+
+    context = _context_summary(context_files)
+    findings.extend(context.pop("findings"))
+
+    return {
+        "stages": stage_summaries,
+        "layers": sum(s["layers"] for s in stage_summaries),
+        "findings": sorted(findings, key=lambda f: (f["line"] or 0, f["type"])),
+        "build_context": context,
+        "rebuild_cost": _rebuild_costs(model, context_files),
+        "parse_errors": model["errors"]
+    }
+
+def _find_heredoc(line: str) -> Optional["re.Match"]:
+    # Blank out $(( ... )) so shifts inside it aren't taken for heredocs
+    masked = ARITHMETIC_PATTERN.sub(lambda m: " " * len(m.group(0)), line)
+    return HEREDOC_PATTERN.search(masked)
+
+def _split_flags(args: str) -> Tuple[Dict[str, str], str]:
+    flags: Dict[str, str] = {}
+    while args.startswith("--"):
+        token, _, rest = args.partition(" ")
+        name, _, value = token[2:].partition("=")
+        flags[name] = value
+        args = rest.strip()
+    return flags, args
+
+def _parse_assignments(args: str, allow_bare: bool) -> List[Tuple[str, Optional[str]]]:
+    """
+    'A=1 B="two words"' -> [("A", "1"), ("B", "two words")]; legacy 'ENV KEY value'
+    form and bare 'ARG NAME' (value None) are supported.
+    """
+    try:
+        tokens = shlex.split(args)
+    except ValueError:
+        tokens = args.split()
+    if not tokens:
+        return []
+    if "=" not in tokens[0]:
+        if allow_bare:
+            return [(tokens[0], None)]
+        return [(tokens[0], " ".join(tokens[1:]))]
+    pairs = []
+    for token in tokens:
+        name, sep, value = token.partition("=")
+        pairs.append((name, value if sep else None))
+    return pairs
+
+def _expand(text: str, variables: Dict[str, Optional[str]]) -> str:
+    def replace(match):
+        name = match.group("braced") or match.group("plain")
+        value = variables.get(name)
+        op = match.group("op")
+        if op == "-":
+            return value if value else match.group("word")
+        if op == "+":
+            return match.group("word") if value else ""
+        return value if value is not None else match.group(0)
+    return VARIABLE_PATTERN.sub(replace, text)
+
+def _glob_to_regex(pattern: str) -> "re.Pattern":
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(.*/)?"  # zero or more directories
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if ch == "*":
+            regex += "[^/]*"
+        elif ch == "?":
+            regex += "[^/]"
+        elif ch == "[":
+            end = pattern.find("]", i)
+            if end == -1:
+                regex += re.escape(ch)
+            else:
+                regex += pattern[i:end + 1].replace("[!", "[^")
+                i = end
+        else:
+            regex += re.escape(ch)
+        i += 1
+    return re.compile(f"^{regex}(/.*)?$")
+
+def _copy_sources(instruction: Dict[str, Any]) -> List[str]:
+    args = instruction["expanded"]
+    if args.startswith("["):
+        try:
+            items = json.loads(args)
+        except json.JSONDecodeError:
+            items = args.strip("[]").split(",")
+    else:
+        items = args.split("\n", 1)[0].split()
+    return [item.strip() for item in items[:-1]]
+
+def _source_regex(source: str) -> Optional["re.Pattern"]:
+    """
+    Regex for the context files a COPY/ADD source covers; None means the whole context.
+    """
+    if source.startswith("./"):
+        source = source[2:]
+    source = source.strip("/")
+    if source in ("", ".", "*"):
+        return None
+    return _glob_to_regex(source)
+
+def _is_context_copy(instruction: Dict[str, Any]) -> bool:
+    return (
+        instruction["instruction"] in ("COPY", "ADD")
+        and "from" not in instruction["flags"]
+    )
+
+def _is_whole_context(sources: List[str]) -> bool:
+    return any(src.rstrip("/") in ("", ".", "*", "./*") for src in sources)
+
+def _classify_run(command: str) -> str:
+    if DEPENDENCY_INSTALL_PATTERN.search(command):
+        return "dependency_install"
+    if SYSTEM_INSTALL_PATTERN.search(command):
+        return "system_install"
+    if BUILD_STEP_PATTERN.search(command):
+        return "build_step"
+    return "run"
+
+def _base_image_findings(
+    stage: Dict[str, Any],
+    model: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    base = stage["base"]
+    if stage["from_stage"] is not None or base.lower() == "scratch":
+        return []
+    if "$" in base:
+        return [{
+            "type": "unresolved_base_image", "line": stage["line"],
+            "message": f"Base image '{base}' depends on a build arg without a default."
+        }]
+    if "@sha256:" in base:
+        return []
+    name_part = base.rsplit("/", 1)[-1]
+    tag = name_part.split(":", 1)[1] if ":" in name_part else None
+    if tag is None or tag == "latest":
+        return [{
+            "type": "unpinned_base_image", "line": stage["line"],
+            "message": (
+                f"Base image '{base}' is not pinned to a version tag or digest; "
+                f"upstream updates silently invalidate every layer."
+            )
+        }]
+    return []
+
+def _stage_findings(stage: Dict[str, Any]) -> List[Dict[str, Any]]:
+    findings = []
+    env_no_cache = False
+    whole_context_copy = None
+    consecutive_runs: List[int] = []
+
+    def flush_runs():
+        if len(consecutive_runs) >= CONSECUTIVE_RUN_LIMIT:
+            findings.append({
+                "type": "consecutive_run_layers", "line": consecutive_runs[0],
+                "message": (
+                    f"{len(consecutive_runs)} consecutive RUN instructions create "
+                    f"{len(consecutive_runs)} layers; chain them with '&&'."
+                )
+            })
+        consecutive_runs.clear()
+
+    for ins in stage["instructions"]:
+        keyword = ins["instruction"]
+        if keyword != "RUN":
+            flush_runs()
+        if keyword == "ENV" and re.search(r"\bPIP_NO_CACHE_DIR\b", ins["args"]):
+            env_no_cache = True
+        if _is_context_copy(ins) and whole_context_copy is None \
+                and _is_whole_context(_copy_sources(ins)):
+            whole_context_copy = ins
+        if keyword != "RUN":
+            continue
+
+        consecutive_runs.append(ins["line"])
+        command = ins["args"]
+        cache_mount = "type=cache" in ins["flags"].get("mount", "")
+        if DEPENDENCY_INSTALL_PATTERN.search(command) \
+                and whole_context_copy is not None:
+            copy = whole_context_copy
+            findings.append({
+                "type": "cache_busting_order", "line": copy["line"],
+                "message": (
+                    f"'{copy['instruction']} {copy['args']}' (line {copy['line']}) "
+                    f"comes before the dependency install on line {ins['line']}: any "
+                    f"source change reinstalls all dependencies. Copy the dependency "
+                    f"manifests first, install, then copy the rest."
+                )
+            })
+            whole_context_copy = None  # report once per copy
+        if PIP_INSTALL_PATTERN.search(command) and "--no-cache-dir" not in command \
+                and not env_no_cache and not cache_mount:
+            findings.append({
+                "type": "pip_cache_in_layer", "line": ins["line"],
+                "message": (
+                    "pip install without --no-cache-dir keeps the download cache in "
+                    "the layer."
+                )
+            })
+        if re.search(r"\bapt(-get)?\s+install\b", command):
+            if "rm -rf /var/lib/apt/lists" not in command and not cache_mount:
+                findings.append({
+                    "type": "apt_lists_in_layer", "line": ins["line"],
+                    "message": (
+                        "apt-get install without 'rm -rf /var/lib/apt/lists/*' in the "
+                        "same RUN keeps the package index in the layer."
+                    )
+                })
+            if "--no-install-recommends" not in command:
+                findings.append({
+                    "type": "apt_recommends", "line": ins["line"],
+                    "message": (
+                        "apt-get install without --no-install-recommends pulls in "
+                        "optional packages."
+                    )
+                })
+        if re.search(r"\bapk\s+add\b", command) and "--no-cache" not in command \
+                and not cache_mount:
+            findings.append({
+                "type": "apk_cache_in_layer", "line": ins["line"],
+                "message": (
+                    "apk add without --no-cache keeps the package index in the layer."
+                )
+            })
+    flush_runs()
+    return findings
+
+def _multi_stage_findings(model: Dict[str, Any]) -> List[Dict[str, Any]]:
+    stages = model["stages"]
+    if len(stages) != 1:
+        return []
+    stage = stages[0]
+    build_lines = [
+        ins["line"] for ins in stage["instructions"]
+        if ins["instruction"] == "RUN" and BUILD_STEP_PATTERN.search(ins["args"])
+    ]
+    if build_lines:
+        return [{
+            "type": "single_stage_build", "line": build_lines[0],
+            "message": (
+                "Build tools run in the only stage, so the final image ships the "
+                "toolchain; build in a separate stage and COPY --from it into a slim "
+                "runtime image."
+            )
+        }]
+    if not any(marker in stage["base"].lower() for marker in SLIM_BASE_MARKERS):
+        return [{
+            "type": "full_base_image", "line": stage["line"],
+            "message": (
+                f"Runtime image '{stage['base']}' is a full distribution; a "
+                f"slim/alpine variant or a multi-stage build would shrink it."
+            )
+        }]
+    return []
+
+def _context_files(
+    fs: ProjectFS,
+    context_dir: str,
+    dockerfile_path: str
+) -> List[Dict[str, Any]]:
+    """
+    Inventory entries under context_dir as {"relative", "size", "ignored"}.
+    """
+    rules: List[Tuple[bool, "re.Pattern"]] = []
+    candidates = (
+        f"{dockerfile_path}.dockerignore", fs.join(context_dir, ".dockerignore")
+    )
+    for candidate in candidates:
+        if fs.isfile(candidate):
+            with fs.open(candidate, "r") as f:
+                rules = parse_dockerignore(f.read())
+            break
+
+    prefix = context_dir.rstrip(fs.sep) + fs.sep
+    files = []
+    for entry in fs.inventory():
+        path = entry["path"]
+        if not path.startswith(prefix) or not isinstance(entry.get("size"), int):
+            continue
+        relative = path[len(prefix):].replace(fs.sep, "/")
+        files.append({
+            "relative": relative,
+            "size": entry["size"],
+            "ignored": is_ignored(relative, rules)
+        })
+    return files
+
+def _context_summary(files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    included = [f for f in files if not f["ignored"]]
+    by_top: Dict[str, int] = {}
+    for f in included:
+        top = f["relative"].split("/", 1)[0]
+        by_top[top] = by_top.get(top, 0) + f["size"]
+
+    findings = []
+    for top, size in sorted(by_top.items(), key=lambda item: -item[1]):
+        if top in HEAVY_CONTEXT_ENTRIES or size >= LARGE_CONTEXT_ENTRY_BYTES:
+            findings.append({
+                "type": "large_build_context", "line": None,
+                "message": (
+                    f"'{top}' ({size / (1024 * 1024):.1f} MB) is sent with the build "
+                    f"context; add it to .dockerignore if the image doesn't need it."
+                )
+            })
+    return {
+        "files": len(included),
+        "bytes": sum(f["size"] for f in included),
+        "ignored_files": len(files) - len(included),
+        "ignored_bytes": sum(f["size"] for f in files if f["ignored"]),
+        "largest_entries": [
+            {"path": top, "bytes": size}
+            for top, size in sorted(by_top.items(), key=lambda item: -item[1])[:5]
+        ],
+        "findings": findings
+    }
+
+def _rebuild_costs(
+    model: Dict[str, Any],
+    context_files: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    For every COPY/ADD from the build context: the files it covers and what a change to
+    one of them costs, i.e. every later instruction of its stage plus the stages that
+    build on it.
+    """
+    stages = model["stages"]
+    included = [f for f in context_files if not f["ignored"]]
+
+    def instruction_cost(ins: Dict[str, Any], copied_bytes: int = 0) -> float:
+        if ins["instruction"] == "RUN":
+            return INSTRUCTION_COST_SECONDS[_classify_run(ins["args"])]
+        if ins["instruction"] in ("COPY", "ADD"):
+            copy_seconds = copied_bytes / COPY_BYTES_PER_SECOND
+            return INSTRUCTION_COST_SECONDS["copy"] + copy_seconds
+        return 0.0
+
+    # Bytes copied by each context COPY/ADD, keyed by line
+    copy_bytes: Dict[int, int] = {}
+    copies = []
+    for stage in stages:
+        for position, ins in enumerate(stage["instructions"]):
+            if not _is_context_copy(ins):
+                continue
+            regexes = [_source_regex(src) for src in _copy_sources(ins)]
+            matched = [
+                f for f in included
+                if any(r is None or r.match(f["relative"]) for r in regexes)
+            ]
+            copy_bytes[ins["line"]] = sum(f["size"] for f in matched)
+            copies.append((stage, position, ins, matched))
+
+    def invalidated(stage_index: int, position: int, seen: set) -> List[Dict[str, Any]]:
+        """
+        Instructions re-run when instruction 'position' of stage 'stage_index' changes.
+        """
+        stage = stages[stage_index]
+        rerun = stage["instructions"][position:]
+        names = {stage["name"].lower()} if stage["name"] else set()
+        reference = {str(stage_index)} | names
+        for later in stages[stage_index + 1:]:
+            if later["index"] in seen:
+                continue
+            if later["from_stage"] == stage_index:
+                seen.add(later["index"])
+                rerun = rerun + invalidated(later["index"], 0, seen)
+                continue
+            for pos, ins in enumerate(later["instructions"]):
+                if ins["flags"].get("from", "").lower() in reference:
+                    seen.add(later["index"])
+                    rerun = rerun + invalidated(later["index"], pos, seen)
+                    break
+        return rerun
+
+    costs = []
+    for stage, position, ins, matched in copies:
+        rerun = invalidated(stage["index"], position, set())
+        seconds = sum(instruction_cost(r, copy_bytes.get(r["line"], 0)) for r in rerun)
+        costs.append({
+            "line": ins["line"],
+            "instruction": f"{ins['instruction']} {ins['args']}",
+            "files": len(matched),
+            "bytes": sum(f["size"] for f in matched),
+            "instructions_rerun": len(rerun),
+            "estimated_rebuild_seconds": round(seconds, 1)
+        })
+    return costs
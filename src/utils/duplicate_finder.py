@@ -2,30 +2,345 @@
 
 import os
 import hashlib
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
-def analyze_duplicates(project_path: str) -> Dict[str, Any]:
+from src.utils.ast_cache import AstCache
+from src.utils.clone_index import CloneIndex
+from src.utils.hash_cache import HashCache, FileKey, default_cache_path
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+try:
+    import xxhash  # Optional: much faster than the hashlib algorithms
+except ImportError:
+    xxhash = None
+
+# Bytes hashed from the head and from the tail of each same-size candidate in stage 2.
+PARTIAL_HASH_BYTES = 4096
+# Fixed read buffer for full-file hashing; memory use doesn't grow with file size.
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_ALGORITHMS = ("auto", "xxhash", "blake2b", "md5", "sha256")
+
+def analyze_duplicates(
+    project_path: str,
+    file_details: Optional[List[Dict[str, Any]]] = None,
+    algorithm: str = "auto",
+    max_workers: Optional[int] = None,
+    hash_cache: Optional[HashCache] = None,
+    fs: Optional[ProjectFS] = None
+) -> Dict[str, Any]:
     """
-    Detects duplicate files by comparing checksums of all files.
-    Returns a list of sets, where each set contains paths of duplicate files.
+    Detects duplicate files with a staged pipeline:
+      1. Group files by size (from the shared inventory); unique sizes can't be duplicates.
+      2. For same-size candidates, hash only the first/last PARTIAL_HASH_BYTES.
+      3. Full-hash only the files whose partial hashes still collide.
+
+    Hashing streams each file through a fixed buffer and runs on a thread pool
+    (hashlib and xxhash release the GIL). Paths that point to the same inode
+    (hardlinks) are hashed once. With a hash_cache, files whose (device, inode, size,
+    mtime_ns) is unchanged since an earlier run reuse the stored hashes and aren't read.
+    Inventory entries that already carry a "content_hash" (git blob SHAs, see
+    GitRevisionFS) are grouped by it directly and never read.
+
+    :param project_path: Path to the project directory.
+    :param file_details: Optional inventory as returned by analyze_file_structure()["file_details"].
+        If omitted, the tree is scanned here.
+    :param algorithm: One of HASH_ALGORITHMS. 'auto' picks xxhash if installed, else blake2b.
+    :param max_workers: Thread pool size for hashing (None = ThreadPoolExecutor default).
+    :param hash_cache: Optional persistent HashCache shared across runs and projects.
+    :param fs: Optional ProjectFS to read files through (e.g. an archive).
+    Returns {"duplicates": list of lists of duplicate paths, "hardlinks": list of lists of
+    paths sharing an inode, "stats": bytes read per stage}.
     """
-    file_map = {}  # hash -> list of paths
+    algorithm = _resolve_algorithm(algorithm)
+    fs = fs or LocalFS(project_path)
+    if file_details is None:
+        file_details = fs.inventory()
+    if not fs.thread_safe_reads:
+        max_workers = 1
+
+    stats = {
+        "algorithm": algorithm,
+        "files_considered": 0,
+        "bytes_total": 0,
+        "partial_hash_candidates": 0,
+        "full_hash_candidates": 0,
+        "hardlinks_skipped": 0,
+        "content_hash_files": 0,
+        "cache_hits": 0,
+        "bytes_read": 0
+    }
+
+    # Stage 1: size buckets
+    size_map: Dict[int, List[Dict[str, Any]]] = {}
+    for entry in file_details:
+        size = entry.get("size")
+        if not isinstance(size, int):
+            continue
+        stats["files_considered"] += 1
+        stats["bytes_total"] += size
+        size_map.setdefault(size, []).append(entry)
+
     duplicates = []
+    hardlinks = []
+    # Each candidate is one inode: (size, representative path, all paths linking to it, cache key)
+    candidates: List[Tuple[int, str, List[str], Optional[FileKey]]] = []
+    for size, entries in size_map.items():
+        if len(entries) < 2:
+            continue
+        if size == 0:
+            # All empty files are identical; nothing to read.
+            duplicates.append([e["path"] for e in entries])
+            continue
+        if any(e.get("content_hash") for e in entries):
+            by_content: Dict[str, List[str]] = {}
+            for e in entries:
+                if e.get("content_hash"):
+                    by_content.setdefault(e["content_hash"], []).append(e["path"])
+            duplicates.extend(paths for paths in by_content.values() if len(paths) > 1)
+            stats["content_hash_files"] += sum(len(paths) for paths in by_content.values())
+            entries = [e for e in entries if not e.get("content_hash")]
+            if len(entries) < 2:
+                continue
+        inode_groups = list(_group_by_inode(entries).values())
+        for paths, _ in inode_groups:
+            if len(paths) > 1:
+                hardlinks.append(paths)
+                stats["hardlinks_skipped"] += len(paths) - 1
+        if len(inode_groups) == 1:
+            # Only hardlinks of one inode share this size: identical without reading.
+            if len(inode_groups[0][0]) > 1:
+                duplicates.append(inode_groups[0][0])
+            continue
+        candidates.extend((size, paths[0], paths, key) for paths, key in inode_groups)
+
+    if fs is not None:
+        # Archive order: compressed archives are then decompressed once per stage
+        candidates.sort(key=lambda c: fs.read_order(c[1]))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Stage 2: head/tail hash. Small files are covered completely by the partial read.
+        stats["partial_hash_candidates"] = len(candidates)
+        partial_digests = _hash_candidates(
+            pool, candidates, algorithm, "partial", hash_cache, stats,
+            lambda c: _partial_hash(fs, c[1], c[0], algorithm)
+        )
+        partial_map: Dict[Tuple[int, str], List[Tuple[int, str, List[str], Optional[FileKey]]]] = {}
+        for candidate, digest in zip(candidates, partial_digests):
+            if digest is not None:
+                partial_map.setdefault((candidate[0], digest), []).append(candidate)
+
+        survivors = []
+        for (size, _), group in partial_map.items():
+            if len(group) < 2 and len(group[0][2]) < 2:
+                continue
+            if size <= 2 * PARTIAL_HASH_BYTES or len(group) < 2:
+                # Either the partial hash read the whole file, or the group is a single
+                # inode whose links are identical by definition.
+                duplicates.append([p for c in group for p in c[2]])
+                continue
+            survivors.extend(group)
+
+        # Stage 3: full hash of the survivors
+        if fs is not None:
+            survivors.sort(key=lambda c: fs.read_order(c[1]))
+        stats["full_hash_candidates"] = len(survivors)
+        full_digests = _hash_candidates(
+            pool, survivors, algorithm, "full", hash_cache, stats,
+            lambda c: _full_hash(fs, c[1], algorithm)
+        )
+        full_map: Dict[Tuple[int, str], List[str]] = {}
+        for candidate, digest in zip(survivors, full_digests):
+            if digest is not None:
+                full_map.setdefault((candidate[0], digest), []).extend(candidate[2])
+        duplicates.extend(group for group in full_map.values() if len(group) > 1)
+
+    if hash_cache is not None:
+        hash_cache.flush()
+
+    return {"duplicates": duplicates, "hardlinks": hardlinks, "stats": stats}
+
+def analyze_code_clones(
+    project_path: str,
+    file_details: Optional[List[Dict[str, Any]]] = None,
+    index_path: Optional[str] = None,
+    ast_cache: Optional[AstCache] = None,
+    min_nodes: int = 25,
+    fs: Optional[ProjectFS] = None
+) -> Dict[str, Any]:
+    """
+    Finds duplicated functions, methods and classes across the project's .py files,
+    including copies with renamed identifiers or changed literals.
+
+    Definitions are hashed by their normalized AST; hashes are persisted in a per-project
+    CloneIndex so later runs only reparse files whose size or mtime changed.
+
+    :param index_path: Where to persist the index. Defaults to a file in the host cache
+        directory derived from the project path; pass "" to keep it in memory only.
+    :param ast_cache: Optional AstCache shared with other scanners in the same run.
+    :param min_nodes: Minimum normalized AST size for a definition to be indexed.
+    :param fs: Optional ProjectFS to read files through; ignored if ast_cache is given.
+    Returns {"clone_groups": [{"hash", "kind", "locations": [...]}, ...], "stats": {...}}.
+    """
+    if ast_cache is None:
+        ast_cache = AstCache(fs or LocalFS(project_path))
+    if file_details is None:
+        file_details = ast_cache.fs.inventory()
+    if index_path is None:
+        project_id = hashlib.blake2b(os.path.abspath(project_path).encode("utf-8"), digest_size=8).hexdigest()
+        index_path = default_cache_path(f"clone_index_{project_id}.json")
 
-    for root, dirs, files in os.walk(project_path):
-        for filename in files:
-            full_path = os.path.join(root, filename)
-            # We'll skip extremely large files or binary if needed, but here's a naive approach:
+    index = CloneIndex(index_path or None, min_nodes=min_nodes)
+    py_files = [entry["path"] for entry in file_details if entry["path"].endswith(".py")]
+    index.update(py_files, ast_cache)
+    try:
+        index.save()
+    except OSError:
+        pass  # A read-only cache dir only costs the incremental speed-up
+
+    groups = index.clone_groups()
+    return {
+        "clone_groups": groups,
+        "stats": {
+            "files_indexed": len(py_files),
+            "files_rehashed": index.rehashed,
+            "clone_groups": len(groups)
+        }
+    }
+
+def hash_file(path: str, algorithm: str = "auto", chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Streams the file through a reused buffer and returns its hex digest.
+    """
+    digest, _ = _full_hash(None, path, _resolve_algorithm(algorithm), chunk_size)
+    if digest is None:
+        raise OSError(f"Could not read {path}")
+    return digest
+
+def _resolve_algorithm(algorithm: str) -> str:
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+    if algorithm == "auto":
+        return "xxhash" if xxhash is not None else "blake2b"
+    if algorithm == "xxhash" and xxhash is None:
+        raise ValueError("Hash algorithm 'xxhash' requires the xxhash package.")
+    return algorithm
+
+def _new_hasher(algorithm: str):
+    if algorithm == "xxhash":
+        return xxhash.xxh3_128()
+    return hashlib.new(algorithm)
+
+def _hash_candidates(
+    pool: ThreadPoolExecutor,
+    candidates: List[Tuple[int, str, List[str], Optional[FileKey]]],
+    algorithm: str,
+    kind: str,
+    hash_cache: Optional[HashCache],
+    stats: Dict[str, Any],
+    hash_fn: Callable[[Tuple], Tuple[Optional[str], int]]
+) -> List[Optional[str]]:
+    """
+    Returns one digest per candidate, serving unchanged files from hash_cache and
+    hashing the rest on the pool. New digests are written back to the cache.
+    """
+    digests: List[Optional[str]] = [None] * len(candidates)
+    pending = []
+    for i, candidate in enumerate(candidates):
+        key = candidate[3]
+        cached = hash_cache.get(key, algorithm, kind) if hash_cache is not None and key else None
+        if cached is not None:
+            digests[i] = cached
+            stats["cache_hits"] += 1
+        else:
+            pending.append(i)
+
+    new_entries = []
+    for i, (digest, bytes_read) in zip(pending, pool.map(hash_fn, (candidates[i] for i in pending))):
+        stats["bytes_read"] += bytes_read
+        digests[i] = digest
+        key = candidates[i][3]
+        if digest is not None and key:
+            new_entries.append((key, algorithm, kind, digest, candidates[i][1]))
+
+    if hash_cache is not None and new_entries:
+        hash_cache.put_many(new_entries)
+    return digests
+
+def _group_by_inode(entries: List[Dict[str, Any]]) -> Dict[Any, Tuple[List[str], Optional[FileKey]]]:
+    """
+    Groups same-size entries by (device, inode), using inventory fields when present
+    and falling back to os.stat. Each group carries its hash-cache key.
+    """
+    groups: Dict[Any, Tuple[List[str], Optional[FileKey]]] = {}
+    for entry in entries:
+        path = entry["path"]
+        device, inode, mtime_ns = entry.get("device"), entry.get("inode"), entry.get("mtime_ns")
+        if device is None or inode is None or mtime_ns is None:
             try:
-                with open(full_path, "rb") as f:
-                    file_data = f.read()
-                file_hash = hashlib.md5(file_data).hexdigest()
-                file_map.setdefault(file_hash, []).append(full_path)
+                st = os.stat(path)
+                device, inode, mtime_ns = st.st_dev, st.st_ino, st.st_mtime_ns
             except OSError:
-                pass
+                # Not a plain file on disk (e.g. an archive member)
+                inode = None
+        if not inode:
+            # Filesystems without inode numbers: treat every path separately, uncached
+            groups[id(entry)] = ([path], None)
+            continue
+        key = (device, inode, entry["size"], mtime_ns)
+        groups.setdefault((device, inode), ([], key))[0].append(path)
+    return groups
 
-    for file_hash, paths in file_map.items():
-        if len(paths) > 1:
-            duplicates.append(paths)
+def _open_binary(fs: Optional[ProjectFS], path: str):
+    if fs is None or isinstance(fs, LocalFS):
+        return open(path, "rb", buffering=0)
+    return fs.open(path, "rb")
 
-    return {"duplicates": duplicates}
+def _partial_hash(fs: Optional[ProjectFS], path: str, size: int, algorithm: str) -> Tuple[Optional[str], int]:
+    """
+    Hashes the first and last PARTIAL_HASH_BYTES of the file (the whole file if it is smaller).
+    Returns (digest or None on error, bytes read).
+    """
+    hasher = _new_hasher(algorithm)
+    buffer = bytearray(PARTIAL_HASH_BYTES)
+    view = memoryview(buffer)
+    bytes_read = 0
+    try:
+        with _open_binary(fs, path) as f:
+            n = f.readinto(buffer)
+            hasher.update(view[:n])
+            bytes_read += n
+            if size > 2 * PARTIAL_HASH_BYTES:
+                f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            while size > PARTIAL_HASH_BYTES:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+                bytes_read += n
+    except OSError:
+        return None, bytes_read
+    return hasher.hexdigest(), bytes_read
+
+def _full_hash(
+    fs: Optional[ProjectFS], path: str, algorithm: str, chunk_size: int = HASH_CHUNK_SIZE
+) -> Tuple[Optional[str], int]:
+    """
+    Streams the whole file through a fixed-size buffer.
+    Returns (digest or None on error, bytes read).
+    """
+    hasher = _new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    bytes_read = 0
+    try:
+        with _open_binary(fs, path) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hasher.update(view[:n])
+                bytes_read += n
+    except OSError:
+        return None, bytes_read
+    return hasher.hexdigest(), bytes_read
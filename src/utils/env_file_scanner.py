@@ -1,17 +1,19 @@
 # src/utils/env_file_scanner.py
 
-import os
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from src.utils.virtual_fs import LocalFS, ProjectFS
 
 ENV_LINE_PATTERN = re.compile(r"^(?P<key>[A-Za-z_][A-Za-z0-9_]*)\s*=\s*(['\"]?)(?P<value>.*)\2$")
 
-def analyze_env_file(project_path: str) -> Dict[str, Any]:
+def analyze_env_file(project_path: str, fs: Optional[ProjectFS] = None) -> Dict[str, Any]:
     """
     Checks if there's a .env file, tries to parse environment variables,
     including quoted values. Also stores comment lines.
     """
-    env_path = os.path.join(project_path, ".env")
+    fs = fs or LocalFS(project_path)
+    env_path = fs.join(fs.root, ".env")
     result = {
         "env_found": False,
         "env_vars": [],
@@ -19,9 +21,9 @@ def analyze_env_file(project_path: str) -> Dict[str, Any]:
         "potential_secrets": []
     }
 
-    if os.path.isfile(env_path):
+    if fs.isfile(env_path):
         result["env_found"] = True
-        with open(env_path, "r", encoding="utf-8", errors="ignore") as f:
+        with fs.open(env_path, "r") as f:
             lines = f.readlines()
             for line in lines:
                 raw_line = line.strip()
@@ -1,36 +1,45 @@
 # src/utils/file_structure_scanner.py
 
-import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-def analyze_file_structure(project_path: str) -> Dict[str, Any]:
+from src.utils.tree_walker import rollup_directories
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+def analyze_file_structure(
+    project_path: str,
+    skip_dirs: Optional[List[str]] = None,
+    parallel: Optional[bool] = None,
+    deepest_paths_limit: int = 10,
+    fs: Optional[ProjectFS] = None
+) -> Dict[str, Any]:
     """
     Recursively traverses the project, capturing file paths, sizes.
     Returns a dict with aggregated stats and file details.
+
+    The walk uses os.scandir and one stat per file (see tree_walker.walk_tree), and the
+    same pass produces a du-style per-directory rollup.
+
+    :param skip_dirs: Directory names to skip (e.g. ['.git', 'node_modules']).
+    :param parallel: Scan directories on a thread pool. None = only on network filesystems.
+    :param deepest_paths_limit: How many of the deepest file paths to report.
+    :param fs: Optional ProjectFS (e.g. an archive) to inventory instead of project_path;
+        its skip_dirs/parallel settings apply.
     """
-    total_files = 0
-    total_size = 0
-    file_details = []
-
-    for root, dirs, files in os.walk(project_path):
-        for file_name in files:
-            total_files += 1
-            full_path = os.path.join(root, file_name)
-            try:
-                size = os.path.getsize(full_path)
-                total_size += size
-                file_details.append({
-                    "path": full_path,
-                    "size": size
-                })
-            except OSError:
-                file_details.append({
-                    "path": full_path,
-                    "size": "Unknown (OS Error)"
-                })
+    fs = fs or LocalFS(project_path, skip_dirs=skip_dirs, parallel=parallel)
+    file_details, directories = fs.scan()
+
+    total_size = sum(entry["size"] for entry in file_details if isinstance(entry["size"], int))
+    rollup = rollup_directories(directories)
+
+    deepest = sorted(
+        ((info["depth"] + 1, info["first_file"]) for info in directories.values() if info["first_file"]),
+        key=lambda item: (-item[0], item[1])
+    )[:deepest_paths_limit]
 
     return {
-        "total_files": total_files,
+        "total_files": len(file_details),
         "total_size_bytes": total_size,
-        "file_details": file_details
+        "file_details": file_details,
+        "directory_rollup": rollup,
+        "deepest_paths": [{"path": path, "depth": depth} for depth, path in deepest]
     }
@@ -0,0 +1,163 @@
+# src/utils/hash_cache.py
+
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+# (device, inode, size, mtime_ns): changes whenever the file content may have changed.
+FileKey = Tuple[int, int, int, int]
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "code-analyzer")
+DEFAULT_MAX_ENTRIES = 2_000_000
+
+def default_cache_path(filename: str = "hash_cache.sqlite3") -> str:
+    """
+    Returns the host-wide cache location, overridable with CODE_ANALYZER_CACHE_DIR.
+    """
+    cache_dir = os.getenv("CODE_ANALYZER_CACHE_DIR", DEFAULT_CACHE_DIR)
+    return os.path.join(cache_dir, filename)
+
+def file_key(st: os.stat_result) -> Optional[FileKey]:
+    """
+    Builds a cache key from a stat result. Returns None when the filesystem has no inode numbers.
+    """
+    if not st.st_ino:
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+class HashCache:
+    """
+    Persistent file-hash cache stored in SQLite, keyed by (device, inode, size, mtime_ns),
+    the hash algorithm and the hash kind ('partial' or 'full').
+
+    Because the key doesn't include the path, it is shared by every project on the host
+    and survives renames. Entries are evicted least-recently-used once the table grows
+    past max_entries; compact() drops entries whose file changed or disappeared.
+
+    Not thread-safe: look up before handing work to a pool and store results afterwards.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                path TEXT,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (device, inode, size, mtime_ns, algorithm, kind)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_hashes_last_used ON file_hashes (last_used)"
+        )
+        self._conn.commit()
+        self._touched: Dict[Tuple, float] = {}
+
+    def get(self, key: FileKey, algorithm: str, kind: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT digest FROM file_hashes WHERE device=? AND inode=? AND size=? AND mtime_ns=?"
+            " AND algorithm=? AND kind=?",
+            (*key, algorithm, kind)
+        ).fetchone()
+        if row is None:
+            return None
+        self._touched[(*key, algorithm, kind)] = time.time()
+        return row[0]
+
+    def put_many(self, items: Iterable[Tuple[FileKey, str, str, str, str]]) -> None:
+        """
+        Stores (key, algorithm, kind, digest, path) tuples in one transaction.
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes"
+                " (device, inode, size, mtime_ns, algorithm, kind, digest, path, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((*key, algorithm, kind, digest, path, now)
+                 for key, algorithm, kind, digest, path in items)
+            )
+        self._evict()
+
+    def flush(self) -> None:
+        """
+        Writes buffered last-used timestamps for cache hits.
+        """
+        if not self._touched:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE file_hashes SET last_used=? WHERE device=? AND inode=? AND size=?"
+                " AND mtime_ns=? AND algorithm=? AND kind=?",
+                ((ts, *key) for key, ts in self._touched.items())
+            )
+        self._touched.clear()
+
+    def compact(self) -> int:
+        """
+        Removes entries whose recorded path no longer exists or no longer matches the key,
+        then reclaims space. Returns the number of removed entries.
+        """
+        self.flush()
+        stale = []
+        rows = self._conn.execute(
+            "SELECT DISTINCT device, inode, size, mtime_ns, path FROM file_hashes"
+        ).fetchall()
+        for device, inode, size, mtime_ns, path in rows:
+            try:
+                current = file_key(os.stat(path)) if path else None
+            except OSError:
+                current = None
+            if current != (device, inode, size, mtime_ns):
+                stale.append((device, inode, size, mtime_ns))
+        with self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM file_hashes WHERE device=? AND inode=? AND size=? AND mtime_ns=?",
+                stale
+            )
+        removed = cursor.rowcount if stale else 0
+        self._conn.execute("VACUUM")
+        return removed
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _evict(self) -> None:
+        """
+        Drops the least recently used entries down to 90% of max_entries.
+        """
+        count = len(self)
+        if count <= self.max_entries:
+            return
+        self.flush()
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM file_hashes WHERE rowid IN (SELECT rowid FROM file_hashes"
+                " ORDER BY last_used LIMIT ?)",
+                (count - int(self.max_entries * 0.9),)
+            )
@@ -0,0 +1,182 @@
+# src/utils/import_graph.py
+
+import ast
+import os
+import pkgutil
+import sys
+import sysconfig
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+from src.utils.ast_cache import AstCache
+from src.utils.virtual_fs import ProjectFS
+
+def _stdlib_module_names() -> frozenset:
+    """
+    sys.stdlib_module_names on Python 3.10+. Older interpreters only list the modules
+    compiled in (sys.builtin_module_names), so the top-level modules found in the
+    interpreter's stdlib and lib-dynload directories are added.
+    """
+    if hasattr(sys, "stdlib_module_names"):
+        return frozenset(sys.stdlib_module_names)
+    paths = sysconfig.get_paths()
+    directories = [paths["stdlib"], os.path.join(paths["platstdlib"], "lib-dynload")]
+    found = {module.name for module in pkgutil.iter_modules(directories)}
+    return frozenset(found | set(sys.builtin_module_names))
+
+STDLIB_MODULES = _stdlib_module_names()
+
+class ImportGraph:
+    """
+    Every import statement in the project's .py files, built once per run from the
+    AstCache and shared by the scanners.
+
+    Module and file names are interned to integer ids and each import is one
+    (file id, module id, line) row in three parallel arrays, so the graph stays small
+    on large trees. Relative imports are resolved to absolute module names.
+    Files that couldn't be parsed are listed in unparsed_files so callers can fall
+    back to text matching for them.
+    """
+
+    def __init__(self, root: str, sep: str = "/"):
+        self.root = root
+        self.sep = sep
+        self.files: List[str] = []
+        self.modules: List[str] = []
+        self.unparsed_files: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._module_ids: Dict[str, int] = {}
+        self._edge_file = array("I")
+        self._edge_module = array("I")
+        self._edge_line = array("I")
+        # Top-level names of the project's own packages and modules
+        self.local_names: Set[str] = set()
+
+    @classmethod
+    def build(cls, fs: ProjectFS, ast_cache: Optional[AstCache] = None) -> "ImportGraph":
+        """
+        Parses (through the cache) every .py file in the fs inventory and records its imports.
+        """
+        if ast_cache is None:
+            ast_cache = AstCache(fs)
+        graph = cls(fs.root, fs.sep)
+        for entry in fs.inventory():
+            path = entry["path"]
+            if not path.endswith(".py"):
+                continue
+            parts = graph._module_parts(path)
+            # Any package or module name in the tree may be imported as a top-level name
+            # (src layouts, sys.path tweaks, sub-projects with their own roots)
+            graph.local_names.update(parts)
+            tree = ast_cache.get(path)
+            if tree is None:
+                graph.unparsed_files.append(path)
+                continue
+            graph.add_file(path, tree, parts)
+        return graph
+
+    def add_file(self, path: str, tree: ast.AST, module_parts: Optional[List[str]] = None) -> None:
+        if module_parts is None:
+            module_parts = self._module_parts(path)
+        # The package a relative import is resolved against (same for pkg/__init__.py)
+        package = module_parts[:-1]
+        file_id = self._intern(self._file_ids, self.files, path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self._add_edge(file_id, alias.name, node.lineno)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = package[:len(package) - (node.level - 1)] if node.level > 1 else package
+                    if node.module:
+                        self._add_edge(file_id, ".".join(base + [node.module]), node.lineno)
+                    else:
+                        # 'from . import models': the names are (usually) sibling modules
+                        for alias in node.names:
+                            self._add_edge(file_id, ".".join(base + [alias.name]), node.lineno)
+                elif node.module:
+                    self._add_edge(file_id, node.module, node.lineno)
+
+    def __len__(self) -> int:
+        return len(self._edge_file)
+
+    def imports_of(self, path: str) -> List[Tuple[str, int]]:
+        """
+        (module, line) for every import in one file.
+        """
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            return []
+        return [
+            (self.modules[m], line)
+            for f, m, line in zip(self._edge_file, self._edge_module, self._edge_line) if f == file_id
+        ]
+
+    def importers_of(self, module: str, under: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        (file, line) for every import of module or any of its submodules,
+        optionally limited to files below the directory 'under'.
+        """
+        prefix = module + "."
+        wanted = {i for i, name in enumerate(self.modules) if name == module or name.startswith(prefix)}
+        if not wanted:
+            return []
+        return list(self._iter_edges(wanted, under))
+
+    def top_level_imports(self, under: Optional[str] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Maps each imported top-level name (e.g. 'sklearn' for 'sklearn.linear_model')
+        to the (file, line) locations importing it.
+        """
+        result: Dict[str, List[Tuple[str, int]]] = {}
+        top_ids = [name.split(".", 1)[0] for name in self.modules]
+        for f, m, line in zip(self._edge_file, self._edge_module, self._edge_line):
+            path = self.files[f]
+            if under is not None and not self._is_under(path, under):
+                continue
+            result.setdefault(top_ids[m], []).append((path, line))
+        return result
+
+    def third_party_imports(self, under: Optional[str] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        top_level_imports() without the standard library and the project's own modules.
+        """
+        return {
+            name: locations for name, locations in self.top_level_imports(under).items()
+            if name not in STDLIB_MODULES and name not in self.local_names and name != "__future__"
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.files),
+            "modules": len(self.modules),
+            "imports": len(self),
+            "unparsed_files": list(self.unparsed_files)
+        }
+
+    def _iter_edges(self, module_ids: Set[int], under: Optional[str]) -> Iterable[Tuple[str, int]]:
+        for f, m, line in zip(self._edge_file, self._edge_module, self._edge_line):
+            if m in module_ids:
+                path = self.files[f]
+                if under is None or self._is_under(path, under):
+                    yield path, line
+
+    def _is_under(self, path: str, directory: str) -> bool:
+        return path.startswith(directory.rstrip(self.sep) + self.sep)
+
+    def _add_edge(self, file_id: int, module: str, line: int) -> None:
+        self._edge_file.append(file_id)
+        self._edge_module.append(self._intern(self._module_ids, self.modules, module))
+        self._edge_line.append(line)
+
+    def _module_parts(self, path: str) -> List[str]:
+        relative = path[len(self.root):].lstrip(self.sep)
+        return relative[:-3].split(self.sep)
+
+    @staticmethod
+    def _intern(ids: Dict[str, int], names: List[str], name: str) -> int:
+        idx = ids.get(name)
+        if idx is None:
+            idx = ids[name] = len(names)
+            names.append(name)
+        return idx
@@ -1,38 +1,58 @@
 # src/utils/logging_scanner.py
 
-import os
+import ast
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-def analyze_logging_and_monitoring(project_path: str) -> Dict[str, Any]:
+from src.utils.ast_cache import AstCache
+from src.utils.import_graph import ImportGraph
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+LOGGING_CALLS = ("basicConfig", "getLogger")
+MONITORING_MODULES = ("sentry_sdk", "datadog", "ddtrace")
+
+# Text patterns, only used for files that don't parse
+LOGGING_PATTERN = re.compile(r"\blogging\.(basicConfig|getLogger)\b")
+SENTRY_PATTERN = re.compile(r"\bimport\s+sentry_sdk\b|\bsentry_sdk.init\b")
+DATADOG_PATTERN = re.compile(r"\bimport\s+datadog\b|\bimport\s+ddtrace\b")
+
+def analyze_logging_and_monitoring(
+    project_path: str,
+    fs: Optional[ProjectFS] = None,
+    import_graph: Optional[ImportGraph] = None,
+    ast_cache: Optional[AstCache] = None
+) -> Dict[str, Any]:
     """
     Scans for usage of Python's logging module or references to third-party monitoring tools.
     Checks if 'logging.basicConfig' or 'logging.getLogger' is used, or if Sentry/Datadog calls appear.
+
+    Monitoring imports come from the shared ImportGraph and logging calls from the parsed
+    trees in the AstCache; both are built here if not passed in.
     """
+    fs = fs or LocalFS(project_path)
+    if ast_cache is None:
+        ast_cache = AstCache(fs)
+    if import_graph is None:
+        import_graph = ImportGraph.build(fs, ast_cache)
     logging_usage = []
     monitoring_usage = []
-    
-    # Simple patterns
-    logging_pattern = re.compile(r"\blogging\.(basicConfig|getLogger)\b")
-    sentry_pattern = re.compile(r"\bimport\s+sentry_sdk\b|\bsentry_sdk.init\b")
-    datadog_pattern = re.compile(r"\bimport\s+datadog\b|\bimport\s+ddtrace\b")
-
-    for root, dirs, files in os.walk(project_path):
-        for filename in files:
-            if filename.endswith(".py"):
-                full_path = os.path.join(root, filename)
-                try:
-                    with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                        lines = f.readlines()
-                    for i, line in enumerate(lines, start=1):
-                        if logging_pattern.search(line):
-                            logging_usage.append(f"{full_path}:{i} => {line.strip()}")
-                        if sentry_pattern.search(line):
-                            monitoring_usage.append(f"{full_path}:{i} => {line.strip()}")
-                        if datadog_pattern.search(line):
-                            monitoring_usage.append(f"{full_path}:{i} => {line.strip()}")
-                except OSError:
-                    pass
+
+    for module in MONITORING_MODULES:
+        for path, line in import_graph.importers_of(module, under=fs.root):
+            monitoring_usage.append(f"{path}:{line} => import {module}")
+
+    for full_path in fs.iter_files(suffix=(".py",)):
+        tree = ast_cache.get(full_path)
+        if tree is None:
+            _scan_text(fs, full_path, logging_usage, monitoring_usage)
+            continue
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name)):
+                continue
+            if node.value.id == "logging" and node.attr in LOGGING_CALLS:
+                logging_usage.append(f"{full_path}:{node.lineno} => logging.{node.attr}")
+            elif node.value.id == "sentry_sdk" and node.attr == "init":
+                monitoring_usage.append(f"{full_path}:{node.lineno} => sentry_sdk.init")
 
     # Summary
     return {
@@ -41,3 +61,15 @@ def analyze_logging_and_monitoring(project_path: str) -> Dict[str, Any]:
         "monitoring_found": len(monitoring_usage) > 0,
         "monitoring_references": monitoring_usage
     }
+
+def _scan_text(fs: ProjectFS, full_path: str, logging_usage: list, monitoring_usage: list) -> None:
+    try:
+        with fs.open(full_path, "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return
+    for i, line in enumerate(lines, start=1):
+        if LOGGING_PATTERN.search(line):
+            logging_usage.append(f"{full_path}:{i} => {line.strip()}")
+        if SENTRY_PATTERN.search(line) or DATADOG_PATTERN.search(line):
+            monitoring_usage.append(f"{full_path}:{i} => {line.strip()}")
@@ -0,0 +1,393 @@
+# src/utils/manifest_parser.py
+
+import ast
+import configparser
+import re
+from typing import Dict, Any, List, Optional, Set
+
+from src.utils.virtual_fs import ProjectFS
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib  # Optional backport
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml  # Optional: PyYAML
+except ImportError:
+    yaml = None
+
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+except ImportError:  # Optional: fall back to a regex parser
+    Requirement = None
+    InvalidRequirement = ValueError
+
+# Manifest file names looked for at a project root, in reporting order.
+MANIFEST_FILES = (
+    "requirements.txt", "pyproject.toml", "setup.py", "setup.cfg",
+    "Pipfile", "environment.yml", "environment.yaml"
+)
+# requirements*.txt files chained with -r/-c deeper than this are ignored (cycles, mistakes).
+MAX_INCLUDE_DEPTH = 10
+
+REQUIREMENT_PATTERN = re.compile(
+    r"^\s*(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[(?P<extras>[^\]]*)\])?\s*"
+    r"(?P<specifier>(?:@\s*\S+)|(?:[<>=!~][^;]*))?\s*(?:;\s*(?P<marker>.*))?$"
+)
+CONDA_SPEC_PATTERN = re.compile(r"^(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?P<specifier>(?:[<>=!~]=?|=)\S*)?")
+
+def canonical_name(name: str) -> str:
+    """
+    PEP 503 normalized project name: 'Flask_SQLAlchemy' -> 'flask-sqlalchemy'.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def parse_requirement(text: str, source: str, kind: str = "install") -> Optional[Dict[str, Any]]:
+    """
+    Parses one PEP 508 requirement string into
+    {"name", "raw", "extras", "specifier", "url", "marker", "source", "kind"}.
+    Returns None if the string isn't a requirement.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    if Requirement is not None:
+        try:
+            req = Requirement(text)
+        except InvalidRequirement:
+            return None
+        return {
+            "name": canonical_name(req.name),
+            "raw": text,
+            "extras": sorted(req.extras),
+            "specifier": str(req.specifier),
+            "url": req.url,
+            "marker": str(req.marker) if req.marker else None,
+            "source": source,
+            "kind": kind
+        }
+
+    match = REQUIREMENT_PATTERN.match(text)
+    if not match:
+        return None
+    specifier = (match.group("specifier") or "").strip()
+    url = specifier[1:].strip() if specifier.startswith("@") else None
+    return {
+        "name": canonical_name(match.group("name")),
+        "raw": text,
+        "extras": sorted(e.strip() for e in (match.group("extras") or "").split(",") if e.strip()),
+        "specifier": "" if url else specifier.replace(" ", ""),
+        "url": url,
+        "marker": (match.group("marker") or "").strip() or None,
+        "source": source,
+        "kind": kind
+    }
+
+def parse_manifests(fs: ProjectFS, root: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Parses every known manifest in root (default: fs.root).
+    Returns {file name: {"type", "requirements": [...], "includes": [...], "errors": [...]}}
+    for the manifests that exist.
+    """
+    root = root or fs.root
+    parsers = {
+        "requirements.txt": parse_requirements_file,
+        "pyproject.toml": parse_pyproject,
+        "setup.py": parse_setup_py,
+        "setup.cfg": parse_setup_cfg,
+        "Pipfile": parse_pipfile,
+        "environment.yml": parse_environment_yml,
+        "environment.yaml": parse_environment_yml
+    }
+    manifests = {}
+    for name in MANIFEST_FILES:
+        path = fs.join(root, name)
+        if fs.isfile(path):
+            manifests[name] = parsers[name](fs, path)
+    return manifests
+
+def _result(manifest_type: str) -> Dict[str, Any]:
+    return {"type": manifest_type, "requirements": [], "includes": [], "errors": []}
+
+def parse_requirements_file(
+    fs: ProjectFS,
+    path: str,
+    kind: str = "install",
+    _seen: Optional[Set[str]] = None,
+    _depth: int = 0
+) -> Dict[str, Any]:
+    """
+    pip requirements file: comments, line continuations, extras, environment markers,
+    'name @ url', and nested -r/--requirement and -c/--constraint files (constraints are
+    returned with kind='constraint'). Editable (-e) lines and other pip options are skipped.
+    """
+    result = _result("requirements")
+    seen = _seen if _seen is not None else set()
+    if path in seen or _depth > MAX_INCLUDE_DEPTH:
+        return result
+    seen.add(path)
+    try:
+        with fs.open(path, "r") as f:
+            text = f.read()
+    except OSError as e:
+        result["errors"].append(f"{path}: {e}")
+        return result
+
+    pending, start = "", 0
+    for lineno, raw in enumerate(text.splitlines(), start=1):
+        if not pending:
+            start = lineno
+        if raw.endswith("\\"):
+            pending += raw[:-1]
+            continue
+        line, pending = pending + raw, ""
+        lineno = start
+        line = re.sub(r"(^|\s)#.*$", "", line).strip()
+        if not line:
+            continue
+        include = re.match(r"^(-r|--requirement|-c|--constraint)(?:\s+|=)(\S+)", line)
+        if include:
+            nested_kind = "constraint" if include.group(1) in ("-c", "--constraint") else kind
+            nested_path = fs.join(fs.dirname(path), include.group(2))
+            result["includes"].append(nested_path)
+            if not fs.isfile(nested_path):
+                result["errors"].append(f"{path}:{lineno}: included file not found: {include.group(2)}")
+                continue
+            nested = parse_requirements_file(fs, nested_path, nested_kind, seen, _depth + 1)
+            result["requirements"].extend(nested["requirements"])
+            result["includes"].extend(nested["includes"])
+            result["errors"].extend(nested["errors"])
+            continue
+        if line.startswith("-"):
+            continue  # -e, --index-url, --hash, ...
+        req = parse_requirement(line, f"{path}:{lineno}", kind)
+        if req is None:
+            result["errors"].append(f"{path}:{lineno}: can't parse requirement: {line}")
+        else:
+            result["requirements"].append(req)
+    return result
+
+def parse_pyproject(fs: ProjectFS, path: str) -> Dict[str, Any]:
+    """
+    PEP 621 [project] dependencies and optional-dependencies, plus Poetry's
+    [tool.poetry] dependency tables.
+    """
+    result = _result("pyproject")
+    data = _load_toml(fs, path, result)
+    if data is None:
+        return result
+
+    project = data.get("project", {})
+    for text in project.get("dependencies", []):
+        _add(result, text, f"{path}:project.dependencies")
+    for extra, items in project.get("optional-dependencies", {}).items():
+        for text in items:
+            _add(result, text, f"{path}:project.optional-dependencies.{extra}", kind=f"extra:{extra}")
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    for table, kind in (("dependencies", "install"), ("dev-dependencies", "dev")):
+        _add_table(result, poetry.get(table, {}), f"{path}:tool.poetry.{table}", kind)
+    for group, spec in poetry.get("group", {}).items():
+        _add_table(result, spec.get("dependencies", {}), f"{path}:tool.poetry.group.{group}", f"group:{group}")
+    return result
+
+def parse_pipfile(fs: ProjectFS, path: str) -> Dict[str, Any]:
+    result = _result("pipfile")
+    data = _load_toml(fs, path, result)
+    if data is not None:
+        _add_table(result, data.get("packages", {}), f"{path}:packages", "install")
+        _add_table(result, data.get("dev-packages", {}), f"{path}:dev-packages", "dev")
+    return result
+
+def parse_setup_py(fs: ProjectFS, path: str) -> Dict[str, Any]:
+    """
+    Reads install_requires / extras_require / tests_require from the setup() call without
+    executing setup.py. Literal lists and module-level names bound to literal lists are
+    understood; anything computed at runtime is reported as an error.
+    """
+    result = _result("setup.py")
+    try:
+        with fs.open(path, "r") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        result["errors"].append(f"{path}: {e}")
+        return result
+
+    assignments = {
+        target.id: node.value
+        for node in tree.body if isinstance(node, ast.Assign)
+        for target in node.targets if isinstance(target, ast.Name)
+    }
+
+    def literal(node):
+        if isinstance(node, ast.Name) and node.id in assignments:
+            node = assignments[node.id]
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            return None
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if func_name != "setup":
+            continue
+        for keyword in node.keywords:
+            if keyword.arg not in ("install_requires", "extras_require", "tests_require", "setup_requires"):
+                continue
+            value = literal(keyword.value)
+            source = f"{path}:{keyword.value.lineno}"
+            if value is None:
+                result["errors"].append(f"{source}: {keyword.arg} is computed at runtime; not parsed")
+            elif keyword.arg == "extras_require" and isinstance(value, dict):
+                for extra, items in value.items():
+                    for text in _as_list(items):
+                        _add(result, text, source, kind=f"extra:{extra}")
+            else:
+                kind = {"install_requires": "install", "tests_require": "test", "setup_requires": "build"}[keyword.arg]
+                for text in _as_list(value):
+                    _add(result, text, source, kind=kind)
+    return result
+
+def parse_setup_cfg(fs: ProjectFS, path: str) -> Dict[str, Any]:
+    result = _result("setup.cfg")
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with fs.open(path, "r") as f:
+            parser.read_string(f.read(), source=path)
+    except (OSError, configparser.Error) as e:
+        result["errors"].append(f"{path}: {e}")
+        return result
+    if parser.has_option("options", "install_requires"):
+        for text in parser.get("options", "install_requires").splitlines():
+            _add(result, text, f"{path}:options.install_requires")
+    if parser.has_section("options.extras_require"):
+        for extra, value in parser.items("options.extras_require"):
+            for text in value.splitlines():
+                _add(result, text, f"{path}:options.extras_require.{extra}", kind=f"extra:{extra}")
+    return result
+
+def parse_environment_yml(fs: ProjectFS, path: str) -> Dict[str, Any]:
+    """
+    Conda environment file. Conda specs ('numpy=1.25', 'python>=3.10') are returned with
+    kind='conda'; entries of the nested 'pip:' list are parsed as pip requirements.
+    Uses PyYAML when installed, else a line-based reader for the common layout.
+    """
+    result = _result("conda")
+    try:
+        with fs.open(path, "r") as f:
+            text = f.read()
+    except OSError as e:
+        result["errors"].append(f"{path}: {e}")
+        return result
+
+    if yaml is not None:
+        try:
+            data = yaml.safe_load(text) or {}
+        except yaml.YAMLError as e:
+            result["errors"].append(f"{path}: {e}")
+            return result
+        dependencies = data.get("dependencies", []) if isinstance(data, dict) else []
+    else:
+        dependencies = _read_conda_dependencies(text)
+
+    for item in dependencies:
+        if isinstance(item, dict):
+            for text_item in item.get("pip", []) or []:
+                _add(result, str(text_item), f"{path}:dependencies.pip")
+        elif isinstance(item, str):
+            match = CONDA_SPEC_PATTERN.match(item.split("::")[-1].strip())
+            if not match:
+                result["errors"].append(f"{path}: can't parse conda spec: {item}")
+                continue
+            result["requirements"].append({
+                "name": canonical_name(match.group("name")),
+                "raw": item,
+                "extras": [],
+                "specifier": match.group("specifier") or "",
+                "url": None,
+                "marker": None,
+                "source": f"{path}:dependencies",
+                "kind": "conda"
+            })
+    return result
+
+def _read_conda_dependencies(text: str) -> List[Any]:
+    dependencies: List[Any] = []
+    in_deps, pip_list = False, None
+    for raw in text.splitlines():
+        line = raw.split("#", 1)[0].rstrip()
+        if not line.strip():
+            continue
+        if not raw.startswith((" ", "\t", "-")):
+            in_deps = line.strip().lower().startswith("dependencies:")
+            continue
+        item = line.strip()
+        if not in_deps or not item.startswith("- "):
+            continue
+        value = item[2:].strip()
+        if value.startswith("pip:"):
+            pip_list = []
+            dependencies.append({"pip": pip_list})
+        elif pip_list is not None and len(raw) - len(raw.lstrip()) > 2:
+            pip_list.append(value)
+        else:
+            pip_list = None
+            dependencies.append(value)
+    return dependencies
+
+def _load_toml(fs: ProjectFS, path: str, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if tomllib is None:
+        result["errors"].append(f"{path}: TOML support unavailable (Python 3.11+ or 'tomli' required)")
+        return None
+    try:
+        return tomllib.loads(fs.read_text(path))
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        result["errors"].append(f"{path}: {e}")
+        return None
+
+def _add(result: Dict[str, Any], text: str, source: str, kind: str = "install") -> None:
+    text = text.split("#", 1)[0].strip() if isinstance(text, str) else ""
+    if not text:
+        return
+    req = parse_requirement(text, source, kind)
+    if req is None:
+        result["errors"].append(f"{source}: can't parse requirement: {text}")
+    else:
+        result["requirements"].append(req)
+
+def _add_table(result: Dict[str, Any], table: Dict[str, Any], source: str, kind: str) -> None:
+    """
+    Poetry/Pipfile tables: {name: "^1.2" | "*" | {"version": ..., "extras": [...], "markers": ...}}.
+    """
+    for name, spec in table.items():
+        if canonical_name(name) == "python":
+            continue
+        extras, marker = [], None
+        if isinstance(spec, dict):
+            extras = spec.get("extras", [])
+            marker = spec.get("markers")
+            spec = spec.get("version", "*")
+        spec = "" if spec in ("*", "", None) else str(spec)
+        # Poetry's caret/tilde shorthand has no PEP 440 equivalent; keep it verbatim
+        result["requirements"].append({
+            "name": canonical_name(name),
+            "raw": f"{name}{spec}" if spec[:1] in "<>=!~" or not spec else f"{name} {spec}",
+            "extras": sorted(extras),
+            "specifier": spec,
+            "url": None,
+            "marker": marker,
+            "source": source,
+            "kind": kind
+        })
+
+def _as_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return value.splitlines()
+    return [str(v) for v in value or []]
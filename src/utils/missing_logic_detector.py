@@ -1,16 +1,17 @@
 # src/utils/missing_logic_detector.py
 
-import os
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
-def _scan_file_for_patterns(filepath: str, patterns: List[str]) -> List[str]:
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+def _scan_file_for_patterns(fs: ProjectFS, filepath: str, patterns: List[str]) -> List[str]:
     """
     Reads file content line by line, returns lines that match any given patterns.
     """
     issues = []
     try:
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        with fs.open(filepath, "r") as f:
             lines = f.readlines()
             for i, line in enumerate(lines, start=1):
                 for pat in patterns:
@@ -20,19 +21,20 @@ def _scan_file_for_patterns(filepath: str, patterns: List[str]) -> List[str]:
         pass
     return issues
 
-def analyze_incomplete_logic(project_path: str) -> Dict[str, Any]:
+def analyze_incomplete_logic(project_path: str, fs: Optional[ProjectFS] = None) -> Dict[str, Any]:
     """
     Detects lines with 'TODO', 'pass', or 'NotImplementedError' in all .py files under project_path.
     Returns a dictionary with key 'incomplete_logic' mapping file paths to line lists.
     """
+    fs = fs or LocalFS(project_path)
     patterns = [r"\bTODO\b", r"\bpass\b", r"\bNotImplementedError\b"]
     incomplete_issues = {}
 
-    for root, dirs, files in os.walk(project_path):
+    for root, dirs, files in fs.walk():
         for filename in files:
             if filename.endswith(".py"):
-                full_path = os.path.join(root, filename)
-                matches = _scan_file_for_patterns(full_path, patterns)
+                full_path = fs.join(root, filename)
+                matches = _scan_file_for_patterns(fs, full_path, patterns)
                 if matches:
                     incomplete_issues[full_path] = matches
 
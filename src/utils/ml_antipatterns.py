@@ -0,0 +1,267 @@
+# src/utils/ml_antipatterns.py
+
+import ast
+from typing import Dict, Any, List, Optional, Set
+
+# Estimators/helpers that take n_jobs and otherwise run on a single core
+PARALLEL_ESTIMATORS = frozenset({
+    "RandomForestClassifier", "RandomForestRegressor", "ExtraTreesClassifier",
+    "ExtraTreesRegressor", "BaggingClassifier", "BaggingRegressor", "IsolationForest",
+    "KNeighborsClassifier", "KNeighborsRegressor", "RadiusNeighborsClassifier",
+    "NearestNeighbors", "GridSearchCV", "RandomizedSearchCV", "HalvingGridSearchCV",
+    "HalvingRandomSearchCV", "cross_val_score", "cross_validate", "cross_val_predict",
+    "permutation_importance", "VotingClassifier", "StackingClassifier",
+    "OneVsRestClassifier", "MultiOutputClassifier", "XGBClassifier", "XGBRegressor",
+    "LGBMClassifier", "LGBMRegressor"
+})
+PREDICT_METHODS = frozenset({
+    "predict", "predict_proba", "predict_log_proba", "decision_function"
+})
+# Loops whose iterable or loop variable mentions one of these are batch loops, where a
+# predict call per iteration is the intended pattern
+BATCH_HINTS = ("chunk", "batch")
+# Keywords that already limit what read_csv parses or holds in memory
+READ_CSV_LIMITS = frozenset({"usecols", "dtype", "chunksize", "nrows", "iterator"})
+# (module, attribute) pairs that deserialize a model
+MODEL_LOADERS = frozenset({
+    ("joblib", "load"), ("pickle", "load"), ("cloudpickle", "load"), ("dill", "load"),
+    ("torch", "load"), ("keras.models", "load_model"),
+    ("tensorflow.keras.models", "load_model"), ("mlflow.pyfunc", "load_model")
+})
+
+# Rough impact statements per finding type; they set expectations, not measurements.
+IMPACT = {
+    "iterrows_loop": (
+        "high",
+        "DataFrame.iterrows builds a Series per row: typically 100-1000x slower than "
+        "vectorized column operations (or itertuples/to_numpy when a loop is "
+        "unavoidable)."
+    ),
+    "predict_in_loop": (
+        "high",
+        "One predict call per iteration pays sklearn's input validation and dispatch "
+        "each time (~0.1-1 ms per call); predicting the whole batch at once is usually "
+        "10-100x faster."
+    ),
+    "row_loop_over_predictions": (
+        "medium",
+        "Python-level work per prediction (print/append/format) dominates once rows "
+        "reach the millions; write predictions in bulk (DataFrame.to_csv/to_parquet) "
+        "instead."
+    ),
+    "estimator_without_n_jobs": (
+        "medium",
+        "Without n_jobs this runs on one core; n_jobs=-1 gives up to an N-core speedup "
+        "for fitting/prediction of tree ensembles, neighbors and CV/search helpers."
+    ),
+    "read_csv_without_projection": (
+        "medium",
+        "Reads and type-infers every column; usecols/dtype (or a columnar format) "
+        "typically cut load time and memory by 2-10x when only some columns are used."
+    ),
+    "model_load_in_loop": (
+        "high",
+        "Deserializes the model on every iteration (seconds for large forests); load "
+        "it once outside the loop."
+    ),
+    "repeated_model_load": (
+        "medium",
+        "The same model is loaded more than once; each load re-reads and re-allocates "
+        "it. Load once and reuse the object."
+    )
+}
+
+def detect_ml_antipatterns(tree: ast.AST, path: str) -> List[Dict[str, Any]]:
+    """
+    Statically flags throughput killers in an ML script or notebook:
+      - row-by-row loops (DataFrame.iterrows, loops over predictions)
+      - predict/predict_proba inside Python loops or comprehensions (loops over
+        chunks/batches are left alone)
+      - n_jobs-capable estimators built without n_jobs
+      - whole-file pd.read_csv without usecols/dtype (or chunking)
+      - model loads inside loops or repeated for the same source
+
+    Returns [{"type", "file", "line", "impact", "estimated_impact", "message"}].
+    """
+    visitor = _AntiPatternVisitor(path)
+    visitor.visit(tree)
+    for source, lines in visitor.model_loads.items():
+        if len(lines) > 1:
+            visitor.add(
+                "repeated_model_load", lines[1],
+                f"Model loaded {len(lines)} times from {source} "
+                f"(lines {', '.join(map(str, lines))})."
+            )
+    return sorted(visitor.findings, key=lambda f: (f["line"], f["type"]))
+
+class _AntiPatternVisitor(ast.NodeVisitor):
+
+    def __init__(self, path: str):
+        self.path = path
+        self.findings: List[Dict[str, Any]] = []
+        self.loop_depth = 0
+        self.batch_loops = 0                     # enclosing loops over chunks/batches
+        self.loader_names: Dict[str, str] = {}   # local name -> module it loads with
+        self.prediction_names: Set[str] = set()  # names assigned from a predict call
+        self.model_loads: Dict[str, List[int]] = {}
+
+    def add(self, finding_type: str, line: int, message: str) -> None:
+        impact, estimate = IMPACT[finding_type]
+        self.findings.append({
+            "type": finding_type, "file": self.path, "line": line,
+            "impact": impact, "estimated_impact": estimate, "message": message
+        })
+
+    # Imports: remember names that load models (from joblib import load as jl_load, ...)
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.loader_names[alias.asname or alias.name] = alias.name
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            if (node.module, alias.name) in MODEL_LOADERS:
+                name = alias.asname or alias.name
+                self.loader_names[name] = f"{node.module}.{alias.name}"
+        self.generic_visit(node)
+
+    # Scopes: a function body isn't lexically inside the caller's loop
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        depth, batches = self.loop_depth, self.batch_loops
+        self.loop_depth = self.batch_loops = 0
+        self.generic_visit(node)
+        self.loop_depth, self.batch_loops = depth, batches
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+    visit_Lambda = visit_FunctionDef
+
+    def visit_For(self, node: ast.For) -> None:
+        self.visit(node.iter)
+        self._check_loop_iterable(node.iter, node.lineno)
+        batched = _is_batch_loop(node.target, node.iter)
+        self.loop_depth += 1
+        self.batch_loops += batched
+        for child in [node.target] + node.body + node.orelse:
+            self.visit(child)
+        self.loop_depth -= 1
+        self.batch_loops -= batched
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self.loop_depth += 1
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        batched = any(
+            _is_batch_loop(generator.target, generator.iter)
+            for generator in node.generators
+        )
+        for generator in node.generators:
+            self._check_loop_iterable(generator.iter, node.lineno)
+        self.loop_depth += 1
+        self.batch_loops += batched
+        self.generic_visit(node)
+        self.loop_depth -= 1
+        self.batch_loops -= batched
+
+    visit_ListComp = visit_SetComp = _visit_comprehension
+    visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        value = node.value
+        if isinstance(value, ast.Call) and _method_name(value) in PREDICT_METHODS:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.prediction_names.add(target.id)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _method_name(node)
+        has_kwargs = any(keyword.arg is None for keyword in node.keywords)
+        keywords = {keyword.arg for keyword in node.keywords}
+
+        if name in PREDICT_METHODS and isinstance(node.func, ast.Attribute) \
+                and self.loop_depth and not self.batch_loops:
+            self.add(
+                "predict_in_loop", node.lineno,
+                f"{name}() is called inside a Python loop."
+            )
+        elif name in PARALLEL_ESTIMATORS and not (has_kwargs or "n_jobs" in keywords):
+            self.add(
+                "estimator_without_n_jobs", node.lineno,
+                f"{name}(...) is created without n_jobs."
+            )
+        elif name == "read_csv" and not has_kwargs and not keywords & READ_CSV_LIMITS:
+            self.add(
+                "read_csv_without_projection", node.lineno,
+                "read_csv loads the whole file without usecols/dtype or chunking."
+            )
+
+        loader = self._loader(node)
+        if loader:
+            if self.loop_depth:
+                self.add(
+                    "model_load_in_loop", node.lineno,
+                    f"{loader}() is called inside a loop."
+                )
+            if node.args:
+                source = ast.unparse(node.args[0])
+                self.model_loads.setdefault(source, []).append(node.lineno)
+        self.generic_visit(node)
+
+    def _loader(self, node: ast.Call) -> Optional[str]:
+        func = node.func
+        if isinstance(func, ast.Name) and "." in self.loader_names.get(func.id, ""):
+            return self.loader_names[func.id]
+        if isinstance(func, ast.Attribute):
+            owner = _dotted_name(func.value)
+            head = owner.split(".")[0] if owner else None
+            module = self.loader_names.get(head, owner) if owner else None
+            if module and owner != module:
+                module = module + owner[len(owner.split(".")[0]):]
+            if module and (module, func.attr) in MODEL_LOADERS:
+                return f"{module}.{func.attr}"
+        return None
+
+    def _check_loop_iterable(self, iterable: ast.AST, line: int) -> None:
+        # for ... in enumerate(x) / zip(x, ...) -> look at x
+        if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) \
+                and iterable.func.id in ("enumerate", "zip") and iterable.args:
+            iterable = iterable.args[0]
+        method = _method_name(iterable) if isinstance(iterable, ast.Call) else None
+        if method == "iterrows":
+            self.add("iterrows_loop", line, "Loop over DataFrame.iterrows().")
+        elif method in PREDICT_METHODS:
+            self.add(
+                "row_loop_over_predictions", line,
+                "Row-by-row loop over model predictions."
+            )
+        elif isinstance(iterable, ast.Name) and iterable.id in self.prediction_names:
+            self.add(
+                "row_loop_over_predictions", line,
+                f"Row-by-row loop over predictions '{iterable.id}'."
+            )
+
+def _is_batch_loop(target: ast.AST, iterable: ast.AST) -> bool:
+    # for chunk in pd.read_csv(..., chunksize=n) / for X_batch in loader
+    source = f"{ast.unparse(target)} {ast.unparse(iterable)}".lower()
+    return any(hint in source for hint in BATCH_HINTS)
+
+def _method_name(node: ast.Call) -> Optional[str]:
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
@@ -1,10 +1,26 @@
 # src/utils/ml_scanner.py
 
-import os
 import json
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Optional, Tuple, List
 
-def analyze_ml_workflow(project_path: str) -> Dict[str, Any]:
+from src.utils.ast_cache import AstCache
+from src.utils.import_graph import ImportGraph
+from src.utils.ml_antipatterns import detect_ml_antipatterns
+from src.utils.notebook_stream import analyze_notebook, join_code_cells
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+# Python files outside ml/ importing one of these are checked for ML anti-patterns too
+ML_MODULES = ("sklearn", "joblib", "torch", "tensorflow", "keras", "xgboost", "lightgbm")
+# Tests loop and reload models on purpose; files under these directories (or named
+# test_*.py / *_test.py / conftest.py) aren't checked for anti-patterns
+TEST_DIRECTORIES = frozenset({"test", "tests", "testing"})
+
+def analyze_ml_workflow(
+    project_path: str,
+    fs: Optional[ProjectFS] = None,
+    ast_cache: Optional[AstCache] = None,
+    import_graph: Optional[ImportGraph] = None
+) -> Dict[str, Any]:
     """
     Checks the ml/ folder for presence of:
       - config files (model_config.json, dataset_config.json)
@@ -12,54 +28,84 @@ def analyze_ml_workflow(project_path: str) -> Dict[str, Any]:
       - .ipynb notebooks in ml/notebooks/
 
     Optionally, performs basic validation on model_config.json if found.
+
+    ML scripts (everything under ml/ plus files importing ML_MODULES) and notebooks,
+    except tests, are also checked for throughput anti-patterns (see ml_antipatterns);
+    the findings, each with an estimated impact, are under "performance_findings".
+    Notebooks are streamed (never loaded whole) and their per-cell output sizes and
+    embedded binaries reported under "notebook_analysis"; cells over
+    notebook_stream.LARGE_OUTPUT_BYTES also get a validation message. Trees come from
+    the shared AstCache and importers from the ImportGraph; both are built here if not
+    passed in.
     """
-    ml_folder = os.path.join(project_path, "ml")
+    fs = fs or LocalFS(project_path)
+    ml_folder = fs.join(fs.root, "ml")
     ml_result = {
         "ml_folder_found": False,
         "configs_found": [],
         "scripts_found": [],
         "notebooks_found": [],
         "model_config_valid": True,
-        "validation_messages": []
+        "validation_messages": [],
+        "performance_findings": [],
+        "performance_summary": {},
+        "notebook_analysis": []
     }
 
-    if not os.path.isdir(ml_folder):
+    if ast_cache is None:
+        ast_cache = AstCache(fs)
+    if import_graph is None:
+        import_graph = ImportGraph.build(fs, ast_cache)
+    findings, notebooks = _scan_performance(fs, ml_folder, ast_cache, import_graph)
+    ml_result["performance_findings"] = findings
+    ml_result["notebook_analysis"] = notebooks
+    for report in notebooks:
+        for cell in report["bloated_cells"]:
+            ml_result["validation_messages"].append(
+                f"{report['path']} cell {cell['cell']}: {cell['output_bytes']} bytes of outputs "
+                f"({cell['binary_bytes']} embedded binary); clear outputs before committing."
+            )
+    for finding in findings:
+        summary = ml_result["performance_summary"]
+        summary[finding["type"]] = summary.get(finding["type"], 0) + 1
+
+    if not fs.isdir(ml_folder):
         return ml_result
 
     ml_result["ml_folder_found"] = True
 
     # 1) config folder
-    config_folder = os.path.join(ml_folder, "config")
-    if os.path.isdir(config_folder):
-        model_cfg_path = os.path.join(config_folder, "model_config.json")
-        dataset_cfg_path = os.path.join(config_folder, "dataset_config.json")
+    config_folder = fs.join(ml_folder, "config")
+    if fs.isdir(config_folder):
+        model_cfg_path = fs.join(config_folder, "model_config.json")
+        dataset_cfg_path = fs.join(config_folder, "dataset_config.json")
 
-        if os.path.isfile(model_cfg_path):
+        if fs.isfile(model_cfg_path):
             ml_result["configs_found"].append("model_config.json")
-            is_valid, msgs = _validate_model_config(model_cfg_path)
+            is_valid, msgs = _validate_model_config(fs, model_cfg_path)
             ml_result["model_config_valid"] = ml_result["model_config_valid"] and is_valid
             ml_result["validation_messages"].extend(msgs)
 
-        if os.path.isfile(dataset_cfg_path):
+        if fs.isfile(dataset_cfg_path):
             ml_result["configs_found"].append("dataset_config.json")
 
     # 2) scripts folder
-    scripts_folder = os.path.join(ml_folder, "scripts")
-    if os.path.isdir(scripts_folder):
-        for filename in os.listdir(scripts_folder):
+    scripts_folder = fs.join(ml_folder, "scripts")
+    if fs.isdir(scripts_folder):
+        for filename in fs.listdir(scripts_folder):
             if filename.endswith(".py"):
                 ml_result["scripts_found"].append(filename)
 
     # 3) notebooks folder
-    notebooks_folder = os.path.join(ml_folder, "notebooks")
-    if os.path.isdir(notebooks_folder):
-        for f in os.listdir(notebooks_folder):
+    notebooks_folder = fs.join(ml_folder, "notebooks")
+    if fs.isdir(notebooks_folder):
+        for f in fs.listdir(notebooks_folder):
             if f.endswith(".ipynb"):
                 ml_result["notebooks_found"].append(f)
 
     return ml_result
 
-def _validate_model_config(filepath: str) -> Tuple[bool, List[str]]:
+def _validate_model_config(fs: ProjectFS, filepath: str) -> Tuple[bool, List[str]]:
     """
     Loads model_config.json and checks for required fields.
     Returns (is_valid, list_of_messages).
@@ -67,7 +113,7 @@ def _validate_model_config(filepath: str) -> Tuple[bool, List[str]]:
     is_valid = True
     messages: List[str] = []
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
+        with fs.open(filepath, "r") as f:
             data = json.load(f)
         # Example checks: 'model_type' and 'hyperparameters' must exist
         if "model_type" not in data:
@@ -81,3 +127,62 @@ def _validate_model_config(filepath: str) -> Tuple[bool, List[str]]:
         messages.append(f"Error reading or parsing model_config.json: {str(e)}")
 
     return is_valid, messages
+
+def _scan_performance(fs: ProjectFS, ml_folder: str, ast_cache: AstCache,
+                      import_graph: ImportGraph) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Runs the anti-pattern detector over every notebook, every .py file under ml/ and
+    every other .py file importing an ML module.
+    Returns (findings, notebook reports).
+    """
+    scripts = set(fs.iter_files(ml_folder, suffix=(".py",))) if fs.isdir(ml_folder) else set()
+    for module in ML_MODULES:
+        scripts.update(path for path, _ in import_graph.importers_of(module, under=fs.root))
+
+    findings: List[Dict[str, Any]] = []
+    for path in sorted(scripts):
+        if _is_test_path(fs, path):
+            continue
+        tree = ast_cache.get(path)
+        if tree is not None:
+            findings.extend(detect_ml_antipatterns(tree, path))
+    notebooks = []
+    for path in fs.iter_files(suffix=(".ipynb",)):
+        report, notebook_findings = _scan_notebook(fs, path, ast_cache)
+        notebooks.append(report)
+        if not _is_test_path(fs, path):
+            findings.extend(notebook_findings)
+    return findings, notebooks
+
+def _is_test_path(fs: ProjectFS, path: str) -> bool:
+    name = fs.basename(path)
+    if name.startswith("test_") or name.endswith("_test.py") or name == "conftest.py":
+        return True
+    directory = fs.dirname(path)
+    while len(directory) > len(fs.root):
+        if fs.basename(directory) in TEST_DIRECTORIES:
+            return True
+        directory = fs.dirname(directory)
+    return False
+
+def _scan_notebook(fs: ProjectFS, path: str, ast_cache: AstCache) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Streams a notebook (see notebook_stream.analyze_notebook), parses its code cells as one
+    module and maps anti-pattern findings back to (cell, line).
+    Returns (notebook report without the cell sources, findings).
+    """
+    report = analyze_notebook(fs, path)
+    source, line_map = join_code_cells(report.pop("code_cells"))
+    try:
+        stamp = fs.stamp(path)
+    except (OSError, KeyError):
+        stamp = ()
+    tree = ast_cache.parse_source(path + "#cells", source, stamp)
+    if tree is None:
+        return report, []
+
+    findings = detect_ml_antipatterns(tree, path)
+    for finding in findings:
+        if 0 < finding["line"] <= len(line_map):
+            finding["cell"], finding["line"] = line_map[finding["line"] - 1]
+    return report, findings
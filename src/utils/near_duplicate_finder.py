@@ -0,0 +1,197 @@
+# src/utils/near_duplicate_finder.py
+
+import re
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+SOURCE_EXTENSIONS = (
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".go", ".rb", ".php", ".c", ".cc",
+    ".cpp", ".h", ".hpp", ".cs", ".rs", ".kt", ".scala", ".sh"
+)
+TOKEN_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+|[^\sA-Za-z0-9_]")
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# Shingle hashes are processed in blocks so the (num_perm, block) matrix stays small.
+MINHASH_BLOCK_SIZE = 4096
+# LSH buckets with more members than this (generated or templated files) are treated as
+# one cluster: each member is paired with the first one only, not with every other.
+MAX_BUCKET_SIZE = 64
+
+def analyze_near_duplicates(
+    project_path: str,
+    file_details: Optional[List[Dict[str, Any]]] = None,
+    threshold: float = 0.8,
+    shingle_size: int = 5,
+    num_perm: int = 128,
+    bands: Optional[int] = None,
+    min_shingles: int = 20,
+    max_file_bytes: int = 1024 * 1024,
+    seed: int = 1,
+    fs: Optional[ProjectFS] = None
+) -> Dict[str, Any]:
+    """
+    Finds copy-pasted source files with small edits (not just byte-identical ones).
+
+    Each source file is tokenized into k-token shingles, summarized by a MinHash
+    signature (computed with NumPy over blocks of shingles) and indexed with LSH
+    banding, so only files that collide in at least one band are compared; there is
+    no all-pairs comparison, even within a band bucket (see MAX_BUCKET_SIZE).
+
+    :param file_details: Optional inventory as returned by analyze_file_structure()["file_details"].
+    :param threshold: Minimum estimated Jaccard similarity to report.
+    :param shingle_size: Tokens per shingle.
+    :param num_perm: Number of MinHash permutations (signature length).
+    :param bands: LSH bands; must divide num_perm. If None, picked to match the threshold.
+    :param min_shingles: Files with fewer distinct shingles are skipped (too small to compare).
+    :param max_file_bytes: Larger files are skipped (usually generated or minified).
+    :param fs: Optional ProjectFS to read files through (e.g. an archive).
+    Returns {"near_duplicates": [{"files": [a, b], "similarity": float}, ...], "stats": {...}}.
+    """
+    fs = fs or LocalFS(project_path)
+    if file_details is None:
+        file_details = fs.inventory()
+    if bands is None:
+        bands = _choose_bands(threshold, num_perm)
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm}).")
+
+    permutations = _make_permutations(num_perm, seed)
+    token_hashes: Dict[str, int] = {}
+
+    paths: List[str] = []
+    signatures: List[np.ndarray] = []
+    for entry in file_details:
+        path = entry["path"]
+        size = entry.get("size")
+        if not path.endswith(SOURCE_EXTENSIONS) or not isinstance(size, int) or size > max_file_bytes:
+            continue
+        try:
+            with fs.open(path, "r") as f:
+                text = f.read()
+        except OSError:
+            continue
+        shingles = _shingle_hashes(text, shingle_size, token_hashes)
+        if shingles.size < min_shingles:
+            continue
+        paths.append(path)
+        signatures.append(_minhash(shingles, permutations))
+
+    pairs = []
+    candidate_count = oversized_buckets = 0
+    if signatures:
+        sig_matrix = np.vstack(signatures)
+        candidates, oversized_buckets = _lsh_candidates(sig_matrix, bands)
+        candidate_count = len(candidates)
+        if candidates:
+            left, right = np.array(candidates, dtype=np.int64).T
+            similarity = (sig_matrix[left] == sig_matrix[right]).mean(axis=1)
+            keep = np.nonzero(similarity >= threshold)[0]
+            for idx in keep[np.argsort(-similarity[keep], kind="stable")]:
+                pairs.append({
+                    "files": [paths[left[idx]], paths[right[idx]]],
+                    "similarity": round(float(similarity[idx]), 4)
+                })
+
+    return {
+        "near_duplicates": pairs,
+        "stats": {
+            "files_indexed": len(paths),
+            "candidate_pairs": candidate_count,
+            "oversized_buckets": oversized_buckets,
+            "bands": bands,
+            "rows_per_band": num_perm // bands
+        }
+    }
+
+def _choose_bands(threshold: float, num_perm: int) -> int:
+    """
+    Picks the band count that minimizes the weighted area of false positives (below the
+    threshold) plus false negatives (above it) under the LSH S-curve 1 - (1 - s^r)^b.
+    Misses are weighted higher: a false candidate only costs one signature comparison.
+    """
+    s = np.linspace(0.0, 1.0, 501)
+    best_bands, best_error = 1, float("inf")
+    for b in (b for b in range(1, num_perm + 1) if num_perm % b == 0):
+        p_candidate = 1.0 - (1.0 - s ** (num_perm // b)) ** b
+        error = np.where(s < threshold, 0.2 * p_candidate, 0.8 * (1.0 - p_candidate)).mean()
+        if error < best_error:
+            best_bands, best_error = b, error
+    return best_bands
+
+def _make_permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+    b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % MERSENNE_PRIME
+    return a[:, None], b[:, None]
+
+def _shingle_hashes(text: str, shingle_size: int, token_hashes: Dict[str, int]) -> np.ndarray:
+    """
+    Returns the distinct 32-bit hashes of all shingle_size-token windows in the text.
+    Token hashes are memoized across files in token_hashes.
+    """
+    tokens = TOKEN_PATTERN.findall(text)
+    if len(tokens) < shingle_size:
+        return np.empty(0, dtype=np.uint64)
+
+    hashes = np.empty(len(tokens), dtype=np.uint64)
+    for i, token in enumerate(tokens):
+        h = token_hashes.get(token)
+        if h is None:
+            h = token_hashes[token] = zlib.crc32(token.encode("utf-8"))
+        hashes[i] = h
+
+    # Polynomial rolling combination of each window, kept in 32 bits.
+    windows = len(tokens) - shingle_size + 1
+    combined = np.zeros(windows, dtype=np.uint64)
+    base = np.uint64(1000003)
+    for offset in range(shingle_size):
+        combined = (combined * base + hashes[offset:offset + windows]) & MAX_HASH
+    return np.unique(combined)
+
+def _minhash(shingles: np.ndarray, permutations: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    a, b = permutations
+    signature = np.full(a.shape[0], MAX_HASH, dtype=np.uint64)
+    for start in range(0, shingles.size, MINHASH_BLOCK_SIZE):
+        block = shingles[start:start + MINHASH_BLOCK_SIZE][None, :]
+        hashed = ((a * block + b) % MERSENNE_PRIME) & MAX_HASH
+        np.minimum(signature, hashed.min(axis=1), out=signature)
+    return signature
+
+def _lsh_candidates(
+    signatures: np.ndarray,
+    bands: int,
+    max_bucket_size: int = MAX_BUCKET_SIZE
+) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Buckets every signature band; files sharing any bucket become candidate pairs.
+    A bucket larger than max_bucket_size only pairs its first member with the others,
+    so candidates stay linear in the number of files.
+    Returns (sorted candidate pairs, number of oversized buckets).
+    """
+    rows = signatures.shape[1] // bands
+    candidates = set()
+    oversized = 0
+    for band in range(bands):
+        band_view = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = band_view.view(np.dtype((np.void, rows * band_view.itemsize))).ravel()
+        _, bucket_ids, bucket_sizes = np.unique(keys, return_inverse=True, return_counts=True)
+        if bucket_sizes.max() < 2:
+            continue
+        order = np.argsort(bucket_ids, kind="stable")
+        for members in np.split(order, np.cumsum(bucket_sizes)[:-1]):
+            if len(members) < 2:
+                continue
+            members = members.tolist()
+            if len(members) > max_bucket_size:
+                oversized += 1
+                candidates.update((members[0], member) for member in members[1:])
+                continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return sorted(candidates), oversized
@@ -0,0 +1,322 @@
+# src/utils/notebook_stream.py
+
+import heapq
+import json
+from typing import Dict, Any, Iterator, List, Tuple
+
+from src.utils.virtual_fs import ProjectFS
+
+CHUNK_SIZE = 1 << 16
+# Outputs of these MIME types are embedded (base64) binaries
+BINARY_MIME_PREFIXES = ("image/", "audio/", "video/", "application/pdf", "application/octet-stream")
+# Cells whose outputs exceed this are reported as bloat
+LARGE_OUTPUT_BYTES = 1 << 20
+LARGEST_CELLS_REPORTED = 10
+
+_WHITESPACE = frozenset(b" \t\r\n")
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_OPENERS, _CLOSERS = frozenset(b"{["), frozenset(b"}]")
+_SCALAR_END = frozenset(b",]}") | _WHITESPACE
+
+class NotebookStreamError(ValueError):
+    pass
+
+class _JsonStream:
+    """
+    Pull tokenizer over a binary file handle. Only a CHUNK_SIZE window of the file is held,
+    except while a value is being captured (read_value), so large strings (base64 images,
+    long outputs) can be skipped and measured without ever being materialized.
+    """
+
+    def __init__(self, handle, chunk_size: int = CHUNK_SIZE):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.pos = 0
+        self.offset = 0         # file offset of buf[0]
+        self.mark = None        # start of the value being captured
+
+    def tell(self) -> int:
+        return self.offset + self.pos
+
+    def _fill(self) -> bool:
+        data = self.handle.read(self.chunk_size)
+        if not data:
+            return False
+        keep = self.mark if self.mark is not None else self.pos
+        self.buf = self.buf[keep:] + data
+        self.offset += keep
+        self.pos -= keep
+        if self.mark is not None:
+            self.mark = 0
+        return True
+
+    def peek(self) -> int:
+        """
+        Next non-whitespace byte, not consumed.
+        """
+        while True:
+            buf = self.buf
+            while self.pos < len(buf):
+                if buf[self.pos] not in _WHITESPACE:
+                    return buf[self.pos]
+                self.pos += 1
+            if not self._fill():
+                raise NotebookStreamError(f"Unexpected end of notebook at byte {self.tell()}")
+
+    def expect(self, byte: bytes) -> None:
+        if self.peek() != byte[0]:
+            raise NotebookStreamError(f"Expected {byte.decode()!r} at byte {self.tell()}")
+        self.pos += 1
+
+    def skip_string(self) -> None:
+        self.expect(b'"')
+        while True:
+            end = self.buf.find(b'"', self.pos)
+            if end < 0:
+                # Keep a trailing run of backslashes so an escape is never split from its quote
+                tail = len(self.buf)
+                while tail > self.pos and self.buf[tail - 1] == _BACKSLASH:
+                    tail -= 1
+                self.pos = tail
+                if not self._fill():
+                    raise NotebookStreamError("Unterminated string in notebook")
+                continue
+            escapes = 0
+            while end - escapes - 1 >= self.pos and self.buf[end - escapes - 1] == _BACKSLASH:
+                escapes += 1
+            self.pos = end + 1
+            if escapes % 2 == 0:
+                return
+
+    def skip_value(self) -> int:
+        """
+        Skips the next value and returns its size in bytes.
+        """
+        first = self.peek()
+        start = self.tell()
+        if first == _QUOTE:
+            self.skip_string()
+        elif first in _OPENERS:
+            depth = 0
+            while True:
+                byte = self.peek()
+                if byte == _QUOTE:
+                    self.skip_string()
+                    continue
+                self.pos += 1
+                if byte in _OPENERS:
+                    depth += 1
+                elif byte in _CLOSERS:
+                    depth -= 1
+                    if depth == 0:
+                        break
+        else:
+            while True:
+                if self.pos == len(self.buf) and not self._fill():
+                    break
+                if self.buf[self.pos] in _SCALAR_END:
+                    break
+                self.pos += 1
+        return self.tell() - start
+
+    def read_value(self) -> Any:
+        """
+        Parses the next value; only for values that are small enough to hold.
+        """
+        self.peek()
+        self.mark = self.pos
+        try:
+            self.skip_value()
+            raw = self.buf[self.mark:self.pos]
+        finally:
+            self.mark = None
+        return json.loads(raw)
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yields the keys of an object; the caller consumes each value before the next key.
+        """
+        self.expect(b"{")
+        if self.peek() == ord("}"):
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(b":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == ord("}"):
+                return
+            if separator != ord(","):
+                raise NotebookStreamError(f"Expected ',' or '}}' at byte {self.tell() - 1}")
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Yields element indexes of an array; the caller consumes each element.
+        """
+        self.expect(b"[")
+        if self.peek() == ord("]"):
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            separator = self.peek()
+            self.pos += 1
+            if separator == ord("]"):
+                return
+            if separator != ord(","):
+                raise NotebookStreamError(f"Expected ',' or ']' at byte {self.tell() - 1}")
+
+def iter_notebook_cells(handle, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the cells of an .ipynb file (nbformat 4) from a binary handle, one at a time.
+    Outputs and attachments are measured, never loaded, so memory stays bounded by the
+    chunk size plus the source of one cell.
+
+    Yields {"index", "cell_type", "execution_count", "source" (code cells only, else None),
+    "source_bytes", "output_count", "output_bytes", "binary_bytes", "binary_by_mime"}.
+    """
+    stream = _JsonStream(handle, chunk_size)
+    for key in stream.iter_object():
+        if key != "cells":
+            stream.skip_value()
+            continue
+        for index in stream.iter_array():
+            yield _read_cell(stream, index)
+
+def _read_cell(stream: _JsonStream, index: int) -> Dict[str, Any]:
+    cell = {
+        "index": index,
+        "cell_type": None,
+        "execution_count": None,
+        "source": None,
+        "source_bytes": 0,
+        "output_count": 0,
+        "output_bytes": 0,
+        "binary_bytes": 0,
+        "binary_by_mime": {}
+    }
+    for key in stream.iter_object():
+        if key == "cell_type":
+            cell["cell_type"] = stream.read_value()
+        elif key == "execution_count":
+            cell["execution_count"] = stream.read_value()
+        elif key == "source":
+            source = stream.read_value()
+            cell["source"] = "".join(source) if isinstance(source, list) else source
+            cell["source_bytes"] = len(cell["source"].encode("utf-8"))
+        elif key == "outputs":
+            for _ in stream.iter_array():
+                stream.peek()
+                start = stream.tell()
+                _read_output(stream, cell)
+                cell["output_bytes"] += stream.tell() - start
+                cell["output_count"] += 1
+        elif key == "attachments":
+            # Markdown attachments: {name: {mime: base64}}
+            for _ in stream.iter_object():
+                for mime in stream.iter_object():
+                    _add_binary(cell, mime, stream.skip_value())
+        else:
+            stream.skip_value()
+    if cell["cell_type"] != "code":
+        cell["source"] = None
+    return cell
+
+def _read_output(stream: _JsonStream, cell: Dict[str, Any]) -> None:
+    for key in stream.iter_object():
+        if key != "data":
+            stream.skip_value()
+            continue
+        for mime in stream.iter_object():
+            size = stream.skip_value()
+            if mime.startswith(BINARY_MIME_PREFIXES):
+                _add_binary(cell, mime, size)
+
+def _add_binary(cell: Dict[str, Any], mime: str, size: int) -> None:
+    cell["binary_bytes"] += size
+    cell["binary_by_mime"][mime] = cell["binary_by_mime"].get(mime, 0) + size
+
+def analyze_notebook(
+    fs: ProjectFS,
+    path: str,
+    large_output_bytes: int = LARGE_OUTPUT_BYTES,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Streams a notebook once and reports where its bytes go.
+
+    :param large_output_bytes: Cells with more output than this are listed as bloated.
+    Returns {"path", "size_bytes", "cells", "code_cells" [(cell index, source)],
+    "output_bytes", "binary_bytes", "binary_by_mime", "largest_outputs", "bloated_cells",
+    "error"}; the cell lists hold {"cell", "cell_type", "output_count", "output_bytes",
+    "binary_bytes"}.
+    """
+    report = {
+        "path": path,
+        "size_bytes": 0,
+        "cells": 0,
+        "code_cells": [],
+        "output_bytes": 0,
+        "binary_bytes": 0,
+        "binary_by_mime": {},
+        "largest_outputs": [],
+        "bloated_cells": [],
+        "error": None
+    }
+    largest: List[tuple] = []   # min-heap of (output_bytes, index, summary)
+    try:
+        with fs.open(path, "rb") as handle:
+            for cell in iter_notebook_cells(handle, chunk_size):
+                report["cells"] += 1
+                if cell["source"] is not None:
+                    report["code_cells"].append((cell["index"], cell["source"]))
+                report["output_bytes"] += cell["output_bytes"]
+                report["binary_bytes"] += cell["binary_bytes"]
+                for mime, size in cell["binary_by_mime"].items():
+                    report["binary_by_mime"][mime] = report["binary_by_mime"].get(mime, 0) + size
+                if not cell["output_bytes"]:
+                    continue
+                summary = _cell_summary(cell)
+                if cell["output_bytes"] > large_output_bytes:
+                    report["bloated_cells"].append(summary)
+                entry = (cell["output_bytes"], cell["index"], summary)
+                if len(largest) < LARGEST_CELLS_REPORTED:
+                    heapq.heappush(largest, entry)
+                elif entry[:2] > largest[0][:2]:
+                    heapq.heapreplace(largest, entry)
+    except (OSError, KeyError, NotebookStreamError, ValueError) as e:
+        report["error"] = str(e)
+    report["largest_outputs"] = [summary for _, _, summary in sorted(largest, key=lambda e: e[:2], reverse=True)]
+    try:
+        report["size_bytes"] = fs.getsize(path)
+    except (OSError, KeyError):
+        pass
+    return report
+
+def _cell_summary(cell: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "cell": cell["index"],
+        "cell_type": cell["cell_type"],
+        "output_count": cell["output_count"],
+        "output_bytes": cell["output_bytes"],
+        "binary_bytes": cell["binary_bytes"]
+    }
+
+def join_code_cells(code_cells: List[Tuple[int, str]]) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Joins code cells into one module for the Python scanners. IPython magics and shell
+    escapes are blanked (not dropped) so lines stay aligned.
+    Returns (source, line_map) where line_map[module line - 1] = (cell index, line in cell).
+    """
+    lines: List[str] = []
+    line_map: List[Tuple[int, int]] = []
+    for index, source in code_cells:
+        for number, line in enumerate(source.splitlines(), start=1):
+            lines.append("" if line.lstrip().startswith(("%", "!")) else line)
+            line_map.append((index, number))
+    return "\n".join(lines), line_map
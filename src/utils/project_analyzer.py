@@ -2,6 +2,7 @@
 
 import json
 import os
+import sqlite3
 import sys
 from typing import Dict, Any, List, Optional
 
@@ -13,68 +14,132 @@ from src.utils.ml_scanner import analyze_ml_workflow
 from src.utils.missing_logic_detector import analyze_incomplete_logic
 from src.utils.env_file_scanner import analyze_env_file
 from src.utils.security_scanner import analyze_security
-from src.utils.duplicate_finder import analyze_duplicates
+from src.utils.duplicate_finder import analyze_duplicates, analyze_code_clones
+from src.utils.ast_cache import AstCache
+from src.utils.import_graph import ImportGraph
+from src.utils.dependency_resolver import DistributionIndex
+from src.utils.hash_cache import HashCache
+from src.utils.near_duplicate_finder import analyze_near_duplicates
 from src.utils.logging_scanner import analyze_logging_and_monitoring
 from src.utils.testing_scanner import analyze_testing_setup
+from src.utils.subproject_scanner import analyze_subprojects
+from src.utils.virtual_fs import ProjectFS, is_archive, open_project_fs
 
 
 def analyze_project(
     project_path: str,
     skip_dirs: Optional[List[str]] = None,
     skip_large_files: bool = False,
-    large_file_threshold_mb: int = 50
+    large_file_threshold_mb: int = 50,
+    use_hash_cache: bool = True,
+    revision: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Coordinates all sub-analyses by calling each specialized scanner.
     Returns a consolidated report as a dictionary.
 
-    :param project_path: Path to the project directory to analyze.
+    :param project_path: Path to the project directory, or a zip/tar/wheel/sdist archive, to analyze.
+        Archives are read in place (see src/utils/virtual_fs.py), nothing is extracted.
     :param skip_dirs: Optional list of directory names to skip (e.g., ['node_modules', '.git', '__pycache__']).
     :param skip_large_files: If True, some scanners may skip files above 'large_file_threshold_mb'.
     :param large_file_threshold_mb: The file size threshold in MB if skipping large files.
+    :param use_hash_cache: If True, duplicate detection reuses file hashes from the host-wide
+        hash cache (see src/utils/hash_cache.py; location set by CODE_ANALYZER_CACHE_DIR).
+    :param revision: Optional git revision (commit, branch, tag) to analyze instead of the
+        working tree; project_path must then be a git repository. Files are read from the
+        object store and nothing is checked out.
     """
 
     # Validate project_path
-    if not os.path.isdir(project_path):
+    if not (os.path.isdir(project_path) or (os.path.isfile(project_path) and is_archive(project_path))):
         return {
-            "error": f"Provided path '{project_path}' is not a valid directory.",
+            "error": f"Provided path '{project_path}' is not a valid directory or archive.",
             "project_path": project_path
         }
 
-    # If skipping directories, set it up globally, though each scanner
-    # might handle it differently if you integrate that logic.
-    # Currently, most scanners read the entire tree, so you'd incorporate
-    # skip logic within them if needed.
+    # Every scanner reads through one ProjectFS: the tree is inventoried once (skip_dirs
+    # applies there) and walk()/listdir() calls are answered from that inventory.
+    try:
+        fs = open_project_fs(project_path, skip_dirs=skip_dirs, revision=revision)
+    except ValueError as e:
+        return {"error": str(e), "project_path": project_path}
+    with fs:
+        report = _run_scanners(project_path, fs, use_hash_cache)
+    if revision is not None:
+        report["revision"] = fs.commit
+
+    # If skip_large_files is True, you might do a post-scan pass in each dictionary
+    # to remove or mark large files. But that logic must be integrated inside each scanner.
+
+    return report
+
+
+def _run_scanners(project_path: str, fs: ProjectFS, use_hash_cache: bool) -> Dict[str, Any]:
+    # Parsed Python sources shared by the AST-based scanners
+    ast_cache = AstCache(fs)
+    # Imports of every .py file, queried by the requirements, logging, testing and ML scanners
+    import_graph = ImportGraph.build(fs, ast_cache)
+    # Installed/wheel metadata for offline dependency resolution, shared with sub-projects
+    distribution_index = DistributionIndex()
 
     # 1. File structure
-    file_structure = analyze_file_structure(project_path)
+    file_structure = analyze_file_structure(project_path, fs=fs)
 
     # 2. Requirements
-    requirements_info = analyze_requirements(project_path)
+    requirements_info = analyze_requirements(
+        fs.root, fs=fs, import_graph=import_graph, distribution_index=distribution_index
+    )
 
     # 3. Docker setup
-    docker_info = analyze_docker_setup(project_path)
+    docker_info = analyze_docker_setup(fs.root, fs=fs)
 
     # 4. ML workflow
-    ml_info = analyze_ml_workflow(project_path)
+    ml_info = analyze_ml_workflow(fs.root, fs=fs, ast_cache=ast_cache, import_graph=import_graph)
 
     # 5. Incomplete logic
-    incomplete_logic = analyze_incomplete_logic(project_path)
+    incomplete_logic = analyze_incomplete_logic(fs.root, fs=fs)
 
     # 6. .env checks
-    env_info = analyze_env_file(project_path)
+    env_info = analyze_env_file(fs.root, fs=fs)
 
     # 7. Security checks
-    security_info = analyze_security(project_path)
-
-    # 8. Duplicate or redundant files
-    duplicates_info = analyze_duplicates(project_path)
+    security_info = analyze_security(fs.root, fs=fs)
+
+    # 8. Duplicate or redundant files (reuses the inventory from step 1)
+    duplicates_info = None
+    if use_hash_cache:
+        try:
+            with HashCache() as hash_cache:
+                duplicates_info = analyze_duplicates(
+                    fs.root, file_details=file_structure["file_details"], hash_cache=hash_cache, fs=fs
+                )
+        except (OSError, sqlite3.Error):
+            # Unusable cache (not a directory, read-only, locked or corrupt): hash uncached
+            duplicates_info = None
+    if duplicates_info is None:
+        duplicates_info = analyze_duplicates(fs.root, file_details=file_structure["file_details"], fs=fs)
+
+    # 8b. Near-duplicate (copy-pasted, lightly edited) source files
+    near_duplicates_info = analyze_near_duplicates(fs.root, file_details=file_structure["file_details"], fs=fs)
+
+    # 8c. Duplicated functions/classes (normalized AST hashes)
+    code_clones_info = analyze_code_clones(
+        fs.root, file_details=file_structure["file_details"], ast_cache=ast_cache
+    )
 
     # 9. Logging & Monitoring
-    logging_info = analyze_logging_and_monitoring(project_path)
+    logging_info = analyze_logging_and_monitoring(
+        fs.root, fs=fs, import_graph=import_graph, ast_cache=ast_cache
+    )
 
     # 10. Testing & QA
-    testing_info = analyze_testing_setup(project_path)
+    testing_info = analyze_testing_setup(fs.root, fs=fs, import_graph=import_graph)
+
+    # 11. Monorepo sub-projects (directories with their own manifests or Dockerfiles)
+    subprojects_info = analyze_subprojects(
+        fs.root, fs=fs, import_graph=import_graph,
+        distribution_index=distribution_index, ast_cache=ast_cache
+    )
 
     # Consolidate everything
     report = {
@@ -87,20 +152,20 @@ def analyze_project(
         "env_file": env_info,
         "security": security_info,
         "duplicates": duplicates_info,
+        "near_duplicates": near_duplicates_info,
+        "code_clones": code_clones_info,
         "logging_monitoring": logging_info,
-        "testing": testing_info
+        "testing": testing_info,
+        "import_graph": import_graph.to_dict(),
+        "subprojects": subprojects_info
     }
-
-    # If skip_large_files is True, you might do a post-scan pass in each dictionary
-    # to remove or mark large files. But that logic must be integrated inside each scanner.
-
     return report
 
 
 if __name__ == "__main__":
     # Basic CLI usage
     if len(sys.argv) < 2:
-        print("Usage: python project_analyzer.py /path/to/project [skip_dir1,skip_dir2,...]")
+        print("Usage: python project_analyzer.py /path/to/project [skip_dir1,skip_dir2,...] [git_revision]")
         sys.exit(1)
 
     project_path = sys.argv[1]
@@ -108,10 +173,13 @@ if __name__ == "__main__":
 
     # Optional: parse second argument for skip dirs
     if len(sys.argv) > 2:
-        skip_dirs_list = sys.argv[2].split(",")
+        skip_dirs_list = [d for d in sys.argv[2].split(",") if d]
+
+    # Optional: third argument selects a git revision
+    revision = sys.argv[3] if len(sys.argv) > 3 else None
 
     # Perform analysis
-    results = analyze_project(project_path, skip_dirs=skip_dirs_list)
+    results = analyze_project(project_path, skip_dirs=skip_dirs_list, revision=revision)
 
     # Print as JSON
     print(json.dumps(results, indent=2))
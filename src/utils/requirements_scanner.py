@@ -1,124 +1,163 @@
 # src/utils/requirements_scanner.py
 
-import os
 import re
-from typing import Dict, Any, List, Tuple
-
-VERSION_PATTERN = re.compile(
-    r"^(?P<name>[A-Za-z0-9_\-\.]+)(?P<specifier>==|>=|<=|~=|!=|>|<)?(?P<version>[0-9a-zA-Z\.\-]*)$"
-)
-
-def analyze_requirements(project_path: str) -> Dict[str, Any]:
+import threading
+from importlib import metadata
+from typing import Dict, Any, List, Optional, Set
+
+from src.utils.dependency_resolver import DistributionIndex, resolve_dependencies
+from src.utils.import_graph import ImportGraph
+from src.utils.manifest_parser import canonical_name, parse_manifests
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+SINGLE_CLAUSE_PATTERN = re.compile(r"^(?P<specifier>===|==|>=|<=|~=|!=|>|<|=)(?P<version>[^,<>=!~]+)$")
+
+# Distributions whose import name can't be derived from the package name
+KNOWN_IMPORT_NAMES = {
+    "scikit-learn": ["sklearn"],
+    "pillow": ["PIL"],
+    "pyyaml": ["yaml"],
+    "python-dotenv": ["dotenv"],
+    "beautifulsoup4": ["bs4"],
+    "opencv-python": ["cv2"],
+    "opencv-python-headless": ["cv2"],
+    "python-dateutil": ["dateutil"],
+    "protobuf": ["google"],
+    "pyjwt": ["jwt"],
+    "psycopg2-binary": ["psycopg2"],
+    "attrs": ["attr", "attrs"],
+    "sentry-sdk": ["sentry_sdk"],
+    "tensorflow-gpu": ["tensorflow"],
+    "pytorch": ["torch"],
+    "msgpack-python": ["msgpack"],
+    "pyzmq": ["zmq"],
+}
+# Declared in environment.yml but never imported by design
+NON_IMPORTABLE_PACKAGES = {"python", "pip", "setuptools", "wheel"}
+
+def analyze_requirements(
+    project_path: str,
+    fs: Optional[ProjectFS] = None,
+    import_graph: Optional[ImportGraph] = None,
+    resolve: bool = True,
+    distribution_index: Optional[DistributionIndex] = None
+) -> Dict[str, Any]:
+    """
+    Parses the dependency manifests at the project root (requirements.txt with its -r/-c
+    includes, pyproject.toml, setup.py, setup.cfg, Pipfile, environment.yml; see
+    manifest_parser) and summarizes requirements.txt and environment.yml in the
+    historical format.
+
+    :param import_graph: Optional ImportGraph of the run. When given, the result also has a
+        "dependency_usage" section comparing declared packages against actual imports:
+        declared but never imported ("unused") and imported third-party modules that no
+        declared package provides ("undeclared").
+    :param resolve: Resolve the declared requirements offline against installed metadata and
+        local wheels (see dependency_resolver) into "dependency_resolution".
+    :param distribution_index: Optional DistributionIndex shared between calls (e.g. sub-projects).
+    """
+    fs = fs or LocalFS(project_path)
+    manifests = parse_manifests(fs)
     results = {
-        "requirements_txt": {
-            "found": False,
-            "packages": [],
-            "missing_versions": [],
-            "duplicates": []
-        },
-        "environment_yml": {
-            "found": False,
-            "packages": [],
-            "missing_versions": [],
-            "duplicates": []
-        }
+        "requirements_txt": _legacy_summary(manifests.get("requirements.txt")),
+        "environment_yml": _legacy_summary(manifests.get("environment.yml") or manifests.get("environment.yaml")),
+        "manifests": manifests
     }
 
-    req_path = os.path.join(project_path, "requirements.txt")
-    if os.path.isfile(req_path):
-        results["requirements_txt"]["found"] = True
-        lines = _read_lines(req_path)
-        packages, missing, duplicates = _parse_requirements_txt(lines)
-        results["requirements_txt"]["packages"] = packages
-        results["requirements_txt"]["missing_versions"] = missing
-        results["requirements_txt"]["duplicates"] = duplicates
-
-    env_yml_path = os.path.join(project_path, "environment.yml")
-    if os.path.isfile(env_yml_path):
-        results["environment_yml"]["found"] = True
-        lines = _read_lines(env_yml_path)
-        packages, missing, duplicates = _parse_environment_yml(lines)
-        results["environment_yml"]["packages"] = packages
-        results["environment_yml"]["missing_versions"] = missing
-        results["environment_yml"]["duplicates"] = duplicates
+    declared = [req for manifest in manifests.values() for req in manifest["requirements"]]
+    if import_graph is not None:
+        results["dependency_usage"] = _dependency_usage(declared, import_graph, fs.root)
+    if resolve and declared:
+        results["dependency_resolution"] = resolve_dependencies(declared, index=distribution_index)
 
     return results
 
-def _read_lines(filepath: str) -> List[str]:
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        return [line.strip() for line in f.readlines()]
-
-def _parse_requirements_txt(lines: List[str]) -> Tuple[List[dict], List[str], List[str]]:
-    packages = []
-    name_counts = {}
-    missing_versions = []
-    duplicates = []
-
-    for line in lines:
-        if not line or line.startswith("#"):
+def _legacy_summary(manifest: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    {"found", "packages": [{"name", "specifier", "version"}], "missing_versions", "duplicates"}
+    """
+    summary = {"found": manifest is not None, "packages": [], "missing_versions": [], "duplicates": []}
+    if manifest is None:
+        return summary
+    counts: Dict[str, int] = {}
+    for req in manifest["requirements"]:
+        if req["kind"] == "constraint":
             continue
-
-        match = VERSION_PATTERN.match(line)
+        match = SINGLE_CLAUSE_PATTERN.match(req["specifier"])
         if match:
-            name = match.group("name")
-            specifier = match.group("specifier") or ""
-            version = match.group("version") or ""
-            packages.append({
-                "name": name,
-                "specifier": specifier,
-                "version": version if version else None
-            })
-            name_counts[name] = name_counts.get(name, 0) + 1
-
-            if not version:
-                missing_versions.append(line)
+            specifier, version = match.group("specifier"), match.group("version")
         else:
-            packages.append({"name": line, "specifier": None, "version": None})
-            missing_versions.append(line)
-
-    for pkg_name, count in name_counts.items():
-        if count > 1:
-            duplicates.append(pkg_name)
-
-    return packages, missing_versions, duplicates
-
-def _parse_environment_yml(lines: List[str]) -> Tuple[List[dict], List[str], List[str]]:
-    packages = []
-    name_counts = {}
-    missing_versions = []
-    duplicates = []
-
-    in_deps = False
-    for line in lines:
-        if line.lower().startswith("dependencies:"):
-            in_deps = True
+            specifier, version = req["specifier"], None
+        summary["packages"].append({"name": req["name"], "specifier": specifier, "version": version})
+        counts[req["name"]] = counts.get(req["name"], 0) + 1
+        if not req["specifier"] and not req["url"]:
+            summary["missing_versions"].append(req["raw"])
+    summary["duplicates"] = [name for name, count in counts.items() if count > 1]
+    return summary
+
+def _dependency_usage(declared: List[Dict[str, Any]], import_graph: ImportGraph, root: str) -> Dict[str, Any]:
+    imported = import_graph.third_party_imports(under=root)
+    provided: Set[str] = set()
+    unused = []
+    for req in declared:
+        name = req["name"]
+        if name in NON_IMPORTABLE_PACKAGES or req["kind"] == "constraint":
             continue
-
-        if in_deps and line.startswith("- "):
-            pkg_line = line[2:].strip()
-            if pkg_line.startswith("pip:"):
-                continue
-
-            match = VERSION_PATTERN.match(pkg_line)
-            if match:
-                name = match.group("name")
-                specifier = match.group("specifier") or ""
-                version = match.group("version") or ""
-                packages.append({
-                    "name": name,
-                    "specifier": specifier,
-                    "version": version if version else None
-                })
-                name_counts[name] = name_counts.get(name, 0) + 1
-
-                if not version:
-                    missing_versions.append(pkg_line)
-            else:
-                packages.append({"name": pkg_line, "specifier": None, "version": None})
-                missing_versions.append(pkg_line)
-
-    for pkg_name, count in name_counts.items():
-        if count > 1:
-            duplicates.append(pkg_name)
-
-    return packages, missing_versions, duplicates
+        modules = _import_names(name)
+        provided.update(modules)
+        if not any(module in imported for module in modules) and name not in unused:
+            unused.append(name)
+
+    undeclared = [
+        {"module": module, "imported_at": [f"{path}:{line}" for path, line in locations[:5]]}
+        for module, locations in sorted(imported.items())
+        if module not in provided
+    ]
+    return {"unused": unused, "undeclared": undeclared}
+
+_installed_top_level: Optional[Dict[str, List[str]]] = None
+_installed_top_level_lock = threading.Lock()
+
+def _import_names(name: str) -> List[str]:
+    """
+    Top-level import names a distribution provides: from its installed metadata when
+    available, else the known exceptions table, else the name with '-' as '_'.
+    """
+    global _installed_top_level
+    if _installed_top_level is None:
+        # Sub-project scans call this from several threads; publish the map complete
+        with _installed_top_level_lock:
+            if _installed_top_level is None:
+                top_level: Dict[str, List[str]] = {}
+                for module, dists in _packages_distributions().items():
+                    for dist in dists:
+                        top_level.setdefault(canonical_name(dist), []).append(module)
+                _installed_top_level = top_level
+    names = set(_installed_top_level.get(name, ()))
+    names.update(KNOWN_IMPORT_NAMES.get(name, ()))
+    names.add(name.replace("-", "_"))
+    return sorted(names)
+
+def _packages_distributions() -> Dict[str, List[str]]:
+    """
+    {top-level module: [distribution names]}, like metadata.packages_distributions(),
+    which only exists on Python 3.10+. Older interpreters read each distribution's
+    top_level.txt, or infer the names from its RECORD files.
+    """
+    if hasattr(metadata, "packages_distributions"):
+        return metadata.packages_distributions()
+    mapping: Dict[str, List[str]] = {}
+    for dist in metadata.distributions():
+        name = dist.metadata.get("Name")
+        if not name:
+            continue
+        modules = (dist.read_text("top_level.txt") or "").split()
+        if not modules:
+            # pkg/__init__.py -> pkg, module.py -> module
+            modules = {
+                path.parts[0] if len(path.parts) > 1 else path.stem
+                for path in dist.files or [] if path.suffix == ".py"
+            }
+        for module in modules:
+            mapping.setdefault(module, []).append(name)
+    return mapping
@@ -1,16 +1,53 @@
 # src/utils/security_scanner.py
 
-import os
 import re
-from typing import Dict, Any
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
 
-def analyze_security(project_path: str) -> Dict[str, Any]:
+import numpy as np
+
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+# Files the high-entropy detector looks at, by extension or exact name.
+ENTROPY_SCAN_EXTENSIONS = (".py", ".env", ".yaml", ".yml", ".json", ".sh", ".bash", ".zsh")
+ENTROPY_SCAN_FILENAMES = (".env", ".envrc", ".bashrc", ".profile")
+
+# Candidate tokens: quoted string literals, plus unquoted values in KEY=value / key: value lines
+# (as found in .env, YAML and shell files).
+STRING_LITERAL_PATTERN = re.compile(
+    rb"""(?:"([^"\\\r\n]{16,512})"|'([^'\\\r\n]{16,512})'|(?:^|\s)[A-Za-z_][A-Za-z0-9_.-]*\s*[=:]\s*([^\s'"#]{16,512}))""",
+    re.MULTILINE
+)
+# Tokens made only of these characters look like keys/hashes rather than prose or paths.
+TOKEN_CHARSET_PATTERN = re.compile(rb"^[A-Za-z0-9+/=_\-]+$")
+
+BASE64_ENTROPY_THRESHOLD = 4.3
+HEX_ENTROPY_THRESHOLD = 3.0
+# Candidates are scored once their combined length reaches this many bytes
+ENTROPY_BATCH_BYTES = 1 << 20
+
+# Per-byte character class flags for the charset checks
+_DIGIT, _UPPER, _LOWER, _HEX_LETTER, _NOT_HEX = 1, 2, 4, 8, 16
+_BYTE_CLASSES = np.full(256, _NOT_HEX, dtype=np.uint8)
+_BYTE_CLASSES[ord("0"):ord("9") + 1] = _DIGIT
+_BYTE_CLASSES[ord("A"):ord("Z") + 1] = _UPPER | _NOT_HEX
+_BYTE_CLASSES[ord("a"):ord("z") + 1] = _LOWER | _NOT_HEX
+_BYTE_CLASSES[ord("A"):ord("F") + 1] = _UPPER | _HEX_LETTER
+_BYTE_CLASSES[ord("a"):ord("f") + 1] = _LOWER | _HEX_LETTER
+
+def analyze_security(project_path: str, fs: Optional[ProjectFS] = None) -> Dict[str, Any]:
     """
     'Security' checks for:
       - Hardcoded secrets (expanded regex for password, private_key, etc.)
       - Known insecure functions (eval, exec).
+      - High-entropy tokens (keys, tokens) in .py, .env, YAML, JSON and shell files,
+        regardless of the variable name they are assigned to. Lines already reported
+        as hardcoded secrets aren't reported again.
     """
+    fs = fs or LocalFS(project_path)
     issues = []
+    entropy_files = []
+    secret_lines = set()
 
     # Examples: 'api_key = "something"', 'secret = "something"', 'password = "secretPass"'
     secret_pattern = re.compile(
@@ -24,17 +61,21 @@ def analyze_security(project_path: str) -> Dict[str, Any]:
         re.IGNORECASE
     )
 
-    for root, dirs, files in os.walk(project_path):
+    for root, dirs, files in fs.walk():
         for filename in files:
-            # Check only .py files (could also check .env, .yaml, etc. if desired)
+            full_path = fs.join(root, filename)
+            if _is_entropy_candidate_file(filename):
+                entropy_files.append(full_path)
+
+            # Regex checks only apply to .py files
             if filename.endswith(".py"):
-                full_path = os.path.join(root, filename)
                 try:
-                    with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
+                    with fs.open(full_path, "r") as f:
                         lines = f.readlines()
                     for i, line in enumerate(lines, start=1):
                         # Check for secrets
                         if secret_pattern.search(line):
+                            secret_lines.add((full_path, i))
                             issues.append(f"{full_path} Line {i}: Potential hardcoded secret => {line.strip()}")
                         # Check for insecure functions
                         if insecure_func_pattern.search(line):
@@ -42,4 +83,125 @@ def analyze_security(project_path: str) -> Dict[str, Any]:
                 except OSError:
                     pass
 
-    return {"security_issues": issues}
+    high_entropy = [
+        finding for finding in find_high_entropy_strings(entropy_files, fs=fs)
+        if (finding["path"], finding["line"]) not in secret_lines
+    ]
+    for finding in high_entropy:
+        issues.append(
+            f"{finding['path']} Line {finding['line']}: High-entropy string "
+            f"(entropy={finding['entropy']:.2f}) => {finding['token']}"
+        )
+
+    return {"security_issues": issues, "high_entropy_strings": high_entropy}
+
+def find_high_entropy_strings(file_paths: List[str], fs: Optional[ProjectFS] = None) -> List[Dict[str, Any]]:
+    """
+    Extracts candidate string literals from each file buffer and scores them in batches
+    of about ENTROPY_BATCH_BYTES with vectorized Shannon entropy and charset statistics.
+
+    Returns a list of findings: {"path", "line", "token", "length", "entropy", "charset"},
+    where "token" is redacted so reports never carry the full secret.
+    """
+    open_file = fs.open if fs is not None else open
+    findings: List[Dict[str, Any]] = []
+    batch: List[bytes] = []
+    locations: List[Tuple[str, int]] = []
+    batch_bytes = 0
+
+    for path in file_paths:
+        try:
+            with open_file(path, "rb") as f:
+                buffer = f.read()
+        except OSError:
+            continue
+        for token, line_no in _extract_candidates(buffer):
+            batch.append(token)
+            locations.append((path, line_no))
+            batch_bytes += len(token)
+            if batch_bytes >= ENTROPY_BATCH_BYTES:
+                findings.extend(_score_batch(batch, locations))
+                batch, locations, batch_bytes = [], [], 0
+
+    if batch:
+        findings.extend(_score_batch(batch, locations))
+    return findings
+
+def _is_entropy_candidate_file(filename: str) -> bool:
+    return (
+        filename.endswith(ENTROPY_SCAN_EXTENSIONS)
+        or filename in ENTROPY_SCAN_FILENAMES
+        or filename.startswith(".env.")
+    )
+
+def _extract_candidates(buffer: bytes) -> List[Tuple[bytes, int]]:
+    """
+    Runs the literal pattern over the whole buffer at once (instead of line by line)
+    and maps match offsets back to 1-based line numbers.
+    """
+    line_starts = None
+    candidates = []
+    for match in STRING_LITERAL_PATTERN.finditer(buffer):
+        group = match.lastindex
+        token = match.group(group)
+        if not token or not TOKEN_CHARSET_PATTERN.match(token):
+            continue
+        if line_starts is None:
+            line_starts = [0] + [m.end() for m in re.finditer(rb"\n", buffer)]
+        candidates.append((token, bisect_right(line_starts, match.start(group))))
+    return candidates
+
+def _score_batch(tokens: List[bytes], locations: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """
+    Scores a batch of tokens in one pass over their concatenated bytes (see
+    _batch_entropy_stats).
+    """
+    entropy, is_hex, has_mixed = _batch_entropy_stats(tokens)
+    threshold = np.where(is_hex, HEX_ENTROPY_THRESHOLD, BASE64_ENTROPY_THRESHOLD)
+    # Require mixed character classes for base64-like tokens to skip long identifiers.
+    flagged = np.nonzero((entropy >= threshold) & (is_hex | has_mixed))[0]
+
+    findings = []
+    for idx in flagged:
+        path, line_no = locations[idx]
+        findings.append({
+            "path": path,
+            "line": line_no,
+            "token": _redact(tokens[idx].decode("ascii", errors="replace")),
+            "length": len(tokens[idx]),
+            "entropy": round(float(entropy[idx]), 4),
+            "charset": "hex" if is_hex[idx] else "base64"
+        })
+    return findings
+
+def _batch_entropy_stats(tokens: List[bytes]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (shannon_entropy_bits, is_hex, has_mixed_classes) arrays for a batch of tokens.
+
+    Works on the concatenated bytes only, so memory is O(total bytes): the distinct
+    (token, byte) pairs and their counts come from one sort, entropy per token is
+    log2(L) - sum(c * log2(c)) / L, and charset flags are OR-reduced per token.
+    """
+    n = len(tokens)
+    if not n:
+        return np.empty(0), np.empty(0, dtype=bool), np.empty(0, dtype=bool)
+    lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=n)
+    starts = np.cumsum(lengths) - lengths
+    flat = np.frombuffer(b"".join(tokens), dtype=np.uint8)
+
+    rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    pairs, counts = np.unique((rows << 8) | flat, return_counts=True)
+    weighted = np.bincount(pairs >> 8, weights=counts * np.log2(counts), minlength=n)
+    entropy = np.log2(lengths) - weighted / lengths
+
+    classes = np.bitwise_or.reduceat(_BYTE_CLASSES[flat], starts)
+    has_digit = (classes & _DIGIT) > 0
+    is_hex = ((classes & _NOT_HEX) == 0) & has_digit & ((classes & _HEX_LETTER) > 0)
+    has_upper, has_lower = (classes & _UPPER) > 0, (classes & _LOWER) > 0
+    has_mixed = has_digit.astype(int) + has_upper + has_lower >= 2
+    return entropy, is_hex, has_mixed
+
+def _redact(token: str) -> str:
+    if len(token) <= 8:
+        return "****"
+    return f"{token[:4]}...{token[-4:]}"
@@ -0,0 +1,165 @@
+# src/utils/subproject_scanner.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set
+
+from src.utils.ast_cache import AstCache
+from src.utils.dependency_resolver import DistributionIndex
+from src.utils.docker_scanner import analyze_docker_setup
+from src.utils.env_file_scanner import analyze_env_file
+from src.utils.import_graph import ImportGraph
+from src.utils.ml_scanner import analyze_ml_workflow
+from src.utils.requirements_scanner import analyze_requirements
+from src.utils.testing_scanner import analyze_testing_setup
+from src.utils.virtual_fs import LocalFS, ProjectFS, SubtreeFS
+
+# A directory holding any of these is treated as the root of a sub-project.
+SUBPROJECT_MARKERS = (
+    "requirements.txt", "environment.yml", "pyproject.toml", "setup.py", "setup.cfg",
+    "Pipfile", "Dockerfile", "compose.yaml", "compose.yml", "docker-compose.yaml", "docker-compose.yml",
+    "package.json"
+)
+# Markers below these directories (or any hidden one) belong to vendored packages or
+# virtualenvs, not to sub-projects of the repository.
+VENDORED_DIRECTORIES = frozenset({
+    "node_modules", "bower_components", "site-packages", "dist-packages", "venv",
+    "__pycache__"
+})
+
+def discover_subprojects(fs: ProjectFS) -> Dict[str, List[str]]:
+    """
+    Finds sub-project roots below fs.root from the shared inventory (no extra walk).
+    Returns {directory path: sorted list of marker files found there}; the project
+    root itself is not included, nor are directories inside VENDORED_DIRECTORIES,
+    hidden directories or virtualenvs (a pyvenv.cfg in an enclosing directory).
+    """
+    markers = set(SUBPROJECT_MARKERS)
+    found: Dict[str, List[str]] = {}
+    virtualenvs = set()
+    for entry in fs.inventory():
+        name = fs.basename(entry["path"])
+        if name == "pyvenv.cfg":
+            virtualenvs.add(fs.dirname(entry["path"]))
+        if name not in markers:
+            continue
+        directory = fs.dirname(entry["path"])
+        if directory != fs.root:
+            found.setdefault(directory, []).append(name)
+    return {
+        directory: sorted(names) for directory, names in sorted(found.items())
+        if not _is_vendored(fs, directory, virtualenvs)
+    }
+
+def _is_vendored(fs: ProjectFS, directory: str, virtualenvs: Set[str]) -> bool:
+    relative = directory[len(fs.root) + 1:]
+    prefix = fs.root
+    for part in relative.split(fs.sep):
+        prefix = fs.join(prefix, part)
+        if part in VENDORED_DIRECTORIES or part.startswith(".") or prefix in virtualenvs:
+            return True
+    return False
+
+def analyze_subprojects(
+    project_path: str,
+    fs: Optional[ProjectFS] = None,
+    max_workers: Optional[int] = None,
+    import_graph: Optional[ImportGraph] = None,
+    distribution_index: Optional[DistributionIndex] = None,
+    ast_cache: Optional[AstCache] = None
+) -> Dict[str, Any]:
+    """
+    Runs the root-oriented scanners (requirements, Docker, .env, ML workflow, testing)
+    on every discovered sub-project of a monorepo, in parallel, and rolls the results up.
+
+    Each sub-project is scanned through a SubtreeFS view of the shared inventory, so the
+    tree is still walked only once.
+
+    :param import_graph: Optional ImportGraph of the whole project, queried per sub-project;
+        built here if omitted.
+    :param ast_cache: Optional AstCache shared with the other scanners, so the ML
+        workflow scan of each sub-project reuses parsed trees; created here if omitted.
+    :param distribution_index: Optional DistributionIndex used to resolve every sub-project's
+        requirements (one is created and shared if omitted).
+    :param max_workers: Thread pool size (None = ThreadPoolExecutor default). Forced to 1
+        for filesystems that can't serve concurrent reads (archives, git revisions).
+    Returns {"subprojects": [per-sub-project reports], "summary": {...}}.
+    """
+    fs = fs or LocalFS(project_path)
+    subprojects = discover_subprojects(fs)
+    if not fs.thread_safe_reads:
+        max_workers = 1
+    if ast_cache is None:
+        ast_cache = AstCache(fs)
+    if import_graph is None:
+        import_graph = ImportGraph.build(fs, ast_cache)
+    distribution_index = distribution_index or DistributionIndex()
+
+    def scan(directory: str) -> Dict[str, Any]:
+        view = SubtreeFS(fs, directory)
+        return {
+            "path": directory,
+            "relative_path": directory[len(fs.root) + 1:],
+            "markers": subprojects[directory],
+            "requirements": analyze_requirements(
+                directory, fs=view, import_graph=import_graph, distribution_index=distribution_index
+            ),
+            "docker_setup": analyze_docker_setup(directory, fs=view),
+            "env_file": analyze_env_file(directory, fs=view),
+            "ml_workflow": analyze_ml_workflow(
+                directory, fs=view, ast_cache=ast_cache, import_graph=import_graph
+            ),
+            "testing": analyze_testing_setup(directory, fs=view, import_graph=import_graph)
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        reports = list(pool.map(scan, subprojects))
+
+    return {"subprojects": reports, "summary": _summarize(reports)}
+
+def _summarize(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {
+        "subproject_count": len(reports),
+        "with_requirements": 0,
+        "with_dockerfile": 0,
+        "with_env_file": 0,
+        "with_ml_folder": 0,
+        "unpinned_packages": 0,
+        "unused_dependencies": 0,
+        "undeclared_imports": 0,
+        "dependency_conflicts": 0,
+        "heavy_dependency_trees": 0,
+        "docker_issues": 0,
+        "potential_secrets": 0,
+        "test_frameworks": {"pytest": 0, "unittest": 0, "nose": 0, "tox": 0, "cypress": 0},
+        "without_tests": []
+    }
+    for report in reports:
+        requirements = report["requirements"]
+        if requirements["requirements_txt"]["found"] or requirements["environment_yml"]["found"]:
+            summary["with_requirements"] += 1
+        summary["unpinned_packages"] += (
+            len(requirements["requirements_txt"]["missing_versions"])
+            + len(requirements["environment_yml"]["missing_versions"])
+        )
+        summary["unused_dependencies"] += len(requirements["dependency_usage"]["unused"])
+        summary["undeclared_imports"] += len(requirements["dependency_usage"]["undeclared"])
+        resolution = requirements.get("dependency_resolution")
+        if resolution:
+            summary["dependency_conflicts"] += len(resolution["conflicts"])
+            summary["heavy_dependency_trees"] += len(resolution["heavy_trees"])
+        if report["docker_setup"]["dockerfile_found"]:
+            summary["with_dockerfile"] += 1
+        summary["docker_issues"] += len(report["docker_setup"]["docker_issues"])
+        if report["env_file"]["env_found"]:
+            summary["with_env_file"] += 1
+        summary["potential_secrets"] += len(report["env_file"]["potential_secrets"])
+        if report["ml_workflow"]["ml_folder_found"]:
+            summary["with_ml_folder"] += 1
+
+        testing = report["testing"]
+        frameworks = [name for name in ("pytest", "unittest", "nose", "tox", "cypress") if testing[f"{name}_found"]]
+        for name in frameworks:
+            summary["test_frameworks"][name] += 1
+        if not frameworks and not testing["test_directories"]:
+            summary["without_tests"].append(report["relative_path"])
+    return summary
@@ -1,9 +1,23 @@
 # src/utils/testing_scanner.py
 
-import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-def analyze_testing_setup(project_path: str) -> Dict[str, Any]:
+from src.utils.import_graph import ImportGraph
+from src.utils.virtual_fs import LocalFS, ProjectFS
+
+# Report key -> module whose import signals the framework
+FRAMEWORK_MODULES = {
+    "pytest_found": "pytest",
+    "unittest_found": "unittest",
+    "nose_found": "nose",
+    "tox_found": "tox"
+}
+
+def analyze_testing_setup(
+    project_path: str,
+    fs: Optional[ProjectFS] = None,
+    import_graph: Optional[ImportGraph] = None
+) -> Dict[str, Any]:
     """
     Scans for evidence of testing frameworks or coverage configs:
       - pytest usage
@@ -11,7 +25,10 @@ def analyze_testing_setup(project_path: str) -> Dict[str, Any]:
       - nose or tox (optional)
       - coverage config files
       - cypress folder & cypress config
+
+    :param import_graph: Optional ImportGraph shared with other scanners; built here if omitted.
     """
+    fs = fs or LocalFS(project_path)
     test_info = {
         "pytest_found": False,
         "unittest_found": False,
@@ -24,44 +41,45 @@ def analyze_testing_setup(project_path: str) -> Dict[str, Any]:
     }
 
     # 1) Check for cypress directory
-    cypress_dir = os.path.join(project_path, "cypress")
-    if os.path.isdir(cypress_dir):
+    cypress_dir = fs.join(fs.root, "cypress")
+    if fs.isdir(cypress_dir):
         test_info["cypress_found"] = True
         # Also check for cypress.json or cypress.config.js in root
-        cypress_json = os.path.join(project_path, "cypress.json")
-        cypress_config_js = os.path.join(project_path, "cypress.config.js")
-        if os.path.isfile(cypress_json) or os.path.isfile(cypress_config_js):
+        cypress_json = fs.join(fs.root, "cypress.json")
+        cypress_config_js = fs.join(fs.root, "cypress.config.js")
+        if fs.isfile(cypress_json) or fs.isfile(cypress_config_js):
             test_info["cypress_config_found"] = True
 
     # 2) Look for coverage files
     possible_coverage_files = ["coverage.xml", ".coveragerc", "coverage", "coverage-report"]
     for file_name in possible_coverage_files:
-        fp = os.path.join(project_path, file_name)
-        if os.path.exists(fp):
+        fp = fs.join(fs.root, file_name)
+        if fs.exists(fp):
             test_info["coverage_files"].append(file_name)
 
-    # 3) Walk project to detect usage of various test frameworks
-    for root, dirs, files in os.walk(project_path):
-        # If we see a directory named 'tests', record it
+    # 3) Record directories named 'tests' (from the shared inventory)
+    for root, dirs, files in fs.walk():
         if root.endswith("tests"):
             test_info["test_directories"].append(root)
 
-        for filename in files:
-            if filename.endswith(".py"):
-                full_path = os.path.join(root, filename)
-                try:
-                    with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                    # basic checks
-                    if "import pytest" in content:
-                        test_info["pytest_found"] = True
-                    if "import unittest" in content or "from unittest" in content:
-                        test_info["unittest_found"] = True
-                    if "import nose" in content or "from nose" in content:
-                        test_info["nose_found"] = True
-                    if "import tox" in content or "from tox" in content:
-                        test_info["tox_found"] = True
-                except OSError:
-                    pass
+    # 4) Framework usage from the import graph
+    if import_graph is None:
+        import_graph = ImportGraph.build(fs)
+    for key, module in FRAMEWORK_MODULES.items():
+        if import_graph.importers_of(module, under=fs.root):
+            test_info[key] = True
+
+    # Files that didn't parse fall back to plain text checks
+    for full_path in import_graph.unparsed_files:
+        if not full_path.startswith(fs.root):
+            continue
+        try:
+            with fs.open(full_path, "r") as f:
+                content = f.read()
+        except OSError:
+            continue
+        for key, module in FRAMEWORK_MODULES.items():
+            if f"import {module}" in content or f"from {module}" in content:
+                test_info[key] = True
 
     return test_info
@@ -0,0 +1,148 @@
+# src/utils/tree_walker.py
+
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional, Tuple
+
+# Filesystems where per-call latency dominates and concurrent directory reads pay off.
+NETWORK_FS_TYPES = {
+    "nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "afs", "ceph", "glusterfs",
+    "lustre", "fuse.sshfs", "fuse.s3fs", "fuse.gcsfuse"
+}
+
+def walk_tree(
+    root: str,
+    skip_dirs: Optional[List[str]] = None,
+    parallel: Optional[bool] = None,
+    max_workers: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Inventories every file under root with os.scandir, taking size, mtime, inode and
+    device from a single DirEntry.stat() per file.
+
+    :param skip_dirs: Directory names to skip anywhere in the tree (e.g. ['.git', 'node_modules']).
+    :param parallel: Scan directories concurrently on a thread pool. None = only when root
+        is on a network filesystem (NFS, SMB, ...).
+    :param max_workers: Thread pool size when scanning in parallel.
+    Returns (file_details, directories) where file_details is a list of
+    {"path", "size", "mtime_ns", "inode", "device"} and directories maps each directory
+    path to its own {"parent", "depth", "bytes", "files", "dirs", "errors", "first_file"}
+    (not yet rolled up).
+    """
+    skip = frozenset(skip_dirs or ())
+    if parallel is None:
+        parallel = is_network_filesystem(root)
+
+    file_details: List[Dict[str, Any]] = []
+    directories: Dict[str, Dict[str, Any]] = {}
+
+    def collect(result):
+        path, depth, files, subdirs, info = result
+        file_details.extend(files)
+        directories[path] = info
+        return [(sub, depth + 1, path) for sub in subdirs]
+
+    if not parallel:
+        stack = [(root, 0, None)]
+        while stack:
+            stack.extend(collect(_scan_directory(*stack.pop(), skip)))
+        return file_details, directories
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        pending = {pool.submit(_scan_directory, root, 0, None, skip)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for sub, depth, parent in collect(future.result()):
+                    pending.add(pool.submit(_scan_directory, sub, depth, parent, skip))
+    return file_details, directories
+
+def rollup_directories(directories: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Produces a du-style rollup: for each directory, the total bytes, file and directory
+    counts of its whole subtree, plus the deepest file path below it.
+    """
+    rollup = {}
+    for path, info in directories.items():
+        has_file = info["first_file"] is not None
+        rollup[path] = {
+            "bytes": info["bytes"],
+            "files": info["files"],
+            "dirs": info["dirs"],
+            "deepest_path": info["first_file"],
+            "deepest_depth": info["depth"] + 1 if has_file else -1
+        }
+
+    # Children before parents: fold each directory into its parent.
+    for path in sorted(directories, key=lambda p: directories[p]["depth"], reverse=True):
+        parent = directories[path]["parent"]
+        if parent is None or parent not in rollup:
+            continue
+        child, node = rollup[path], rollup[parent]
+        node["bytes"] += child["bytes"]
+        node["files"] += child["files"]
+        node["dirs"] += child["dirs"]
+        if child["deepest_depth"] > node["deepest_depth"]:
+            node["deepest_path"] = child["deepest_path"]
+            node["deepest_depth"] = child["deepest_depth"]
+    return rollup
+
+def is_network_filesystem(path: str) -> bool:
+    """
+    Checks /proc/mounts for the filesystem type backing path. Returns False where
+    that information isn't available.
+    """
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return False
+    real = os.path.realpath(path)
+    best_mount, best_type = "", ""
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (real == mount_point or real.startswith(mount_point.rstrip("/") + "/")) \
+                and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fs_type
+    return best_type in NETWORK_FS_TYPES
+
+def _scan_directory(path: str, depth: int, parent: Optional[str], skip: frozenset):
+    files: List[Dict[str, Any]] = []
+    subdirs: List[str] = []
+    info = {"parent": parent, "depth": depth, "bytes": 0, "files": 0, "dirs": 0,
+            "errors": 0, "first_file": None}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in skip:
+                        subdirs.append(entry.path)
+                        info["dirs"] += 1
+                    continue
+                if entry.is_symlink() and entry.is_dir():
+                    # Like os.walk: symlinked directories are neither files nor followed
+                    continue
+                info["files"] += 1
+                if info["first_file"] is None:
+                    info["first_file"] = entry.path
+                try:
+                    st = entry.stat()
+                except OSError:
+                    info["errors"] += 1
+                    files.append({"path": entry.path, "size": "Unknown (OS Error)"})
+                    continue
+                info["bytes"] += st.st_size
+                files.append({
+                    "path": entry.path,
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "inode": st.st_ino,
+                    "device": st.st_dev
+                })
+    except OSError:
+        info["errors"] += 1
+    return path, depth, files, subdirs, info
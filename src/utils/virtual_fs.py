@@ -0,0 +1,539 @@
+# src/utils/virtual_fs.py
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import posixpath
+import subprocess
+import tarfile
+import threading
+import zipfile
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from src.utils.tree_walker import walk_tree
+
+ZIP_EXTENSIONS = (".zip", ".whl", ".egg", ".jar")
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_EXTENSIONS = ZIP_EXTENSIONS + TAR_EXTENSIONS
+# Archives nested deeper than this are left as opaque files.
+MAX_NESTING_DEPTH = 3
+# Read buffer for streaming members out of archives.
+READ_BUFFER_SIZE = 256 * 1024
+# Members of compressed/nested tars up to this size are read into memory on open(), so
+# seeking inside them (e.g. to hash the tail) never rewinds the decompressor
+SPILL_MEMBER_BYTES = 8 * 1024 * 1024
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+def open_project_fs(
+    project_path: str,
+    skip_dirs: Optional[List[str]] = None,
+    parallel: Optional[bool] = None,
+    revision: Optional[str] = None
+) -> "ProjectFS":
+    """
+    Returns the filesystem view scanners should read the project through:
+    a LocalFS for a directory, an ArchiveFS for a zip/tar/wheel/sdist file, or a
+    GitRevisionFS when a revision of a git repository is requested.
+    """
+    if revision is not None:
+        return GitRevisionFS(project_path, revision, skip_dirs=skip_dirs)
+    if os.path.isdir(project_path):
+        return LocalFS(project_path, skip_dirs=skip_dirs, parallel=parallel)
+    if os.path.isfile(project_path) and is_archive(project_path):
+        return ArchiveFS(project_path, skip_dirs=skip_dirs)
+    raise ValueError(f"Provided path '{project_path}' is not a valid directory or archive.")
+
+class ProjectFS:
+    """
+    Read-only view of a project tree shared by all scanners in one analysis run.
+
+    The tree is inventoried once (scan()); walk(), listdir(), isfile() and isdir()
+    answer from that inventory so no scanner walks the tree again. Subclasses provide
+    the inventory, open() and stamp().
+    """
+
+    root: str
+    sep = "/"
+    # Whether open() may be called from several threads at once
+    thread_safe_reads = True
+
+    def __init__(self):
+        self._scan: Optional[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = None
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._children: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def scan(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Returns (file_details, directories) in tree_walker.walk_tree format, computed once.
+        """
+        if self._scan is None:
+            self._scan = self._build_inventory()
+            file_details, directories = self._scan
+            self._children = {path: ([], []) for path in directories}
+            for path, info in directories.items():
+                if info["parent"] in self._children:
+                    self._children[info["parent"]][0].append(self.basename(path))
+            for entry in file_details:
+                self._files[entry["path"]] = entry
+                parent = self.dirname(entry["path"])
+                if parent in self._children:
+                    self._children[parent][1].append(self.basename(entry["path"]))
+        return self._scan
+
+    def inventory(self) -> List[Dict[str, Any]]:
+        return self.scan()[0]
+
+    def walk(self, top: Optional[str] = None) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        os.walk-style (dirpath, dirnames, filenames) tuples, top-down, from the inventory.
+        """
+        self.scan()
+        stack = [top or self.root]
+        while stack:
+            dirpath = stack.pop()
+            if dirpath not in self._children:
+                continue
+            dirnames, filenames = self._children[dirpath]
+            yield dirpath, list(dirnames), list(filenames)
+            stack.extend(self.join(dirpath, d) for d in reversed(dirnames))
+
+    def iter_files(self, top: Optional[str] = None, suffix: Tuple[str, ...] = ("",)) -> Iterator[str]:
+        """
+        Yields the paths of all files under top (default: root) ending with suffix.
+        """
+        for dirpath, _, filenames in self.walk(top):
+            for filename in filenames:
+                if filename.endswith(suffix):
+                    yield self.join(dirpath, filename)
+
+    def isfile(self, path: str) -> bool:
+        self.scan()
+        return path in self._files
+
+    def isdir(self, path: str) -> bool:
+        self.scan()
+        return path in self._children
+
+    def exists(self, path: str) -> bool:
+        return self.isfile(path) or self.isdir(path)
+
+    def listdir(self, path: str) -> List[str]:
+        self.scan()
+        dirnames, filenames = self._children[path]
+        return dirnames + filenames
+
+    def getsize(self, path: str) -> int:
+        self.scan()
+        return self._files[path]["size"]
+
+    def read_bytes(self, path: str) -> bytes:
+        with self.open(path, "rb") as f:
+            return f.read()
+
+    def read_text(self, path: str) -> str:
+        with self.open(path, "r") as f:
+            return f.read()
+
+    def join(self, *parts: str) -> str:
+        return posixpath.join(*parts)
+
+    def dirname(self, path: str) -> str:
+        return posixpath.dirname(path)
+
+    def basename(self, path: str) -> str:
+        return posixpath.basename(path)
+
+    def open(self, path: str, mode: str = "r"):
+        raise NotImplementedError
+
+    def stamp(self, path: str) -> Tuple:
+        """
+        A value that changes whenever the file content may have changed.
+        """
+        raise NotImplementedError
+
+    def read_order(self, path: str) -> Tuple:
+        """
+        Sort key putting files in the cheapest order to read them one after another
+        (archive order for compressed archives). Defaults to no preference.
+        """
+        return ()
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ProjectFS":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _build_inventory(self) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        raise NotImplementedError
+
+class LocalFS(ProjectFS):
+    """
+    A project directory on disk, inventoried with tree_walker.walk_tree.
+    """
+
+    sep = os.sep
+
+    def __init__(self, root: str, skip_dirs: Optional[List[str]] = None, parallel: Optional[bool] = None):
+        super().__init__()
+        self.root = os.path.normpath(root)
+        self.skip_dirs = skip_dirs
+        self.parallel = parallel
+
+    def isfile(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def listdir(self, path: str) -> List[str]:
+        return os.listdir(path)
+
+    def getsize(self, path: str) -> int:
+        return os.path.getsize(path)
+
+    def join(self, *parts: str) -> str:
+        return os.path.join(*parts)
+
+    def dirname(self, path: str) -> str:
+        return os.path.dirname(path)
+
+    def basename(self, path: str) -> str:
+        return os.path.basename(path)
+
+    def open(self, path: str, mode: str = "r"):
+        if "b" in mode:
+            return open(path, mode)
+        return open(path, mode, encoding="utf-8", errors="ignore")
+
+    def stamp(self, path: str) -> Tuple:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+
+    def _build_inventory(self):
+        return walk_tree(self.root, skip_dirs=self.skip_dirs, parallel=self.parallel)
+
+class ArchiveFS(ProjectFS):
+    """
+    A zip/tar/wheel/sdist archive read in place: members are listed from the archive
+    index and streamed out on open(), with nothing extracted to disk. Archives inside
+    the archive are expanded as directories (up to MAX_NESTING_DEPTH levels), so
+    'outer.zip/vendor/inner.tar.gz/setup.py' is a regular path.
+
+    If every member sits under one top-level directory (typical for sdists and
+    GitHub zip downloads), root points at that directory.
+    """
+
+    thread_safe_reads = False
+
+    def __init__(self, archive_path: str, skip_dirs: Optional[List[str]] = None):
+        super().__init__()
+        self.archive_path = archive_path
+        self.skip_dirs = set(skip_dirs or ())
+        self.root = archive_path
+        # VFS path -> (container VFS path, member name, size, stamp)
+        self._members: Dict[str, Tuple[str, str, int, Tuple]] = {}
+        # VFS path -> (container rank, offset in container) for read_order()
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._handles: Dict[str, Any] = {}
+        # Tar containers that can only be read forward cheaply (compressed or nested)
+        self._sequential: set = set()
+        self._index_archive(archive_path, self._open_container(archive_path, None), 0)
+        self.root = self._single_top_level_dir() or archive_path
+
+    def open(self, path: str, mode: str = "r"):
+        container, name, size, _ = self._members[path]
+        raw = self._open_member(container, name, size)
+        if "b" in mode:
+            return raw
+        return io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+
+    def stamp(self, path: str) -> Tuple:
+        return self._members[path][3]
+
+    def read_order(self, path: str) -> Tuple:
+        return self._offsets.get(path, ())
+
+    def close(self) -> None:
+        for handle in reversed(list(self._handles.values())):
+            handle.close()
+        self._handles.clear()
+
+    def _build_inventory(self):
+        file_details = [
+            {"path": path, "size": size}
+            for path, (_, _, size, _) in self._members.items()
+            if path == self.root or path.startswith(self.root + "/")
+        ]
+        return file_details, synthesize_directories(self.root, file_details)
+
+    def _single_top_level_dir(self) -> Optional[str]:
+        tops = {path[len(self.archive_path) + 1:].split("/", 1)[0] for path in self._members}
+        if len(tops) != 1:
+            return None
+        top = tops.pop()
+        candidate = f"{self.archive_path}/{top}"
+        if candidate in self._members:
+            return None  # the single entry is a file
+        return candidate
+
+    def _open_container(self, vfs_path: str, parent: Optional[Tuple[str, str]]):
+        """
+        Opens (and keeps open) the zip/tar object for an archive at vfs_path; nested
+        archives are read from their parent's member stream.
+        """
+        handle = self._handles.get(vfs_path)
+        if handle is not None:
+            return handle
+        source = vfs_path if parent is None else self._open_member(*parent)
+        if vfs_path.lower().endswith(ZIP_EXTENSIONS):
+            handle = zipfile.ZipFile(source)
+        elif parent is None:
+            handle = tarfile.open(source, mode="r:*")
+        else:
+            handle = tarfile.open(fileobj=source, mode="r:*")
+        if isinstance(handle, tarfile.TarFile) and (
+            parent is not None or isinstance(handle.fileobj, (gzip.GzipFile, bz2.BZ2File, lzma.LZMAFile))
+        ):
+            # Seeking backwards in these re-decompresses from the start of the stream
+            self._sequential.add(vfs_path)
+        self._handles[vfs_path] = handle
+        return handle
+
+    def _open_member(self, container: str, name: str, size: Optional[int] = None):
+        handle = self._handles[container]
+        if isinstance(handle, zipfile.ZipFile):
+            return handle.open(name)
+        member = handle.extractfile(name)
+        if member is None:
+            raise OSError(f"{container}/{name} is not a regular file")
+        if container in self._sequential and size is not None and size <= SPILL_MEMBER_BYTES:
+            # One forward read; later seeks (head/tail hashing) stay in memory
+            return io.BytesIO(member.read())
+        return io.BufferedReader(member, buffer_size=READ_BUFFER_SIZE)
+
+    def _index_archive(self, vfs_path: str, handle, depth: int) -> None:
+        if isinstance(handle, zipfile.ZipFile):
+            members = [
+                (info.filename, info.file_size, (info.file_size, info.CRC))
+                for info in handle.infolist() if not info.is_dir()
+            ]
+        else:
+            members = [
+                (info.name, info.size, (info.size, info.mtime))
+                for info in handle.getmembers() if info.isfile()
+            ]
+        offsets = {} if isinstance(handle, zipfile.ZipFile) else {
+            info.name: info.offset_data for info in handle.getmembers()
+        }
+        rank = len(self._handles)
+
+        for name, size, stamp in members:
+            parts = [part for part in name.split("/") if part not in ("", ".")]
+            if self.skip_dirs.intersection(parts[:-1]):
+                continue
+            member_path = f"{vfs_path}/{'/'.join(parts)}"
+            if is_archive(name) and depth + 1 < MAX_NESTING_DEPTH:
+                try:
+                    nested = self._open_container(member_path, (vfs_path, name))
+                    self._index_archive(member_path, nested, depth + 1)
+                    continue
+                except (zipfile.BadZipFile, tarfile.TarError, OSError):
+                    self._handles.pop(member_path, None)  # not a readable archive: keep as a file
+            self._members[member_path] = (vfs_path, name, size, stamp)
+            self._offsets[member_path] = (rank, offsets.get(name, 0))
+
+class GitRevisionFS(ProjectFS):
+    """
+    A commit of a local git repository, read straight from the object store: the tree
+    comes from one `git ls-tree` call and blobs are streamed through a single long-lived
+    `git cat-file --batch` process. The working tree and index are never touched.
+
+    Paths look like those of a checkout (root is the repository directory). Blob SHAs
+    are exposed as each entry's "content_hash" and as the stamp, so content caches keyed
+    on the stamp (AstCache, CloneIndex) are reused for blobs unchanged between revisions.
+    """
+
+    # One batch pipe serves all reads, one request at a time
+    thread_safe_reads = False
+
+    def __init__(self, repo_path: str, revision: str, skip_dirs: Optional[List[str]] = None):
+        super().__init__()
+        self.root = os.path.abspath(repo_path)
+        self.skip_dirs = set(skip_dirs or ())
+        self.revision = revision
+        self.commit = self._git("rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}").decode().strip()
+        # VFS path -> (blob SHA, size)
+        self._blobs: Dict[str, Tuple[str, int]] = {}
+        self._batch: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._index_tree()
+
+    def open(self, path: str, mode: str = "r"):
+        data = io.BytesIO(self._read_blob(self._blobs[path][0]))
+        if "b" in mode:
+            return data
+        return io.TextIOWrapper(data, encoding="utf-8", errors="ignore")
+
+    def stamp(self, path: str) -> Tuple:
+        return ("git", self._blobs[path][0])
+
+    def close(self) -> None:
+        if self._batch is not None:
+            self._batch.stdin.close()
+            self._batch.wait()
+            self._batch.stdout.close()
+            self._batch = None
+
+    def _build_inventory(self):
+        file_details = [
+            {"path": path, "size": size, "content_hash": sha}
+            for path, (sha, size) in self._blobs.items()
+        ]
+        return file_details, synthesize_directories(self.root, file_details)
+
+    def _git(self, *args: str) -> bytes:
+        try:
+            result = subprocess.run(
+                ["git", "-C", self.root, *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            raise ValueError(f"Could not run git: {e}") from e
+        if result.returncode != 0:
+            message = result.stderr.decode("utf-8", "replace").strip() or "unknown revision"
+            raise ValueError(f"git {args[0]} failed for revision '{self.revision}' in '{self.root}': {message}")
+        return result.stdout
+
+    def _index_tree(self) -> None:
+        # <mode> SP <type> SP <sha> SP+ <size> TAB <path> NUL
+        listing = self._git("ls-tree", "-r", "-l", "-z", "--full-tree", self.commit)
+        for record in listing.split(b"\0"):
+            if not record:
+                continue
+            meta, name = record.split(b"\t", 1)
+            mode, obj_type, sha, size = meta.split()
+            # Skip submodules (commits) and symlinks (blobs holding a link target)
+            if obj_type != b"blob" or mode == b"120000":
+                continue
+            parts = name.decode("utf-8", "surrogateescape").split("/")
+            if self.skip_dirs.intersection(parts[:-1]):
+                continue
+            self._blobs[posixpath.join(self.root, *parts)] = (sha.decode(), int(size))
+
+    def _read_blob(self, sha: str) -> bytes:
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(
+                    ["git", "-C", self.root, "cat-file", "--batch"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE
+                )
+            self._batch.stdin.write(f"{sha}\n".encode())
+            self._batch.stdin.flush()
+            header = self._batch.stdout.readline().split()
+            if len(header) != 3:
+                raise OSError(f"git object {sha} is missing")
+            size = int(header[2])
+            data = self._batch.stdout.read(size)
+            self._batch.stdout.read(1)  # trailing newline
+            return data
+
+class SubtreeFS(ProjectFS):
+    """
+    A view of one directory of another ProjectFS, used to run root-oriented scanners on a
+    sub-project. It shares the parent's inventory and open handles, so creating it costs
+    nothing and closing it is a no-op; close the parent instead.
+    """
+
+    def __init__(self, parent: ProjectFS, root: str):
+        super().__init__()
+        self.parent = parent
+        self.root = root
+        self.sep = parent.sep
+        self.thread_safe_reads = parent.thread_safe_reads
+
+    def scan(self):
+        # Filtered once per view; the parent's inventory doesn't change after its scan
+        if self._scan is None:
+            file_details, directories = self.parent.scan()
+            prefix = self.root + self.sep
+            self._scan = (
+                [e for e in file_details if e["path"].startswith(prefix)],
+                {
+                    p: info for p, info in directories.items()
+                    if p == self.root or p.startswith(prefix)
+                }
+            )
+        return self._scan
+
+    def walk(self, top: Optional[str] = None):
+        return self.parent.walk(top or self.root)
+
+    def isfile(self, path: str) -> bool:
+        return self.parent.isfile(path)
+
+    def isdir(self, path: str) -> bool:
+        return self.parent.isdir(path)
+
+    def exists(self, path: str) -> bool:
+        return self.parent.exists(path)
+
+    def listdir(self, path: str) -> List[str]:
+        return self.parent.listdir(path)
+
+    def getsize(self, path: str) -> int:
+        return self.parent.getsize(path)
+
+    def join(self, *parts: str) -> str:
+        return self.parent.join(*parts)
+
+    def dirname(self, path: str) -> str:
+        return self.parent.dirname(path)
+
+    def basename(self, path: str) -> str:
+        return self.parent.basename(path)
+
+    def open(self, path: str, mode: str = "r"):
+        return self.parent.open(path, mode)
+
+    def stamp(self, path: str) -> Tuple:
+        return self.parent.stamp(path)
+
+def synthesize_directories(root: str, file_details: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds the walk_tree 'directories' structure for a virtual tree from its file list.
+    """
+    def new_dir(path: str) -> Dict[str, Any]:
+        depth = 0 if path == root else path[len(root) + 1:].count("/") + 1
+        parent = None if path == root else posixpath.dirname(path)
+        return {"parent": parent, "depth": depth, "bytes": 0, "files": 0, "dirs": 0,
+                "errors": 0, "first_file": None}
+
+    directories: Dict[str, Dict[str, Any]] = {root: new_dir(root)}
+    for entry in file_details:
+        parent = posixpath.dirname(entry["path"])
+        child = None
+        # Register any missing ancestor directories up to the root
+        while parent not in directories:
+            directories[parent] = new_dir(parent)
+            if child is not None:
+                directories[parent]["dirs"] += 1
+            child, parent = parent, posixpath.dirname(parent)
+        if child is not None:
+            directories[parent]["dirs"] += 1
+        info = directories[posixpath.dirname(entry["path"])]
+        info["files"] += 1
+        info["bytes"] += entry["size"]
+        if info["first_file"] is None:
+            info["first_file"] = entry["path"]
+    return directories
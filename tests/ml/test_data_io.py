@@ -0,0 +1,74 @@
+# tests/ml/test_data_io.py
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from ml.scripts.convert_dataset import convert_dataset
+from ml.scripts.data_io import detect_format, read_table, table_columns
+
+@pytest.fixture
+def csv_dataset(tmp_path):
+    path = tmp_path / "train.csv"
+    pd.DataFrame({
+        "feature1": [1, 2, 3, 4, 5],
+        "feature2": [0.5, 1.5, 2.5, 3.5, 4.5],
+        "unused": ["a", "b", "c", "d", "e"],
+        "label": [0, 1, 0, 1, 0]
+    }).to_csv(path, index=False)
+    return path
+
+def test_detect_format(tmp_path):
+    assert detect_format("data/train.parquet") == "parquet"
+    assert detect_format("data/train.feather") == "feather"
+    assert detect_format(str(tmp_path)) == "npy"
+    assert detect_format("data/train.bin", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("data/train.bin")
+
+def test_csv_projection_and_schema(csv_dataset):
+    frame = read_table(str(csv_dataset), ["feature1", "label"], schema={"feature1": "float32", "unused": "str"})
+
+    assert list(frame.columns) == ["feature1", "label"]
+    assert frame["feature1"].dtype == np.float32
+
+def test_convert_to_npy_columns(csv_dataset, tmp_path):
+    """
+    The converter streams chunks into memory-mapped column files and records their schema.
+    """
+    output = tmp_path / "train_npy"
+    result = convert_dataset(str(csv_dataset), str(output), columns=["feature1", "label"], output_format="npy", chunk_size=2)
+
+    assert result["rows"] == 5
+    assert sorted(table_columns(str(output))) == ["feature1", "label"]
+    assert json.loads((output / "_schema.json").read_text()) == {"feature1": "int64", "label": "int64"}
+    assert isinstance(np.load(output / "feature1.npy", mmap_mode="r"), np.memmap)
+    assert read_table(str(output), ["feature1"])["feature1"].tolist() == [1, 2, 3, 4, 5]
+
+def test_convert_rejects_text_columns_for_npy(csv_dataset, tmp_path):
+    with pytest.raises(ValueError, match="numeric"):
+        convert_dataset(str(csv_dataset), str(tmp_path / "out_npy"), output_format="npy")
+
+def test_update_config_declares_format_only_when_all_converted(csv_dataset, tmp_path, monkeypatch):
+    from ml.scripts import convert_dataset as converter
+
+    config_path = tmp_path / "dataset_config.json"
+    config = {
+        "features": ["feature1", "feature2"],
+        "target": "label",
+        "train_data_path": str(csv_dataset),
+        "test_data_path": str(tmp_path / "missing.csv"),
+        "format": "csv"
+    }
+    config_path.write_text(json.dumps(config))
+    argv = ["convert_dataset.py", "--to", "npy", "--config", str(config_path), "--update-config"]
+    monkeypatch.setattr("sys.argv", argv)
+
+    converter.main()
+
+    updated = json.loads(config_path.read_text())
+    assert updated["train_data_path"] == str(tmp_path / "train_npy")
+    assert updated["test_data_path"] == str(tmp_path / "missing.csv")
+    assert "format" not in updated
+    assert detect_format(updated["train_data_path"], updated.get("format")) == "npy"
+    assert detect_format(updated["test_data_path"], updated.get("format")) == "csv"
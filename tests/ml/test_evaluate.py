@@ -111,3 +111,66 @@ def test_evaluate_script_with_scaler(mock_evaluate_data, monkeypatch, capsys):
     )
 
     print("Test evaluate_script_with_scaler passed.")
+
+@patch("sys.argv", ["evaluate.py"])
+def test_evaluate_streaming_mode(mock_evaluate_data, monkeypatch, capsys):
+    """
+    Streaming mode accumulates confusion counts chunk by chunk and writes a JSON report
+    with bootstrap confidence intervals and per-chunk predict latency.
+    """
+    import json
+    model_cfg = mock_evaluate_data / "ml" / "config" / "model_config.json"
+    model_cfg.write_text("""{
+        "save_path": "ml/models/trained_model.joblib",
+        "evaluation": {"mode": "streaming", "chunk_size": 1, "bootstrap_samples": 200,
+                       "output_path": "ml/reports/evaluation.json"}
+    }""")
+
+    monkeypatch.chdir(mock_evaluate_data)
+    evaluate_main()
+
+    captured = capsys.readouterr().out
+    assert "Test Accuracy:" in captured and "95% CI" in captured
+    report = json.loads((mock_evaluate_data / "ml" / "reports" / "evaluation.json").read_text())
+    assert report["rows"] == 2 and report["latency"]["chunks"] == 2
+    assert sum(map(sum, report["confusion_matrix"])) == 2
+    ci = report["confidence_intervals"]["accuracy"]
+    assert 0.0 <= ci["low"] <= report["metrics"]["accuracy"] <= ci["high"] <= 1.0
+
+def test_macro_metrics_count_labels_that_are_only_predicted():
+    import numpy as np
+    from sklearn.metrics import precision_recall_fscore_support
+    from ml.scripts.evaluate import summary_metrics
+
+    y_true = np.array([0, 0, 1, 1])
+    y_pred = np.array([0, 2, 1, 1])
+    # Label 3 is a model class that occurs in neither y_true nor y_pred
+    matrix = np.zeros((4, 4), dtype=np.int64)
+    np.add.at(matrix, (y_true, y_pred), 1)
+
+    metrics = summary_metrics(matrix[None])
+    expected = precision_recall_fscore_support(y_true, y_pred, average="macro", zero_division=0)
+    assert np.allclose(
+        [metrics["macro_precision"][0], metrics["macro_recall"][0], metrics["macro_f1"][0]],
+        expected[:3]
+    )
+    assert np.allclose(expected[:3], [2 / 3, 0.5, 5 / 9])
+
+def test_bootstrap_from_counts_matches_metrics_and_parallelizes():
+    import numpy as np
+    from sklearn.metrics import f1_score
+    from ml.scripts.evaluate import bootstrap_confidence_intervals, summary_metrics
+
+    y_true = np.array([0] * 50 + [1] * 30 + [2] * 20)
+    y_pred = np.array([0] * 45 + [1] * 5 + [1] * 25 + [2] * 5 + [2] * 15 + [0] * 5)
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    np.add.at(matrix, (y_true, y_pred), 1)
+
+    metrics = summary_metrics(matrix[None])
+    assert abs(metrics["macro_f1"][0] - f1_score(y_true, y_pred, average="macro")) < 1e-12
+    assert abs(metrics["weighted_f1"][0] - f1_score(y_true, y_pred, average="weighted")) < 1e-12
+
+    serial = bootstrap_confidence_intervals(matrix, n_samples=400, workers=1)
+    parallel = bootstrap_confidence_intervals(matrix, n_samples=400, workers=2)
+    for result in (serial, parallel):
+        assert result["accuracy"]["low"] < 0.85 < result["accuracy"]["high"]
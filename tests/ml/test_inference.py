@@ -105,3 +105,54 @@ def test_inference_with_scaler(mock_inference_data, monkeypatch, capsys):
     )
     assert "Inference Results:" in captured, "Expected inference results prompt was not found."
     print("Test inference_with_scaler passed.")
+
+@patch("sys.argv", ["inference.py"])
+def test_inference_batch_mode(mock_inference_data, monkeypatch, capsys):
+    """
+    Batch mode streams new_data.csv in chunks and writes predictions (and probabilities)
+    to a CSV instead of printing one line per row.
+    """
+    model_cfg = mock_inference_data / "ml" / "config" / "model_config.json"
+    model_cfg.write_text("""{
+        "save_path": "ml/models/trained_model.joblib",
+        "inference": {
+            "mode": "batch",
+            "output_path": "data/processed/predictions.csv",
+            "chunk_size": 1,
+            "probabilities": true
+        }
+    }""")
+
+    monkeypatch.chdir(mock_inference_data)
+    inference_main()
+
+    captured = capsys.readouterr().out
+    assert "Predictions for 2 rows written to data/processed/predictions.csv" in captured
+    assert "rows/s over 2 batches" in captured
+    assert "Row 0:" not in captured
+
+    predictions = pd.read_csv(mock_inference_data / "data" / "processed" / "predictions.csv")
+    assert predictions["row"].tolist() == [0, 1]
+    assert list(predictions.columns) == ["row", "prediction", "proba_0", "proba_1"]
+
+def test_run_batch_inference_process_pool(mock_inference_data):
+    """
+    With workers > 1 the chunks are scored on a process pool; output order is preserved.
+    """
+    from ml.scripts.inference import run_batch_inference
+
+    root = mock_inference_data
+    pd.DataFrame({"feature1": range(7), "feature2": range(7), "feature3": range(7)}).to_csv(
+        root / "data" / "processed" / "big.csv", index=False
+    )
+    report = run_batch_inference(
+        str(root / "ml" / "models" / "trained_model.joblib"),
+        str(root / "data" / "processed" / "big.csv"),
+        str(root / "out" / "predictions.csv"),
+        ["feature1", "feature2", "feature3"],
+        chunk_size=2,
+        workers=2
+    )
+
+    assert report["rows"] == 7 and report["batches"] == 4
+    assert pd.read_csv(root / "out" / "predictions.csv")["row"].tolist() == list(range(7))
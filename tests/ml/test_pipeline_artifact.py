@@ -0,0 +1,55 @@
+# tests/ml/test_pipeline_artifact.py
+
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from ml.scripts.pipeline_artifact import load_pipeline, save_pipeline
+
+@pytest.fixture
+def fitted(tmp_path):
+    X = np.array([[0.0, 1.0], [1.0, 0.0], [5.0, 6.0], [6.0, 5.0]])
+    y = [0, 0, 1, 1]
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), y)
+    return tmp_path, scaler, model
+
+def test_round_trip_is_memory_mapped(fitted):
+    """
+    The artifact bundles scaler, model and features, and its arrays come back memory-mapped.
+    """
+    tmp_path, scaler, model = fitted
+    path = str(tmp_path / "pipeline.joblib")
+    manifest = save_pipeline(model, scaler, ["a", "b"], path, target="label")
+
+    assert manifest["version"] == 1 and len(manifest["sha256"]) == 64
+    pipeline = load_pipeline(path, verify=True)
+    assert pipeline["features"] == ["a", "b"]
+    assert isinstance(pipeline["model"].coef_, np.memmap)
+    assert isinstance(pipeline["scaler"].mean_, np.memmap)
+    np.testing.assert_allclose(pipeline["model"].coef_, model.coef_)
+
+def test_tampered_artifact_is_rejected(fitted):
+    tmp_path, scaler, model = fitted
+    path = tmp_path / "pipeline.joblib"
+    save_pipeline(model, scaler, ["a", "b"], str(path))
+
+    data = bytearray(path.read_bytes())
+    data[-2] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="checksum"):
+        load_pipeline(str(path), verify=True)
+
+def test_legacy_model_and_scaler_files(fitted):
+    """
+    Plain estimators dumped by older train.py versions still load, with the separate scaler.
+    """
+    tmp_path, scaler, model = fitted
+    dump(model, tmp_path / "model.joblib")
+    dump(scaler, tmp_path / "scaler.joblib")
+
+    pipeline = load_pipeline(str(tmp_path / "model.joblib"), legacy_scaler_path=str(tmp_path / "scaler.joblib"))
+    assert pipeline["version"] == 0 and pipeline["features"] is None
+    assert pipeline["scaler_path"] == str(tmp_path / "scaler.joblib")
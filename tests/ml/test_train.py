@@ -116,17 +116,172 @@ def test_train_script_with_scaler(mock_data, monkeypatch, capsys):
     monkeypatch.chdir(mock_data)
     train_main()
 
-    # 3. Assertions
+    # 3. Assertions: the scaler is saved inside the single pipeline artifact
     model_dir = mock_data / "ml" / "models"
     assert model_dir.exists()
-    joblib_files = list(model_dir.glob("*.joblib"))
-    assert len(joblib_files) >= 2, (
-        "Expected both a model and a scaler .joblib file (2+) when using StandardScaler."
-    )
+    assert (model_dir / "trained_model.joblib.json").exists(), "Expected the artifact manifest."
+
+    from ml.scripts.pipeline_artifact import load_pipeline
+    pipeline = load_pipeline(str(model_dir / "trained_model.joblib"), verify=True)
+    assert pipeline["scaler"] is not None, "Expected the scaler inside the pipeline artifact."
+    assert pipeline["features"] == ["feature1", "feature2", "feature3"]
 
     captured = capsys.readouterr().out
-    assert "scaler saved to ml/models/scaler.joblib" in captured, (
+    assert "scaler included" in captured, (
         "Expected mention of scaler saving but did not find it."
     )
 
     print("Test train_script_with_scaler passed.")
+
+
+@patch("sys.argv", ["train.py"])
+def test_train_script_out_of_core(mock_data, monkeypatch, capsys):
+    """
+    Out-of-core mode streams train.csv in chunks through partial_fit (scaler and model).
+    """
+    model_config_path = mock_data / "ml" / "config" / "model_config.json"
+    model_config_path.write_text("""{
+        "model_type": "SGDClassifier",
+        "hyperparameters": {"random_state": 42},
+        "scaler": {"type": "StandardScaler"},
+        "training": {"mode": "out_of_core", "chunk_size": 2, "epochs": 3, "validation_fraction": 0.4},
+        "save_path": "ml/models/trained_model.joblib"
+    }""")
+
+    monkeypatch.chdir(mock_data)
+    train_main()
+
+    captured = capsys.readouterr().out
+    assert "Training complete." in captured
+    assert "scaler included" in captured
+
+    from ml.scripts.pipeline_artifact import load_pipeline
+    scaler = load_pipeline(str(mock_data / "ml" / "models" / "trained_model.joblib"))["scaler"]
+    assert scaler.n_samples_seen_ < 5  # validation rows are held out of the scaler too
+
+
+def test_iter_chunks_memory_mapped_columns(tmp_path):
+    """
+    A directory of '<column>.npy' files is read through memory maps, chunk by chunk.
+    """
+    import numpy as np
+    from ml.scripts.train import iter_chunks
+
+    np.save(tmp_path / "feature1.npy", np.arange(5, dtype=np.float32))
+    np.save(tmp_path / "label.npy", np.array([0, 1, 0, 1, 0]))
+
+    chunks = list(iter_chunks(str(tmp_path), ["feature1", "label"], 2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert chunks[2]["feature1"].tolist() == [4.0]
+
+
+@patch("sys.argv", ["train.py"])
+def test_train_out_of_core_rejects_batch_only_models(mock_data, monkeypatch):
+    model_config_path = mock_data / "ml" / "config" / "model_config.json"
+    model_config_path.write_text("""{
+        "model_type": "RandomForestClassifier",
+        "training": {"mode": "out_of_core"},
+        "save_path": "ml/models/trained_model.joblib"
+    }""")
+
+    monkeypatch.chdir(mock_data)
+    with pytest.raises(ValueError, match="incremental learning"):
+        train_main()
+
+
+@patch("sys.argv", ["train.py"])
+def test_train_script_from_npy_columns(mock_data, monkeypatch, capsys):
+    """
+    dataset_config can point at an npy column directory; only features and target are read.
+    """
+    from ml.scripts.convert_dataset import convert_dataset
+
+    npy_dir = mock_data / "data" / "processed" / "train_npy"
+    convert_dataset(str(mock_data / "data" / "processed" / "train.csv"), str(npy_dir), output_format="npy")
+    dataset_cfg = mock_data / "ml" / "config" / "dataset_config.json"
+    dataset_cfg.write_text(f"""{{
+        "train_data_path": "{npy_dir}",
+        "format": "npy",
+        "schema": {{"feature1": "float32"}},
+        "features": ["feature1", "feature2", "feature3"],
+        "target": "label"
+    }}""")
+
+    monkeypatch.chdir(mock_data)
+    train_main()
+
+    assert "Model saved to ml/models/trained_model.joblib" in capsys.readouterr().out
+
+
+@patch("sys.argv", ["train.py"])
+def test_train_script_search_mode(mock_data, monkeypatch, capsys):
+    """
+    Search mode cross-validates every candidate on cached folds in parallel, records
+    per-candidate fit times, then refits the best one.
+    """
+    import json
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 3))
+    pd.DataFrame({
+        "feature1": X[:, 0], "feature2": X[:, 1], "feature3": X[:, 2],
+        "label": (X[:, 0] + X[:, 1] > 0).astype(int)
+    }).to_csv(mock_data / "data" / "processed" / "train.csv", index=False)
+
+    model_config_path = mock_data / "ml" / "config" / "model_config.json"
+    model_config_path.write_text("""{
+        "model_type": "RandomForestClassifier",
+        "hyperparameters": {"random_state": 42},
+        "scaler": {"type": "StandardScaler"},
+        "training": {"mode": "search"},
+        "search": {
+            "strategy": "halving",
+            "param_grid": {"n_estimators": [5, 20], "max_depth": [1, 2, null]},
+            "cv": 3, "n_jobs": 2, "factor": 2,
+            "results_path": "ml/reports/search_results.json"
+        },
+        "save_path": "ml/models/trained_model.joblib"
+    }""")
+
+    monkeypatch.chdir(mock_data)
+    train_main()
+
+    captured = capsys.readouterr().out
+    assert "Best parameters:" in captured and "Validation Score:" in captured
+    results = json.loads((mock_data / "ml" / "reports" / "search_results.json").read_text())
+    rounds = [c["round"] for c in results["candidates"]]
+    assert rounds.count(0) == 6 and max(rounds) >= 1
+    assert all(c["fit_seconds"] > 0 for c in results["candidates"])
+
+
+def test_search_early_stopping_and_strategies():
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from ml.scripts.hyperparameter_search import run_search
+
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(90, 2))
+    y = (X[:, 0] > 0).astype(int)
+
+    settings = {"param_grid": {"C": [1.0, 1e-6, 1e-6, 1e-6]}, "cv": 3, "n_jobs": 1,
+                "early_stopping": {"tolerance": 0.05, "min_folds": 1}}
+    grid = run_search(LogisticRegression(), X, y, settings, use_scaler=True)
+    assert grid["best_params"] == {"C": 1.0}
+    assert sum(c["stopped_early"] for c in grid["candidates"]) >= 1
+
+    random = run_search(LogisticRegression(), X, y, {**settings, "strategy": "random", "n_iter": 2}, use_scaler=False)
+    assert len(random["candidates"]) == 2
+
+
+def test_halving_rounds_use_exact_powers():
+    from ml.scripts.hyperparameter_search import _halving_rounds
+
+    # math.log(125, 5) == 3.0000000000000004 used to add a fourth halving step
+    assert _halving_rounds(125, 5) == 4
+    assert _halving_rounds(126, 5) == 5
+    assert _halving_rounds(243, 3) == 6
+    assert _halving_rounds(1, 3) == 1
+    assert _halving_rounds(2, 3) == 2
+    with pytest.raises(ValueError):
+        _halving_rounds(4, 1)
@@ -0,0 +1,104 @@
+# tests/test_compose_analyzer.py
+
+from src.utils.compose_analyzer import analyze_compose, find_compose_files
+from src.utils.docker_scanner import analyze_docker_setup
+from src.utils.virtual_fs import LocalFS
+
+COMPOSE = """\
+services:
+  web:
+    build: .
+    depends_on:
+      - db
+      - cache
+    volumes:
+      - .:/srv/app
+      - uploads:/srv/uploads
+    deploy:
+      resources:
+        limits:
+          cpus: "1.0"
+          memory: 512M
+  worker:
+    image: app-worker
+    depends_on:
+      db:
+        condition: service_healthy
+    volumes:
+      - uploads:/srv/uploads
+      - ${DATA_DIR:-./data}:/data:ro
+  db:
+    image: postgres:16
+    healthcheck:
+      test: ["CMD", "pg_isready"]
+  cache:
+    image: redis:7
+volumes:
+  uploads:
+"""
+
+OVERRIDE = """\
+services:
+  worker:
+    mem_limit: 256m
+"""
+
+
+def _project(tmp_path):
+    (tmp_path / "compose.yaml").write_text(COMPOSE)
+    (tmp_path / "compose.override.yaml").write_text(OVERRIDE)
+    (tmp_path / "Dockerfile").write_text("FROM python:3.11-slim\nHEALTHCHECK CMD curl -f http://localhost/\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "lib.js").write_text("x")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "rows.csv").write_text("a,b\n")
+    return LocalFS(str(tmp_path))
+
+
+def test_compose_findings(tmp_path):
+    fs = _project(tmp_path)
+    assert [p.rsplit("/", 1)[1] for p in find_compose_files(fs)] == ["compose.yaml", "compose.override.yaml"]
+
+    analysis = analyze_compose(fs)
+    services = {s["name"]: s for s in analysis["services"]}
+    assert services["web"]["line"] == 2 and services["web"]["healthcheck"]
+    assert services["worker"]["limits"] == {"cpus": None, "memory": "256m"}
+    assert services["worker"]["volumes"][1]["path"] == str(tmp_path / "data")
+
+    found = {(f["type"], f["service"]) for f in analysis["findings"]}
+    assert ("dependency_without_healthcheck", "web") in found  # cache has no healthcheck
+    assert ("depends_on_not_healthy", "web") in found  # db has one, web doesn't wait for it
+    assert not any(t == "depends_on_not_healthy" and s == "worker" for t, s in found)
+    assert ("large_bind_mount", "web") in found  # '.' includes node_modules
+    assert ("missing_cpu_limit", "worker") in found
+    assert ("missing_memory_limit", "worker") not in found
+    assert ("shared_writable_volume", "web") in found
+    assert analysis["shared_volumes"] == [
+        {"source": "uploads", "type": "volume", "services": ["web", "worker"], "writers": ["web", "worker"]}
+    ]
+
+
+def test_docker_scanner_reads_compose_yaml(tmp_path):
+    _project(tmp_path)
+    results = analyze_docker_setup(str(tmp_path))
+
+    assert results["docker_compose_found"]
+    assert len(results["compose_files"]) == 2
+    assert any("compose.yaml line 15" in issue and "CPU limit" in issue for issue in results["docker_issues"])
+
+
+def test_unreadable_dockerfile_counts_as_no_healthcheck(tmp_path):
+    fs = _project(tmp_path)
+    open_file = fs.open
+
+    def failing_open(path, mode="r"):
+        if path.endswith("Dockerfile"):
+            raise PermissionError(13, "Permission denied", path)
+        return open_file(path, mode)
+
+    fs.open = failing_open
+
+    analysis = analyze_compose(fs)
+
+    services = {s["name"]: s for s in analysis["services"]}
+    assert not services["web"]["healthcheck"]
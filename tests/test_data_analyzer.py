@@ -0,0 +1,135 @@
+# tests/test_data_analyzer.py
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.modules.correlation import blocked_correlations, correlations_to_dict
+from src.modules.data_analyzer import analyze_data, analyze_data_streaming
+from src.modules.data_profile import DataProfile, KLLSketch
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 20000
+    df = pd.DataFrame({
+        "a": rng.normal(5, 2, n),
+        "b": rng.exponential(1, n),
+        "label": rng.choice(["x", "y"], n)
+    })
+    df["c"] = df["a"] * 0.5 + rng.normal(0, 1, n)
+    df.loc[rng.random(n) < 0.1, "a"] = np.nan
+    df.loc[rng.random(n) < 0.05, "c"] = np.nan
+    return df
+
+
+def _chunks(df, size=1500):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+def test_streaming_matches_in_memory_analysis(frame):
+    expected = analyze_data(frame, correlation_mode="full")
+
+    result = analyze_data_streaming(_chunks(frame), correlation_mode="full")
+
+    assert result["row_count"] == expected["row_count"]
+    assert result["columns"] == expected["columns"]
+    assert result["missing_values"] == expected["missing_values"]
+    for column, stats in expected["numeric_summary"].items():
+        streamed = result["numeric_summary"][column]
+        for key in ("count", "mean", "std", "min", "max"):
+            assert streamed[key] == pytest.approx(stats[key], rel=1e-9)
+        for key in ("25%", "50%", "75%"):
+            # Approximate: within ~2% of the rank range
+            rank = (frame[column].dropna() <= streamed[key]).mean()
+            assert abs(rank - float(key[:-1]) / 100) < 0.02
+    assert np.allclose(
+        pd.DataFrame(result["correlation_matrix"]).values,
+        pd.DataFrame(expected["correlation_matrix"]).values,
+        atol=1e-10
+    )
+
+
+def test_merged_profiles_equal_single_pass(frame):
+    single = DataProfile().update(frame).result()
+    halves = DataProfile().update(frame.iloc[:7000]).merge(DataProfile(seed=1).update(frame.iloc[7000:])).result()
+
+    assert halves["missing_values"] == single["missing_values"]
+    for column in ("a", "b", "c"):
+        assert halves["numeric_summary"][column]["mean"] == pytest.approx(single["numeric_summary"][column]["mean"])
+        assert halves["numeric_summary"][column]["std"] == pytest.approx(single["numeric_summary"][column]["std"])
+
+
+def test_streaming_csv_in_parallel(frame, tmp_path):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    result = analyze_data_streaming(
+        str(path), chunk_size=4000, workers=2, columns=["a", "c"], correlation_mode="full"
+    )
+
+    assert result["columns"] == ["a", "c"]
+    assert result["row_count"] == len(frame)
+    assert result["numeric_summary"]["a"]["mean"] == pytest.approx(frame["a"].mean())
+    assert result["correlation_matrix"]["a"]["c"] == pytest.approx(frame["a"].corr(frame["c"]))
+
+
+def test_kll_sketch_memory_is_bounded():
+    sketch = KLLSketch(k=100, seed=0)
+    values = np.random.default_rng(1).random(200000)
+    for start in range(0, len(values), 10000):
+        sketch.update(values[start:start + 10000])
+
+    assert sum(len(level) for level in sketch.levels) < 400
+    assert sketch.quantiles([0.5])[0] == pytest.approx(0.5, abs=0.03)
+
+
+def test_compact_correlations_keep_top_pairs(frame):
+    full = frame.select_dtypes(include=[np.number]).corr()
+
+    compact = analyze_data(frame, correlation_top_k=1)["correlations"]
+
+    assert compact["columns"] == ["a", "b", "c"]
+    assert all(isinstance(value, float) for value in compact["value"])
+    assert correlations_to_dict(compact)["a"] == {"c": pytest.approx(full.loc["a", "c"], abs=1e-5)}
+    assert correlations_to_dict(compact)["b"].keys() <= {"a", "c"}
+    streamed = analyze_data_streaming(_chunks(frame), correlation_top_k=1)["correlations"]
+    assert correlations_to_dict(streamed)["a"] == {"c": pytest.approx(full.loc["a", "c"], abs=1e-5)}
+
+
+def test_blocked_correlations_match_full_matrix():
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(500, 40))
+    values[:, 7] = values[:, 3] * 2 + rng.normal(size=500) * 0.1
+    values[rng.random(values.shape) < 0.05] = np.nan
+    expected = pd.DataFrame(values).corr().to_numpy()
+
+    compact = blocked_correlations(values, [str(i) for i in range(40)], top_k=None, threshold=0.2, block_size=16)
+
+    assert len(compact["value"]) == int(((np.abs(expected) >= 0.2) & ~np.eye(40, dtype=bool)).sum())
+    assert np.allclose(compact["value"], expected[compact["row"], compact["col"]], atol=1e-5)
+    assert {(3, 7), (7, 3)} <= set(zip(compact["row"], compact["col"]))
+
+
+def test_default_result_is_json_serializable(frame):
+    result = analyze_data(frame)
+    streamed = analyze_data_streaming(_chunks(frame))
+
+    assert json.loads(json.dumps(result))["correlations"]["columns"] == ["a", "b", "c"]
+    assert json.loads(json.dumps(streamed))["correlations"] == streamed["correlations"]
+
+
+def test_streaming_rejects_bad_correlation_mode_before_reading(frame, tmp_path):
+    consumed = []
+
+    def chunks():
+        consumed.append(True)
+        yield frame
+
+    with pytest.raises(ValueError, match="correlation mode"):
+        analyze_data_streaming(chunks(), correlation_mode="pearson")
+    with pytest.raises(ValueError, match="correlation mode"):
+        analyze_data_streaming(str(tmp_path / "missing.csv"), correlation_mode="pearson")
+    assert consumed == []
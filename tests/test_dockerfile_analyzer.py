@@ -0,0 +1,88 @@
+# tests/test_dockerfile_analyzer.py
+
+from src.utils.docker_scanner import analyze_docker_setup
+from src.utils.dockerfile_analyzer import is_ignored, parse_dockerfile, parse_dockerignore
+
+DOCKERFILE = """\
+# escape=\\
+ARG PY_VERSION=3.11
+FROM python:${PY_VERSION} AS build
+ENV APP_HOME=/srv/app
+WORKDIR $APP_HOME
+COPY . .
+RUN apt-get update && \\
+    apt-get install -y gcc
+RUN pip install -r requirements.txt
+RUN python setup.py build
+RUN echo done
+
+FROM ubuntu
+COPY --from=build /srv/app /srv/app
+CMD ["python", "-m", "app"]
+"""
+
+
+def test_parse_stages_and_expansion():
+    model = parse_dockerfile(DOCKERFILE)
+
+    assert [(s["name"], s["base"]) for s in model["stages"]] == [("build", "python:3.11"), (None, "ubuntu")]
+    workdir = model["stages"][0]["instructions"][1]
+    assert workdir["expanded"] == "/srv/app"
+    run = model["stages"][0]["instructions"][3]
+    assert run["line"] == 7 and "apt-get install -y gcc" in run["args"]
+    assert model["stages"][1]["instructions"][0]["flags"] == {"from": "build"}
+
+
+def test_heredocs_and_arithmetic_shifts():
+    model = parse_dockerfile(
+        "FROM alpine\n"
+        "RUN echo $((1<<2)) > /flags\n"
+        "RUN <<-\"EOF\"\n"
+        "  echo 2\n"
+        "EOF\n"
+        "COPY app /app\n"
+    )
+
+    instructions = model["stages"][0]["instructions"]
+    assert [(i["instruction"], i["line"]) for i in instructions] == [
+        ("RUN", 2), ("RUN", 3), ("COPY", 6)
+    ]
+    assert instructions[1]["args"].endswith("\n  echo 2")
+
+
+def test_dockerignore_rules():
+    rules = parse_dockerignore("*.log\n**/__pycache__\ndata/\n!data/keep.csv\n")
+
+    assert is_ignored("debug.log", rules)
+    assert not is_ignored("logs/debug.log", rules)
+    assert is_ignored("pkg/sub/__pycache__/mod.pyc", rules)
+    assert is_ignored("data/big.bin", rules)
+    assert not is_ignored("data/keep.csv", rules)
+
+
+def test_build_cache_findings_and_rebuild_cost(tmp_path):
+    (tmp_path / "Dockerfile").write_text(DOCKERFILE)
+    (tmp_path / "requirements.txt").write_text("flask==3.0.0\n")
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "lib.js").write_text("x" * 1000)
+    (tmp_path / "cache.log").write_text("y" * 500)
+    (tmp_path / ".dockerignore").write_text("*.log\n")
+
+    result = analyze_docker_setup(str(tmp_path))
+
+    analysis = result["dockerfile_analysis"]
+    types = {f["type"] for f in analysis["findings"]}
+    assert {"cache_busting_order", "pip_cache_in_layer", "apt_lists_in_layer",
+            "consecutive_run_layers", "unpinned_base_image", "large_build_context"} <= types
+    assert analysis["layers"] == 6
+    context = analysis["build_context"]
+    assert context["ignored_files"] == 1 and context["ignored_bytes"] == 500
+    assert context["largest_entries"][0]["path"] == "node_modules"
+
+    (copy_all,) = analysis["rebuild_cost"]
+    assert copy_all["files"] == 5
+    # Every later RUN of the build stage, plus the final stage that copies from it
+    assert copy_all["instructions_rerun"] == 7
+    assert copy_all["estimated_rebuild_seconds"] > 100
+    assert any("cache" in issue for issue in result["docker_issues"])
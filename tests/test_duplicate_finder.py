@@ -0,0 +1,132 @@
+# tests/test_duplicate_finder.py
+
+import os
+
+from src.utils.duplicate_finder import analyze_duplicates, PARTIAL_HASH_BYTES
+
+
+def _sorted_groups(result):
+    return sorted(sorted(os.path.basename(p) for p in group) for group in result["duplicates"])
+
+
+def test_duplicates_found_across_directories(tmp_path):
+    """
+    Identical files are grouped; same-size files with different content are not.
+    """
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("hello")
+    (tmp_path / "sub" / "b.txt").write_text("hello")
+    (tmp_path / "c.txt").write_text("hellp")
+
+    result = analyze_duplicates(str(tmp_path))
+
+    assert _sorted_groups(result) == [["a.txt", "b.txt"]]
+
+
+def test_unique_sizes_are_never_read(tmp_path):
+    """
+    Files with a size nobody else has are skipped without reading a byte.
+    """
+    (tmp_path / "one.bin").write_bytes(b"x" * 10)
+    (tmp_path / "two.bin").write_bytes(b"x" * 20)
+
+    result = analyze_duplicates(str(tmp_path))
+
+    assert result["duplicates"] == []
+    assert result["stats"]["bytes_read"] == 0
+
+
+def test_large_files_differing_in_middle(tmp_path):
+    """
+    Large files sharing head and tail are told apart by the full-hash stage.
+    """
+    size = 4 * PARTIAL_HASH_BYTES
+    base = bytearray(b"a" * size)
+    changed = bytearray(base)
+    changed[size // 2] = ord("b")
+    (tmp_path / "base.bin").write_bytes(bytes(base))
+    (tmp_path / "copy.bin").write_bytes(bytes(base))
+    (tmp_path / "changed.bin").write_bytes(bytes(changed))
+
+    result = analyze_duplicates(str(tmp_path))
+
+    assert _sorted_groups(result) == [["base.bin", "copy.bin"]]
+    assert result["stats"]["full_hash_candidates"] == 3
+
+
+def test_hardlinks_hashed_once(tmp_path):
+    """
+    Paths sharing an inode are reported as duplicates and hardlinks, but read only once.
+    """
+    size = 4 * PARTIAL_HASH_BYTES
+    original = tmp_path / "original.bin"
+    original.write_bytes(b"z" * size)
+    os.link(original, tmp_path / "linked.bin")
+
+    result = analyze_duplicates(str(tmp_path), algorithm="blake2b")
+
+    assert _sorted_groups(result) == [["linked.bin", "original.bin"]]
+    assert len(result["hardlinks"]) == 1
+    assert result["stats"]["hardlinks_skipped"] == 1
+    assert result["stats"]["bytes_read"] == 0
+
+
+def test_hash_cache_reused_across_runs(tmp_path):
+    """
+    A second run over an unchanged tree is served entirely from the hash cache.
+    """
+    from src.utils.hash_cache import HashCache
+
+    project = tmp_path / "project"
+    project.mkdir()
+    size = 4 * PARTIAL_HASH_BYTES
+    (project / "a.bin").write_bytes(b"q" * size)
+    (project / "b.bin").write_bytes(b"q" * size)
+
+    with HashCache(str(tmp_path / "cache.sqlite3")) as cache:
+        first = analyze_duplicates(str(project), hash_cache=cache)
+        second = analyze_duplicates(str(project), hash_cache=cache)
+
+    assert _sorted_groups(first) == _sorted_groups(second) == [["a.bin", "b.bin"]]
+    assert first["stats"]["bytes_read"] > 0
+    assert second["stats"]["bytes_read"] == 0
+    assert second["stats"]["cache_hits"] == 4  # 2 partial + 2 full
+
+
+CLONE_SOURCE = '''
+def load_rows(path, limit=10):
+    """Reads rows."""
+    rows = []
+    with open(path) as handle:
+        for line in handle:
+            if len(rows) >= limit:
+                break
+            rows.append(line.strip().split(","))
+    return rows
+'''
+
+
+def test_code_clones_with_renamed_identifiers(tmp_path):
+    """
+    Functions differing only in names and literals form one clone group, and an
+    unchanged tree is not rehashed on the next run.
+    """
+    from src.utils.duplicate_finder import analyze_code_clones
+
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text(CLONE_SOURCE)
+    renamed = (CLONE_SOURCE.replace("load_rows", "read_records")
+               .replace("rows", "records").replace("limit=10", "limit=500"))
+    (project / "b.py").write_text(renamed)
+    index_path = str(tmp_path / "clone_index.json")
+
+    first = analyze_code_clones(str(project), index_path=index_path)
+    second = analyze_code_clones(str(project), index_path=index_path)
+
+    assert len(first["clone_groups"]) == 1
+    names = sorted(loc["name"] for loc in first["clone_groups"][0]["locations"])
+    assert names == ["load_rows", "read_records"]
+    assert first["stats"]["files_rehashed"] == 2
+    assert second["stats"]["files_rehashed"] == 0
+    assert second["clone_groups"] == first["clone_groups"]
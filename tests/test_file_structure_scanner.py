@@ -0,0 +1,48 @@
+# tests/test_file_structure_scanner.py
+
+import os
+
+import pytest
+
+from src.utils.file_structure_scanner import analyze_file_structure
+
+
+@pytest.fixture
+def sample_tree(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"x" * 10)
+    (tmp_path / "pkg" / "deep" / "deeper").mkdir(parents=True)
+    (tmp_path / "pkg" / "b.py").write_bytes(b"y" * 20)
+    (tmp_path / "pkg" / "deep" / "deeper" / "c.bin").write_bytes(b"z" * 30)
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_bytes(b"w" * 40)
+    return tmp_path
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_totals_and_rollup(sample_tree, parallel):
+    """
+    Totals match the files on disk and each directory's rollup covers its whole subtree.
+    """
+    result = analyze_file_structure(str(sample_tree), parallel=parallel)
+
+    assert result["total_files"] == 4
+    assert result["total_size_bytes"] == 100
+
+    rollup = result["directory_rollup"]
+    assert rollup[str(sample_tree)]["bytes"] == 100
+    assert rollup[str(sample_tree)]["files"] == 4
+    pkg = rollup[os.path.join(str(sample_tree), "pkg")]
+    assert (pkg["bytes"], pkg["files"], pkg["dirs"]) == (50, 2, 2)
+    assert pkg["deepest_path"].endswith("c.bin")
+    assert result["deepest_paths"][0]["path"].endswith("c.bin")
+    assert result["deepest_paths"][0]["depth"] == 4
+
+    entry = next(e for e in result["file_details"] if e["path"].endswith("a.txt"))
+    assert {"size", "mtime_ns", "inode", "device"} <= set(entry)
+
+
+def test_skip_dirs(sample_tree):
+    result = analyze_file_structure(str(sample_tree), skip_dirs=["node_modules"])
+
+    assert result["total_files"] == 3
+    assert not any("node_modules" in e["path"] for e in result["file_details"])
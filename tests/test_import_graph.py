@@ -0,0 +1,93 @@
+# tests/test_import_graph.py
+
+from src.utils.import_graph import ImportGraph
+from src.utils.logging_scanner import analyze_logging_and_monitoring
+from src.utils.requirements_scanner import analyze_requirements
+from src.utils.testing_scanner import analyze_testing_setup
+from src.utils.virtual_fs import LocalFS
+
+
+def _make_project(root):
+    pkg = root / "app"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "models.py").write_text("import numpy as np\nfrom sklearn.linear_model import LogisticRegression\n")
+    (pkg / "service.py").write_text(
+        "import logging\nimport os\nfrom . import models\nfrom .models import np\nimport sentry_sdk\n"
+        "logger = logging.getLogger(__name__)\nsentry_sdk.init(dsn=os.environ['DSN'])\nimport yaml\n"
+    )
+    (root / "tests").mkdir()
+    (root / "tests" / "test_service.py").write_text("import pytest\nfrom app import service\n")
+    (root / "broken.py").write_text("def oops(:\n    import unittest\n")
+    (root / "requirements.txt").write_text("numpy==1.25.0\nscikit-learn==1.2.2\nrequests==2.31.0\n")
+
+
+def test_graph_resolves_and_classifies_imports(tmp_path):
+    _make_project(tmp_path)
+    graph = ImportGraph.build(LocalFS(str(tmp_path)))
+
+    service = str(tmp_path / "app" / "service.py")
+    assert ("app.models", 3) in graph.imports_of(service)
+    assert [line for _, line in graph.importers_of("sklearn")] == [2]
+    assert sorted(graph.third_party_imports()) == ["numpy", "pytest", "sentry_sdk", "sklearn", "yaml"]
+    assert graph.unparsed_files == [str(tmp_path / "broken.py")]
+
+
+def test_scanners_query_the_shared_graph(tmp_path):
+    _make_project(tmp_path)
+    fs = LocalFS(str(tmp_path))
+    graph = ImportGraph.build(fs)
+
+    requirements = analyze_requirements(str(tmp_path), fs=fs, import_graph=graph)
+    usage = requirements["dependency_usage"]
+    assert usage["unused"] == ["requests"]
+    assert [u["module"] for u in usage["undeclared"]] == ["pytest", "sentry_sdk", "yaml"]
+
+    testing = analyze_testing_setup(str(tmp_path), fs=fs, import_graph=graph)
+    assert testing["pytest_found"]
+    # Only mentioned in a file that doesn't parse: found by the text fallback
+    assert testing["unittest_found"]
+
+    logging_info = analyze_logging_and_monitoring(str(tmp_path), fs=fs, import_graph=graph)
+    assert logging_info["logging_references"] == [f"{tmp_path / 'app' / 'service.py'}:6 => logging.getLogger"]
+    assert len(logging_info["monitoring_references"]) == 2
+
+
+def test_dependency_usage_without_packages_distributions(tmp_path, monkeypatch):
+    """
+    Python < 3.10 has no metadata.packages_distributions(); the scanner falls back to
+    each distribution's top_level.txt / RECORD.
+    """
+    from importlib import metadata
+
+    from src.utils import requirements_scanner
+
+    monkeypatch.delattr(metadata, "packages_distributions", raising=False)
+    monkeypatch.setattr(requirements_scanner, "_installed_top_level", None)
+    (tmp_path / "check.py").write_text("import _pytest\n")
+    (tmp_path / "requirements.txt").write_text("pytest\n")
+    fs = LocalFS(str(tmp_path))
+
+    requirements = analyze_requirements(str(tmp_path), fs=fs, import_graph=ImportGraph.build(fs))
+
+    assert requirements["dependency_usage"] == {"unused": [], "undeclared": []}
+    assert "_pytest" in requirements_scanner._import_names("pytest")
+
+
+def test_stdlib_is_never_undeclared_without_stdlib_module_names(tmp_path, monkeypatch):
+    """
+    Python < 3.10 has no sys.stdlib_module_names; the stdlib directory listing is used.
+    """
+    import sys
+
+    from src.utils import import_graph
+
+    monkeypatch.delattr(sys, "stdlib_module_names", raising=False)
+    monkeypatch.setattr(import_graph, "STDLIB_MODULES", import_graph._stdlib_module_names())
+    (tmp_path / "app.py").write_text("import json\nimport os\nimport typing\nimport yaml\n")
+    (tmp_path / "requirements.txt").write_text("pyyaml\n")
+    fs = LocalFS(str(tmp_path))
+
+    requirements = analyze_requirements(str(tmp_path), fs=fs, import_graph=ImportGraph.build(fs))
+
+    assert requirements["dependency_usage"]["undeclared"] == []
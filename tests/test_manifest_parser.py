@@ -0,0 +1,97 @@
+# tests/test_manifest_parser.py
+
+import zipfile
+
+from src.utils.dependency_resolver import DistributionIndex, resolve_dependencies
+from src.utils.manifest_parser import parse_manifests
+from src.utils.virtual_fs import LocalFS
+
+
+def test_parses_all_manifest_formats(tmp_path):
+    (tmp_path / "requirements.txt").write_text(
+        "# core\n-r requirements-base.txt\n-c constraints.txt\n"
+        "requests[socks]>=2.31 ; python_version >= '3.8'\n"
+        "-e .\nflask \\\n  ==2.2.5  # pinned\n"
+    )
+    (tmp_path / "requirements-base.txt").write_text("numpy==1.25.0\n")
+    (tmp_path / "constraints.txt").write_text("urllib3<3\n")
+    (tmp_path / "pyproject.toml").write_text(
+        "[project]\nname = 'demo'\ndependencies = ['pandas>=2']\n"
+        "[project.optional-dependencies]\nml = ['scikit-learn==1.2.2']\n"
+    )
+    (tmp_path / "setup.py").write_text(
+        "from setuptools import setup\nREQS = ['click>=8']\n"
+        "setup(name='demo', install_requires=REQS, extras_require={'yaml': ['PyYAML']})\n"
+    )
+    (tmp_path / "environment.yml").write_text(
+        "name: demo\ndependencies:\n  - python=3.11\n  - conda-forge::numpy=1.25\n  - pip:\n    - rich==13.0\n"
+    )
+
+    manifests = parse_manifests(LocalFS(str(tmp_path)))
+
+    requirements = {r["name"]: r for r in manifests["requirements.txt"]["requirements"]}
+    assert requirements["numpy"]["specifier"] == "==1.25.0"
+    assert requirements["urllib3"]["kind"] == "constraint"
+    assert requirements["requests"]["extras"] == ["socks"]
+    assert "python_version" in requirements["requests"]["marker"]
+    assert requirements["flask"]["specifier"] == "==2.2.5"
+    assert requirements["flask"]["source"].endswith("requirements.txt:6")
+    assert manifests["requirements.txt"]["errors"] == []
+
+    assert [(r["name"], r["kind"]) for r in manifests["pyproject.toml"]["requirements"]] == [
+        ("pandas", "install"), ("scikit-learn", "extra:ml")
+    ]
+    assert [(r["name"], r["kind"]) for r in manifests["setup.py"]["requirements"]] == [
+        ("click", "install"), ("pyyaml", "extra:yaml")
+    ]
+    conda = [(r["name"], r["specifier"], r["kind"]) for r in manifests["environment.yml"]["requirements"]]
+    assert conda == [("python", "=3.11", "conda"), ("numpy", "=1.25", "conda"), ("rich", "==13.0", "install")]
+
+
+def _write_wheel(directory, name, version, requires):
+    path = directory / f"{name}-{version}-py3-none-any.whl"
+    metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n" + "".join(
+        f"Requires-Dist: {r}\n" for r in requires
+    )
+    with zipfile.ZipFile(path, "w") as wheel:
+        wheel.writestr(f"{name}-{version}.dist-info/METADATA", metadata)
+
+
+def test_offline_resolution_from_wheel_cache(tmp_path):
+    wheels = tmp_path / "wheels"
+    wheels.mkdir()
+    _write_wheel(wheels, "zz_app_core", "1.0", ["zz_app_util>=2", "zz_app_extra ; extra == 'fast'"])
+    _write_wheel(wheels, "zz_app_util", "1.5", [])
+    _write_wheel(wheels, "zz_app_util", "1.4", [])
+    (tmp_path / "requirements.txt").write_text("zz-app-core==1.0\nzz-app-util==1.5\nzz-app-missing\n")
+    requirements = parse_manifests(LocalFS(str(tmp_path)))["requirements.txt"]["requirements"]
+    cache_path = str(tmp_path / "resolutions.json")
+
+    result = resolve_dependencies(requirements, DistributionIndex([str(wheels)]), cache_path=cache_path)
+
+    assert not result["cached"]
+    assert result["graph"]["zz-app-core"] == ["zz-app-util"]
+    assert result["trees"]["zz-app-core"]["transitive"] == 1
+    assert result["missing"] == ["zz-app-missing"]
+    assert [c["package"] for c in result["conflicts"]] == ["zz-app-util"]
+
+    again = resolve_dependencies(requirements, DistributionIndex([str(wheels)]), cache_path=cache_path)
+    assert again["cached"]
+    assert again["conflicts"] == result["conflicts"]
+
+    # Same pins in another project: not served the first project's source paths
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "requirements.txt").write_text("zz-app-core==1.0\nzz-app-util==1.5\nzz-app-missing\n")
+    other_requirements = parse_manifests(LocalFS(str(other)))["requirements.txt"]["requirements"]
+    moved = resolve_dependencies(other_requirements, DistributionIndex([str(wheels)]), cache_path=cache_path)
+    assert not moved["cached"]
+    sources = [c["from"] for conflict in moved["conflicts"] for c in conflict["constraints"]]
+    assert any(s.startswith(str(other / "requirements.txt")) for s in sources)
+    assert not any(s.startswith(str(tmp_path / "requirements.txt")) for s in sources)
+
+    # Hits leave the cache file alone; writes leave no temp files behind
+    mtime = (tmp_path / "resolutions.json").stat().st_mtime_ns
+    assert resolve_dependencies(requirements, DistributionIndex([str(wheels)]), cache_path=cache_path)["cached"]
+    assert (tmp_path / "resolutions.json").stat().st_mtime_ns == mtime
+    assert not list(tmp_path.glob("*.tmp"))
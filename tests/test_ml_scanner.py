@@ -0,0 +1,136 @@
+# tests/test_ml_scanner.py
+
+import ast
+import json
+
+from src.utils.ml_antipatterns import detect_ml_antipatterns
+from src.utils.ml_scanner import analyze_ml_workflow
+
+
+SLOW_SCRIPT = """\
+import joblib
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+df = pd.read_csv("data.csv")
+model = joblib.load("model.pkl")
+for _, row in df.iterrows():
+    print(model.predict([row.values]))
+preds = model.predict(df)
+for i, p in enumerate(preds):
+    print(i, p)
+clf = RandomForestClassifier(n_estimators=10)
+again = joblib.load("model.pkl")
+"""
+
+FAST_SCRIPT = """\
+import joblib
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+df = pd.read_csv("data.csv", usecols=["a", "b"], dtype={"a": "float32"})
+model = joblib.load("model.pkl")
+preds = model.predict(df)
+pd.DataFrame({"prediction": preds}).to_csv("out.csv", index=False)
+clf = RandomForestClassifier(n_estimators=10, n_jobs=-1)
+
+def score(batch):
+    return model.predict(batch)
+"""
+
+
+def _types(findings):
+    return [(f["type"], f["line"]) for f in findings]
+
+
+def test_detects_throughput_antipatterns():
+    findings = detect_ml_antipatterns(ast.parse(SLOW_SCRIPT), "slow.py")
+
+    assert _types(findings) == [
+        ("read_csv_without_projection", 5),
+        ("iterrows_loop", 7),
+        ("predict_in_loop", 8),
+        ("row_loop_over_predictions", 10),
+        ("estimator_without_n_jobs", 12),
+        ("repeated_model_load", 13)
+    ]
+    assert all(f["impact"] in ("high", "medium", "low") and f["estimated_impact"] for f in findings)
+
+
+def test_vectorized_script_is_clean():
+    assert detect_ml_antipatterns(ast.parse(FAST_SCRIPT), "fast.py") == []
+
+
+def test_model_load_in_loop_with_aliased_import():
+    source = (
+        "from joblib import load as jl_load\n"
+        "results = [jl_load(path).predict(X) for path in paths]\n"
+    )
+
+    findings = detect_ml_antipatterns(ast.parse(source), "loop.py")
+
+    assert {("model_load_in_loop", 2), ("predict_in_loop", 2)} <= set(_types(findings))
+
+
+def test_workflow_scans_scripts_and_notebooks(tmp_path):
+    (tmp_path / "ml" / "scripts").mkdir(parents=True)
+    (tmp_path / "ml" / "notebooks").mkdir()
+    (tmp_path / "ml" / "scripts" / "slow.py").write_text(SLOW_SCRIPT)
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "serve.py").write_text(
+        "import joblib\nfor request in queue:\n    joblib.load('m.pkl')\n"
+    )
+    notebook = {
+        "cells": [
+            {"cell_type": "markdown", "source": ["# Exploration"]},
+            {"cell_type": "code", "source": ["%matplotlib inline\n", "import pandas as pd\n"]},
+            {"cell_type": "code", "source": ["df = pd.read_csv('x.csv')\n", "for r in df.iterrows():\n", "    pass\n"]}
+        ]
+    }
+    (tmp_path / "ml" / "notebooks" / "explore.ipynb").write_text(json.dumps(notebook))
+
+    result = analyze_ml_workflow(str(tmp_path))
+
+    assert result["notebooks_found"] == ["explore.ipynb"]
+    notebook_findings = [f for f in result["performance_findings"] if f["file"].endswith(".ipynb")]
+    assert [(f["type"], f["cell"], f["line"]) for f in notebook_findings] == [
+        ("read_csv_without_projection", 2, 1),
+        ("iterrows_loop", 2, 2)
+    ]
+    assert result["notebook_analysis"][0]["cells"] == 3
+    serve = [f for f in result["performance_findings"] if f["file"].endswith("serve.py")]
+    assert _types(serve) == [("model_load_in_loop", 3)]
+    assert result["performance_summary"]["iterrows_loop"] == 2
+
+
+def test_predict_per_chunk_is_not_flagged():
+    source = (
+        "for chunk in pd.read_csv('x.csv', usecols=['a'], chunksize=1000):\n"
+        "    out.append(model.predict(chunk))\n"
+        "for x in X_rows:\n"
+        "    model.predict([x])\n"
+    )
+
+    assert _types(detect_ml_antipatterns(ast.parse(source), "chunks.py")) == [("predict_in_loop", 4)]
+
+
+def test_loop_variable_naming_a_batch_is_not_flagged():
+    source = (
+        "for X_batch, y_batch in loader:\n"
+        "    model.predict(X_batch)\n"
+        "scores = [model.predict(batch) for batch in loader]\n"
+    )
+
+    assert detect_ml_antipatterns(ast.parse(source), "batches.py") == []
+
+
+def test_tests_are_not_scanned(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "helpers.py").write_text(SLOW_SCRIPT)
+    (tmp_path / "test_model.py").write_text(SLOW_SCRIPT)
+    (tmp_path / "serve.py").write_text(SLOW_SCRIPT)
+
+    result = analyze_ml_workflow(str(tmp_path))
+
+    files = {f["file"].rsplit("/", 1)[-1] for f in result["performance_findings"]}
+    assert files == {"serve.py"}
@@ -0,0 +1,58 @@
+# tests/test_near_duplicate_finder.py
+
+from src.utils.near_duplicate_finder import analyze_near_duplicates
+
+BASE_MODULE = "\n".join(
+    f"def handler_{i}(request, retries={i}):\n"
+    f"    payload = request.get('item_{i}', {{}})\n"
+    f"    return process(payload, retries=retries, name='handler_{i}')\n"
+    for i in range(30)
+)
+
+
+def test_edited_copy_is_reported(tmp_path):
+    """
+    A copy with a couple of edits is found with a high similarity score;
+    an unrelated module is not paired with either.
+    """
+    (tmp_path / "original.py").write_text(BASE_MODULE)
+    edited = BASE_MODULE.replace("handler_3(", "renamed_handler(").replace("retries=7", "retries=70")
+    (tmp_path / "copy.py").write_text(edited)
+    (tmp_path / "other.py").write_text(
+        "\n".join(f"class Model{i}:\n    field_{i} = Column(Integer)\n" for i in range(40))
+    )
+
+    result = analyze_near_duplicates(str(tmp_path))
+
+    assert len(result["near_duplicates"]) == 1
+    pair = result["near_duplicates"][0]
+    assert sorted(p.rsplit("/", 1)[-1] for p in pair["files"]) == ["copy.py", "original.py"]
+    assert 0.8 <= pair["similarity"] < 1.0
+    assert result["stats"]["files_indexed"] == 3
+
+
+def test_small_files_are_skipped(tmp_path):
+    (tmp_path / "__init__.py").write_text("")
+    (tmp_path / "a.py").write_text("x = 1\n")
+
+    result = analyze_near_duplicates(str(tmp_path))
+
+    assert result["near_duplicates"] == []
+    assert result["stats"]["files_indexed"] == 0
+
+
+def test_oversized_bucket_is_paired_linearly(tmp_path):
+    """
+    Hundreds of templated copies collide in the same buckets; they are linked to one
+    representative instead of being compared all-pairs.
+    """
+    for i in range(200):
+        source = BASE_MODULE + f"\nREVISION = {i}\n"
+        (tmp_path / f"migration_{i:03d}.py").write_text(source)
+
+    result = analyze_near_duplicates(str(tmp_path))
+
+    assert result["stats"]["files_indexed"] == 200
+    assert result["stats"]["oversized_buckets"] > 0
+    assert result["stats"]["candidate_pairs"] == 199
+    assert len(result["near_duplicates"]) == 199
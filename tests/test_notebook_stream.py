@@ -0,0 +1,78 @@
+# tests/test_notebook_stream.py
+
+import base64
+import io
+import json
+
+from src.utils.notebook_stream import analyze_notebook, iter_notebook_cells, join_code_cells
+from src.utils.virtual_fs import LocalFS
+
+
+def _notebook(image_bytes=3000):
+    image = base64.b64encode(b"\x89PNG" + b"\x00" * image_bytes).decode()
+    return {
+        "cells": [
+            {"cell_type": "markdown", "metadata": {}, "source": ["# Title with \"quotes\" and \\\\ slashes"]},
+            {
+                "cell_type": "code", "execution_count": 1, "metadata": {},
+                "source": ["%matplotlib inline\n", "import pandas as pd\n", "df = pd.read_csv('x.csv')"],
+                "outputs": [
+                    {"output_type": "display_data", "metadata": {},
+                     "data": {"image/png": image, "text/plain": ["<Figure>"]}},
+                    {"output_type": "stream", "name": "stdout", "text": ["done\n"]}
+                ]
+            },
+            {"cell_type": "code", "execution_count": None, "metadata": {}, "source": "x = {'a': [1, 2]}", "outputs": []}
+        ],
+        "metadata": {"kernelspec": {"name": "python3"}},
+        "nbformat": 4,
+        "nbformat_minor": 5
+    }
+
+
+def test_streams_cells_with_small_chunks():
+    raw = json.dumps(_notebook(), indent=1).encode()
+
+    cells = list(iter_notebook_cells(io.BytesIO(raw), chunk_size=7))
+
+    assert [c["cell_type"] for c in cells] == ["markdown", "code", "code"]
+    assert cells[0]["source"] is None
+    assert cells[1]["source"].startswith("%matplotlib inline\nimport pandas")
+    assert cells[2]["source"] == "x = {'a': [1, 2]}"
+    assert cells[1]["output_count"] == 2 and cells[1]["execution_count"] == 1
+    image = _notebook()["cells"][1]["outputs"][0]["data"]["image/png"]
+    assert cells[1]["binary_by_mime"] == {"image/png": len(image) + 2}
+    assert cells[1]["output_bytes"] > cells[1]["binary_bytes"]
+    assert cells[2]["output_bytes"] == 0
+
+
+def test_analyze_notebook_reports_bloat(tmp_path):
+    path = tmp_path / "big.ipynb"
+    path.write_text(json.dumps(_notebook(image_bytes=200000)))
+    fs = LocalFS(str(tmp_path))
+
+    report = analyze_notebook(fs, fs.join(fs.root, "big.ipynb"), large_output_bytes=100000)
+
+    assert report["error"] is None
+    assert report["cells"] == 3
+    assert [cell for cell, _ in report["code_cells"]] == [1, 2]
+    assert [c["cell"] for c in report["bloated_cells"]] == [1]
+    assert report["largest_outputs"][0]["cell"] == 1
+    assert report["binary_by_mime"]["image/png"] > 200000
+    assert report["size_bytes"] == path.stat().st_size
+
+
+def test_truncated_notebook_is_reported(tmp_path):
+    (tmp_path / "broken.ipynb").write_text(json.dumps(_notebook())[:500])
+    fs = LocalFS(str(tmp_path))
+
+    report = analyze_notebook(fs, fs.join(fs.root, "broken.ipynb"))
+
+    assert report["error"]
+
+
+def test_join_code_cells_blanks_magics():
+    source, line_map = join_code_cells([(1, "%time\nimport os"), (3, "!pip install x\nprint(os)")])
+
+    assert source == "\nimport os\n\nprint(os)"
+    assert line_map == [(1, 1), (1, 2), (3, 1), (3, 2)]
@@ -0,0 +1,164 @@
+# tests/test_prediction_service.py
+
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.linear_model import LogisticRegression
+
+from src.modules.prediction_service import MicroBatcher, PredictionService
+
+
+def test_micro_batcher_merges_concurrent_requests():
+    calls = []
+
+    def predict_fn(X):
+        calls.append(len(X))
+        return X[:, 0] * 2
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=100, max_wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def client(i):
+        barrier.wait()
+        results[i] = batcher.predict(np.array([[i], [i + 100]]))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {i: [2 * i, 2 * (i + 100)] for i in range(8)}
+    assert sum(calls) == 16 and len(calls) < 8
+    metrics = batcher.metrics.snapshot()
+    assert metrics["requests"] == 8 and metrics["rows"] == 16
+    assert metrics["batch_size"]["max"] > 2 and metrics["latency_ms"]["p99"] is not None
+
+
+def _write_model(tmp_path):
+    (tmp_path / "model_config.json").write_text(json.dumps({"save_path": str(tmp_path / "model.joblib")}))
+    (tmp_path / "dataset_config.json").write_text(json.dumps({"features": ["a", "b"]}))
+    model = LogisticRegression().fit(np.array([[0, 0], [0, 1], [5, 5], [6, 5]]), [0, 0, 1, 1])
+    dump(model, tmp_path / "model.joblib")
+    return PredictionService(
+        str(tmp_path / "model_config.json"), str(tmp_path / "dataset_config.json"),
+        scaler_path=str(tmp_path / "scaler.joblib"), max_wait_ms=1
+    )
+
+
+def test_predict_endpoint(tmp_path, monkeypatch):
+    import src.ui.app as app_module
+
+    monkeypatch.setattr(app_module, "prediction_service", _write_model(tmp_path))
+    client = app_module.app.test_client()
+
+    response = client.post("/predict", json={"rows": [{"a": 0, "b": 0}, [6, 6]]})
+    assert response.status_code == 200
+    assert response.get_json() == {"predictions": [0, 1]}
+
+    response = client.post("/predict", json={"rows": [{"a": 1}]})
+    assert response.status_code == 400
+
+    metrics = client.get("/predict/metrics").get_json()
+    assert metrics["requests"] == 1 and metrics["batches"] == 1
+
+
+def test_predict_endpoint_without_model(tmp_path, monkeypatch):
+    import src.ui.app as app_module
+
+    service = PredictionService(str(tmp_path / "missing.json"), str(tmp_path / "missing.json"))
+    monkeypatch.setattr(app_module, "prediction_service", service)
+
+    response = app_module.app.test_client().post("/predict", json={"rows": [[1, 2]]})
+    assert response.status_code == 503
+
+
+def test_failing_request_does_not_fail_its_batch():
+    def predict_fn(X):
+        if (X < 0).any():
+            raise ValueError("negative input")
+        return X[:, 0].tolist()
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=100, max_wait_ms=200)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def client(name, rows):
+        barrier.wait()
+        try:
+            results[name] = batcher.predict(np.array(rows))
+        except ValueError as e:
+            results[name] = str(e)
+
+    threads = [threading.Thread(target=client, args=args) for args in (("good", [[6]]), ("bad", [[-1]]))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {"good": [6], "bad": "negative input"}
+
+
+def test_timed_out_request_is_withdrawn():
+    release = threading.Event()
+    calls = []
+
+    def predict_fn(X):
+        calls.append(X[:, 0].tolist())
+        release.wait(5)
+        return X[:, 0].tolist()
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=1, max_wait_ms=0)
+    blocker = batcher.submit(np.array([[1]]))
+    while not calls:
+        time.sleep(0.001)
+    with pytest.raises(TimeoutError):
+        batcher.predict(np.array([[2]]), timeout=0.05)
+    release.set()
+
+    assert blocker.result(timeout=5) == [1]
+    assert batcher.predict(np.array([[3]]), timeout=5) == [3]
+    assert calls == [[1], [3]]
+
+
+def test_rejects_null_and_non_finite_values(tmp_path, monkeypatch):
+    import src.ui.app as app_module
+
+    monkeypatch.setattr(app_module, "prediction_service", _write_model(tmp_path))
+    client = app_module.app.test_client()
+
+    for rows in ([[None, 1]], [{"a": "x", "b": 1}], [[True, 1]]):
+        response = client.post("/predict", json={"rows": rows})
+        assert response.status_code == 400
+        assert "non-numeric" in response.get_json()["error"]
+
+
+def test_rejects_body_that_is_not_an_object(tmp_path, monkeypatch):
+    import src.ui.app as app_module
+
+    monkeypatch.setattr(app_module, "prediction_service", _write_model(tmp_path))
+    client = app_module.app.test_client()
+
+    for body in ([[1, 2]], "rows", None):
+        response = client.post("/predict", json=body)
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "'rows' must be a non-empty list."
+
+
+def test_corrupt_model_is_unavailable(tmp_path, monkeypatch):
+    import src.ui.app as app_module
+
+    service = _write_model(tmp_path)
+    monkeypatch.setattr(app_module, "prediction_service", service)
+    monkeypatch.setattr(
+        "src.modules.prediction_service.load_pipeline",
+        lambda *args, **kwargs: (_ for _ in ()).throw(ValueError("artifact does not match its manifest"))
+    )
+
+    response = app_module.app.test_client().post("/predict", json={"rows": [[1, 2]]})
+    assert response.status_code == 503
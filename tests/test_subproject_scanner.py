@@ -0,0 +1,139 @@
+# tests/test_subproject_scanner.py
+
+from src.utils.subproject_scanner import analyze_subprojects, discover_subprojects
+from src.utils.virtual_fs import LocalFS
+
+
+def _make_monorepo(root):
+    (root / "requirements.txt").write_text("flask==3.0.0\n")
+    billing = root / "services" / "billing"
+    (billing / "tests").mkdir(parents=True)
+    (billing / "requirements.txt").write_text("requests\nrequests==2.31.0\n")
+    (billing / "Dockerfile").write_text("FROM python:3.11\nRUN apt-get update\n")
+    (billing / ".env").write_text("API_TOKEN=abc\n")
+    (billing / "tests" / "test_billing.py").write_text("import pytest\n")
+    search = root / "services" / "search"
+    search.mkdir(parents=True)
+    (search / "pyproject.toml").write_text("[project]\nname = 'search'\n")
+    (root / "docs").mkdir()
+    (root / "docs" / "index.md").write_text("# Docs\n")
+
+
+def test_discovers_subprojects_from_inventory(tmp_path):
+    _make_monorepo(tmp_path)
+    fs = LocalFS(str(tmp_path))
+
+    found = discover_subprojects(fs)
+
+    assert {path[len(fs.root) + 1:]: markers for path, markers in found.items()} == {
+        "services/billing": ["Dockerfile", "requirements.txt"],
+        "services/search": ["pyproject.toml"]
+    }
+
+
+def test_vendored_and_virtualenv_directories_are_not_subprojects(tmp_path):
+    _make_monorepo(tmp_path)
+    web = tmp_path / "web"
+    (web / "node_modules" / "left-pad").mkdir(parents=True)
+    (web / "package.json").write_text("{}")
+    (web / "node_modules" / "left-pad" / "package.json").write_text("{}")
+    (tmp_path / ".venv" / "lib" / "site-packages" / "pkg").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "site-packages" / "pkg" / "setup.py").write_text("")
+    (tmp_path / "py" / "lib" / "dep").mkdir(parents=True)
+    (tmp_path / "py" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (tmp_path / "py" / "lib" / "dep" / "pyproject.toml").write_text("")
+    fs = LocalFS(str(tmp_path))
+
+    found = discover_subprojects(fs)
+
+    assert sorted(path[len(fs.root) + 1:] for path in found) == [
+        "services/billing", "services/search", "web"
+    ]
+
+
+def test_subproject_reports_and_summary(tmp_path):
+    _make_monorepo(tmp_path)
+
+    result = analyze_subprojects(str(tmp_path), max_workers=4)
+
+    reports = {r["relative_path"]: r for r in result["subprojects"]}
+    billing = reports["services/billing"]
+    assert billing["requirements"]["requirements_txt"]["duplicates"] == ["requests"]
+    assert billing["docker_setup"]["dockerfile_found"]
+    assert billing["env_file"]["env_found"]
+    assert billing["testing"]["pytest_found"]
+    assert not reports["services/search"]["testing"]["pytest_found"]
+
+    summary = result["summary"]
+    assert summary["subproject_count"] == 2
+    assert summary["with_dockerfile"] == 1
+    assert summary["potential_secrets"] == 1
+    assert summary["test_frameworks"]["pytest"] == 1
+    assert summary["without_tests"] == ["services/search"]
+
+
+def test_subtree_view_filters_inventory_once(tmp_path):
+    from src.utils.virtual_fs import SubtreeFS
+
+    _make_monorepo(tmp_path)
+    fs = LocalFS(str(tmp_path))
+    view = SubtreeFS(fs, fs.join(fs.root, "services", "billing"))
+
+    first = view.inventory()
+
+    assert view.inventory() is first
+    assert sorted(fs.basename(e["path"]) for e in first) == [
+        ".env", "Dockerfile", "requirements.txt", "test_billing.py"
+    ]
+
+
+def test_subprojects_parse_each_file_once(tmp_path, monkeypatch):
+    """
+    The import graph and the per-sub-project ML workflow scans share one AstCache.
+    """
+    from src.utils.ast_cache import AstCache
+
+    _make_monorepo(tmp_path)
+    ml_scripts = tmp_path / "services" / "search" / "ml" / "scripts"
+    ml_scripts.mkdir(parents=True)
+    (ml_scripts / "train.py").write_text("import joblib\n")
+    parsed = []
+    parse = AstCache._parse
+
+    def recording_parse(self, key, source):
+        parsed.append(key)
+        return parse(self, key, source)
+
+    monkeypatch.setattr(AstCache, "_parse", recording_parse)
+
+    analyze_subprojects(str(tmp_path), max_workers=1)
+
+    assert len(parsed) == len(set(parsed))
+    assert any(path.endswith("train.py") for path in parsed)
+
+
+def test_concurrent_subprojects_share_a_complete_distribution_index(tmp_path, monkeypatch):
+    import time
+    from importlib import metadata
+
+    from src.utils import dependency_resolver
+
+    for index in range(16):
+        service = tmp_path / "services" / f"svc{index}"
+        service.mkdir(parents=True)
+        (service / "requirements.txt").write_text("numpy\npytest\n")
+    distributions = metadata.distributions
+
+    def slow_distributions():
+        # Widens the window in which another thread could see a partial index
+        for dist in distributions():
+            time.sleep(0.001)
+            yield dist
+
+    monkeypatch.setattr(dependency_resolver.metadata, "distributions", slow_distributions)
+
+    result = analyze_subprojects(str(tmp_path), max_workers=8)
+
+    assert len(result["subprojects"]) == 16
+    for report in result["subprojects"]:
+        assert report["requirements"]["dependency_resolution"]["missing"] == []
@@ -0,0 +1,153 @@
+# tests/test_virtual_fs.py
+
+import gzip
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+
+from src.utils.duplicate_finder import analyze_duplicates
+from src.utils.project_analyzer import analyze_project
+from src.utils.virtual_fs import ArchiveFS
+
+CLONED_FUNCTION = (
+    "def load_rows(path, limit=10):\n"
+    "    rows = []\n"
+    "    with open(path) as f:\n"
+    "        for line in f:\n"
+    "            if len(rows) >= limit:\n"
+    "                break\n"
+    "            rows.append(line.strip().split(','))\n"
+    "    return rows\n"
+)
+
+
+def _build_archive(tmp_path):
+    """
+    project.zip/project/{app.py, copy.py, requirements.txt, vendor/lib.tar.gz/lib/util.py}
+    """
+    inner = io.BytesIO()
+    with tarfile.open(fileobj=inner, mode="w:gz") as tar:
+        data = CLONED_FUNCTION.encode("utf-8")
+        info = tarfile.TarInfo("lib/util.py")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+
+    archive = tmp_path / "project.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("project/app.py", CLONED_FUNCTION)
+        zf.writestr("project/copy.py", CLONED_FUNCTION)
+        zf.writestr("project/requirements.txt", "flask==3.0.0\n")
+        zf.writestr("project/node_modules/skip.py", "x = 1\n")
+        zf.writestr("project/vendor/lib.tar.gz", inner.getvalue())
+    return str(archive)
+
+
+def test_archive_members_and_nested_archives(tmp_path):
+    """
+    Members are listed under a single top-level root, nested archives become directories
+    and skip_dirs applies inside the archive.
+    """
+    archive = _build_archive(tmp_path)
+    with ArchiveFS(archive, skip_dirs=["node_modules"]) as fs:
+        assert fs.root == f"{archive}/project"
+        paths = sorted(entry["path"][len(fs.root) + 1:] for entry in fs.inventory())
+        assert paths == ["app.py", "copy.py", "requirements.txt", "vendor/lib.tar.gz/lib/util.py"]
+        assert fs.isdir(f"{fs.root}/vendor/lib.tar.gz")
+        assert fs.read_text(f"{fs.root}/vendor/lib.tar.gz/lib/util.py") == CLONED_FUNCTION
+        assert sorted(fs.listdir(fs.root)) == ["app.py", "copy.py", "requirements.txt", "vendor"]
+
+
+def test_analyze_project_reads_archive_in_place(tmp_path, monkeypatch):
+    monkeypatch.setenv("CODE_ANALYZER_CACHE_DIR", str(tmp_path / "cache"))
+    archive = _build_archive(tmp_path)
+
+    report = analyze_project(archive, skip_dirs=["node_modules"])
+
+    assert "error" not in report
+    assert report["file_structure"]["total_files"] == 4
+    assert report["requirements"]["requirements_txt"]["found"]
+    duplicate_names = [sorted(p.rsplit("/", 1)[-1] for p in group) for group in report["duplicates"]["duplicates"]]
+    assert ["app.py", "copy.py", "util.py"] in duplicate_names
+    assert report["code_clones"]["stats"]["files_indexed"] == 3
+
+
+def test_analyze_project_hashes_uncached_when_cache_dir_is_unusable(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setenv("CODE_ANALYZER_CACHE_DIR", str(blocker / "cache"))
+    archive = _build_archive(tmp_path)
+
+    report = analyze_project(archive, skip_dirs=["node_modules"])
+
+    assert "error" not in report
+    duplicate_names = [sorted(p.rsplit("/", 1)[-1] for p in group) for group in report["duplicates"]["duplicates"]]
+    assert ["app.py", "copy.py", "util.py"] in duplicate_names
+    assert report["duplicates"]["stats"]["cache_hits"] == 0
+
+
+def test_compressed_tar_is_decompressed_once_per_stage(tmp_path, monkeypatch):
+    archive = tmp_path / "data.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for i in range(200):
+            # Pairs of same-size members: every one is a duplicate candidate
+            data = os.urandom(20000) if i % 2 else bytes([i % 251]) * 20000
+            info = tarfile.TarInfo(f"data/file_{i:03d}.bin")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    rewinds = []
+    original_seek = gzip.GzipFile.seek
+
+    def counting_seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET and offset < self.tell():
+            rewinds.append(offset)
+        return original_seek(self, offset, whence)
+
+    monkeypatch.setattr(gzip.GzipFile, "seek", counting_seek)
+    with ArchiveFS(str(archive)) as fs:
+        result = analyze_duplicates(fs.root, fs.inventory(), fs=fs)
+
+    assert result["stats"]["partial_hash_candidates"] == 200
+    # One rewind to the first member per hashing stage, not one per member
+    assert len(rewinds) <= 3
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_analyze_git_revision_without_checkout(tmp_path, monkeypatch):
+    """
+    A committed revision is analyzed from the object store: later working-tree edits
+    are invisible, and blob SHAs group duplicates without reading any file.
+    """
+    monkeypatch.setenv("CODE_ANALYZER_CACHE_DIR", str(tmp_path / "cache"))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text(CLONED_FUNCTION)
+    (repo / "copy.py").write_text(CLONED_FUNCTION)
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            check=True, stdout=subprocess.DEVNULL
+        )
+
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "initial")
+    (repo / "copy.py").write_text("changed = True\n")
+    (repo / "untracked.py").write_text("x = 1\n")
+
+    report = analyze_project(str(repo), revision="HEAD")
+
+    assert len(report["revision"]) == 40
+    assert report["file_structure"]["total_files"] == 2
+    assert sorted(sorted(p.rsplit("/", 1)[-1] for p in g) for g in report["duplicates"]["duplicates"]) == [
+        ["app.py", "copy.py"]
+    ]
+    assert report["duplicates"]["stats"]["bytes_read"] == 0
+    assert (repo / "copy.py").read_text() == "changed = True\n"
+    assert "error" in analyze_project(str(repo), revision="no-such-branch")